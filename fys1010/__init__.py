@@ -0,0 +1,2 @@
+# Analysis code for the course FYS-1010 Physics Laboratory 1
+# The experiments are subpackages that share the tools module.
@@ -0,0 +1,641 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Timing of the shared analysis tools
+# Run with fys1010-benchmark or python -m fys1010.benchmark
+
+import contextlib
+import io
+import math
+import os
+import tempfile
+import tracemalloc
+from math import log10, floor
+
+import numpy as np
+
+from . import datasets
+from . import distribution
+from . import regression
+from . import resampling
+from . import tables
+from . import tools
+from .interferometer import fringes
+from .interferometer import interferometer
+from .peltier.benchmark import best_time
+from .specific_charge_of_electron import helmholtz
+from .specific_charge_of_electron import specific_charge
+
+
+def linear_regression_origo_matrix(x_axis, data_points):
+    """
+    The original np.matrix implementation of tools.linear_regression_origo, kept as a reference for the benchmarks
+    :param data_points: numpy array
+    :return:
+            micro   slope of fitted line
+            err     mean error in that slope
+    """
+    # these libraries are shit
+    # return np.linalg.lstsq(x_axis,data_points)[0]
+
+    # Numpy arrays can't be column vectors! Not lying! They are that feeble and ambiguous by default.
+    x_mat = np.transpose(np.matrix(x_axis))
+    y_mat = np.transpose(np.matrix(data_points))
+
+    # If it is wanted that origin is not fixed, then replace x_mat by X_mat in micro calulations
+    X_mat = np.concatenate((x_mat, np.ones((x_axis.shape[0], 1))), axis=1)
+
+    # No really, these libraries _are_ pure shit! They break down if some matrix-dimension is one!
+    # return np.linalg.lstsq(X_mat, y_mat)[0]
+
+    # Then let's do it the hard way.
+
+    # https://en.wikipedia.org/wiki/Linear_regression
+    # https://en.wikipedia.org/wiki/Least_squares
+    micro = (np.linalg.inv(x_mat.transpose() * x_mat) * np.transpose(x_mat) * y_mat)[0, 0]
+
+    # https://en.wikipedia.org/wiki/Mean_squared_error
+    # https://en.wikipedia.org/wiki/Standard_deviation
+    # https://en.wikipedia.org/wiki/Simple_linear_regression#Normality_assumption
+    x_mean = np.sum(x_mat)/x_mat.size
+    dof = 1  # degrees of freedom
+    MSE = (1/(y_mat.size-dof)) * \
+        np.sum(np.multiply((y_mat-micro*x_mat), (y_mat-micro*x_mat))) / \
+        np.sum(np.multiply((x_mat-x_mean), (x_mat-x_mean)))
+    err = np.sqrt(MSE)
+
+    return micro, err
+
+
+def print_to_latex_tabular_loop(matrix, column_precisions=None, significant_figures=False):
+    """
+    The original cell-by-cell implementation of tools.print_to_latex_tabular, kept as a reference for the
+    benchmarks. np.int is replaced by int, which newer Numpy versions require.
+
+    :param matrix:               matrix to print
+                                    (list<float> or numpy_array<float>)
+    :param column_precisions:   single value OR array of precisions for each column
+                                    (int, list<int> or numpy_array<int>, len=columns)
+    :param significant_figures: if false then the column_precisions corresponds normal decimal precision
+                                if true then column_precisions corresponds the number of numbers to be printed
+                                    (bool)
+    :return:
+
+    Examples:
+        column_precisions=[...,4,...], significant_figures=True:
+            0.0012345678 -> 0.001234
+        column_precisions=[...,4,...], significant_figures=False:
+            0.0012345678 -> 0.0012
+    """
+
+    # I f***ing hate numpy's s***ty and poor arrays. In this case the second dimension is totally
+    # undefined when it is an 1D-array. So some extra unnecessary code is required for
+    # ridiculously simple things. This is NOT what python ought to be.
+    array = np.matrix(matrix)  # here I have contradictory naming just for joy of python
+
+    # python syntax for checking if np.shape empty tuple, i.e. col_pres is int. Clear? Not.
+    if (column_precisions is not None) and not np.shape(column_precisions):
+        col_pres = np.ones(np.shape(array)[1], dtype=int) * column_precisions
+    else:
+        col_pres = column_precisions
+
+    if (col_pres is not None) and (np.shape(array)[1] != len(col_pres)):
+        print(array)
+        print(" np.shape(array)[1]", np.shape(array)[1], "   len(col_pres)", len(col_pres))
+        raise Exception("col_pres should be vector of length of columns")
+
+    array_to_print = [["" for n in range(np.shape(array)[1])] for m in range(np.shape(array)[0])]
+
+    # convert array to printable form
+    for m in range(np.shape(array)[0]):
+        for n in range(np.shape(array)[1]):
+
+            if col_pres is None:
+                array_to_print[m][n] = str(array[m, n])
+            elif significant_figures:
+                # logarithm and value of exact zero is not a good combination
+                if not math.isclose(array[m, n], 0):
+                    pres = -int(floor(log10(abs(array[m, n]))))+col_pres[n]-1
+                else:
+                    pres = col_pres[n]
+
+                if pres > 0:
+                    array_to_print[m][n] = ("{:." + str(pres) + "f}").format(round(array[m, n], pres))
+                else:
+                    array_to_print[m][n] = str(int(round(array[m, n], pres)))
+
+            elif (not significant_figures) and (col_pres[n] > 0):
+                pres = col_pres[n]
+                array_to_print[m][n] = ("{:."+str(pres)+"f}").format(round(array[m, n], pres))
+            # print no decimals at all (integers), (negative col_pres values are permitted)
+            else:
+                array_to_print[m][n] = str(int(round(array[m, n], col_pres[n])))
+
+    # find the column lengths (cells with most characters)
+    max_column_len = np.amax(np.vectorize(lambda cell: len(cell))(array_to_print), axis=0)
+
+    print("")
+    print("\\begin{tabular}{" + np.shape(array)[1]*"|l" + "|}\n", end="", sep="")
+    print("\\hline")
+    print((" & " * (np.shape(array)[1]-1) + " \\\\"))
+    print("\\hline")
+    for m in range(np.shape(array)[0]):
+        for n in range(np.shape(array)[1]):
+            # print and trailing spaces to max width so tabulars are nicely readable
+            print(("{:"+str(max_column_len[n])+"}").format(array_to_print[m][n]), end="", sep="")
+            if n != np.shape(array)[1]-1:
+                print(" & ", end="", sep="")
+            else:
+                print(" \\\\\n", end="", sep="")
+    print("\\hline")
+    print(r"\end{tabular}")
+    print("")
+
+
+def benchmark_regression(series=10000, points=20):
+    """
+    Compares the closed-form regression to the original np.matrix implementation
+    :param series: number of data series in the batched fit
+    :param points: number of points in each series
+    :return: -
+    """
+    rng = np.random.default_rng(0)
+    x = np.arange(1, points + 1, dtype=float)
+    y = 0.5*x + rng.normal(scale=0.1, size=(series, points))
+
+    # The results have to agree before the timings mean anything
+    old = np.array([linear_regression_origo_matrix(x, row) for row in y])
+    new = np.array(regression.fit_origin(x, y)).T
+    if not np.allclose(old, new, rtol=1e-12, atol=0):
+        raise Exception("Regression implementations disagree")
+
+    time_single_matrix = best_time(lambda: linear_regression_origo_matrix(x, y[0]), number=100)
+    time_single = best_time(lambda: regression.fit_origin(x, y[0]), number=100)
+    time_loop = best_time(lambda: [linear_regression_origo_matrix(x, row) for row in y], number=1)
+    time_batch = best_time(lambda: regression.fit_origin(x, y))
+
+    print("----- Regression through origin (", series, "series of", points, "points ) -----")
+    print("Single series, np.matrix (us):", time_single_matrix*1e6)
+    print("Single series, closed form (us):", time_single*1e6)
+    print("Speedup:", time_single_matrix/time_single)
+    print("Loop over series, np.matrix (ms):", time_loop*1e3)
+    print("All series at once, closed form (ms):", time_batch*1e3)
+    print("Speedup:", time_loop/time_batch)
+    print()
+
+
+def deming_loop(x, y):
+    """
+    Deming regression through origin fitted one series and one left out point at a time
+    :return: slopes, errs (Numpy arrays)
+    """
+    n = x.size
+    slopes = np.zeros(len(y))
+    errs = np.zeros(len(y))
+    for i, row in enumerate(y):
+        slopes[i] = regression.deming_slope(np.sum(x*x), np.sum(row*row), np.sum(x*row), 1.0)
+        left_out = np.zeros(n)
+        for j in range(n):
+            x_j = np.delete(x, j)
+            y_j = np.delete(row, j)
+            left_out[j] = regression.deming_slope(np.sum(x_j*x_j), np.sum(y_j*y_j), np.sum(x_j*y_j), 1.0)
+        errs[i] = np.sqrt((n - 1) / n * np.sum((left_out - np.mean(left_out))**2))
+    return slopes, errs
+
+
+def benchmark_deming(series=1000, points=20):
+    """
+    Compares the vectorized orthogonal regression with jackknife errors to a loop over the series and points
+    :param series: number of data series
+    :param points: number of points in each series
+    :return: -
+    """
+    rng = np.random.default_rng(0)
+    x = np.arange(1, points + 1, dtype=float) + rng.normal(scale=0.1, size=points)
+    y = 0.5*x + rng.normal(scale=0.1, size=(series, points))
+
+    if not np.allclose(deming_loop(x, y), regression.fit_deming_origin(x, y), rtol=1e-9, atol=0):
+        raise Exception("Deming implementations disagree")
+
+    time_loop = best_time(lambda: deming_loop(x, y), number=1)
+    time_vectorized = best_time(lambda: regression.fit_deming_origin(x, y))
+
+    print("----- Orthogonal regression with jackknife errors (", series, "series of", points, "points ) -----")
+    print("Loop (ms):", time_loop*1e3)
+    print("Vectorized (ms):", time_vectorized*1e3)
+    print("Speedup:", time_loop/time_vectorized)
+    print()
+
+
+def benchmark_propagation(samples=10**6, loop_samples=10**4):
+    """
+    Times the Monte Carlo estimates of the interferometer and compares them to evaluating the samples one by one
+    :param samples: number of samples in the vectorized propagation
+    :param loop_samples: number of samples in the loop, which is extrapolated to the same number of samples
+    :return: -
+    """
+    data = interferometer.data()
+    m_count = data.meas_3_2[:, 0]
+    rng = np.random.default_rng(0)
+
+    def n_glass_loop():
+        for i in range(loop_samples):
+            angle_1 = rng.uniform(data.meas_3_1[:, 1] - 0.05, data.meas_3_1[:, 1] + 0.05)
+            angle_2 = rng.uniform(data.meas_3_2[:, 1] - 0.05, data.meas_3_2[:, 1] + 0.05)
+            lambda_0 = rng.uniform(633e-9 - 0.5e-9, 633e-9 + 0.5e-9)
+            d = rng.uniform(data.width_of_glass_plate - 0.005e-3, data.width_of_glass_plate + 0.005e-3)
+            angle = ((angle_1 + angle_2)/2)*2*np.pi/360
+            numerator = (2*d - m_count*lambda_0) * (1 - np.cos(angle))
+            denominator = 2*d*(1 - np.cos(angle)) - m_count*lambda_0
+            linear_regression_origo_matrix(denominator, numerator)
+
+    time_air = best_time(lambda: interferometer.refractive_index_air_estimate(samples), number=1)
+    time_glass = best_time(lambda: interferometer.refractive_index_glass_estimate(samples), number=1)
+    time_loop = best_time(n_glass_loop, number=1, repeat=1) * samples / loop_samples
+
+    print("----- Monte Carlo propagation (", samples, "samples ) -----")
+    print("Refractive index of air (ms):", time_air*1e3)
+    print("Refractive index of glass (ms):", time_glass*1e3)
+    print("Glass, one sample at a time, extrapolated (ms):", time_loop*1e3)
+    print("Speedup:", time_loop/time_glass)
+    print()
+
+
+def benchmark_bootstrap(resamples=10**5, loop_resamples=10**3):
+    """
+    Compares the batched bootstrap of the slope of the refractive index of air to a loop of np.matrix fits
+    :param resamples: number of resamples in the batched bootstrap
+    :param loop_resamples: number of resamples in the loop, which is extrapolated to the same number of resamples
+    :return: -
+    """
+    x, y = interferometer.fit_points()["air"]
+    rng = np.random.default_rng(0)
+
+    def bootstrap_loop():
+        for i in range(loop_resamples):
+            indices = rng.integers(0, x.size, size=x.size)
+            linear_regression_origo_matrix(x[indices], y[indices])
+
+    time_loop = best_time(bootstrap_loop, number=1, repeat=3) * resamples / loop_resamples
+
+    print("----- Bootstrap (", resamples, "resamples ) -----")
+    print("Loop of np.matrix fits, extrapolated (ms):", time_loop*1e3)
+    for workers in sorted({1, 2, os.cpu_count()}):
+        time_batch = best_time(lambda: resampling.bootstrap(x, y, resamples, workers=workers, chunk_size=10**4),
+                               number=1)
+        print("Batched,", workers, "workers (ms):", time_batch*1e3, ", speedup:", time_loop/time_batch)
+    print()
+
+
+def benchmark_tables(rows=10**5):
+    """
+    Compares the column-wise table renderer to the original cell-by-cell print_to_latex_tabular
+    :param rows: number of rows in the table
+    :return: -
+    """
+    rng = np.random.default_rng(0)
+    matrix = np.column_stack((np.arange(rows), rng.normal(size=rows)*100, rng.lognormal(size=rows)*1e-3))
+
+    def printed(func, *args, **kwargs):
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            func(*args, **kwargs)
+        return buffer.getvalue()
+
+    # The output has to be identical before the timings mean anything
+    for kwargs in [{"column_precisions": [0, 2, 4]}, {"column_precisions": 3, "significant_figures": True},
+                   {"column_precisions": [-1, 0, 1], "significant_figures": True}, {}]:
+        small = matrix[:1000]
+        if printed(print_to_latex_tabular_loop, small, **kwargs) != printed(tools.print_to_latex_tabular, small,
+                                                                              **kwargs):
+            raise Exception("Table renderers disagree with " + str(kwargs))
+
+    kwargs = {"column_precisions": [0, 2, 4]}
+    time_loop = best_time(lambda: printed(print_to_latex_tabular_loop, matrix, **kwargs), number=1, repeat=1)
+    time_latex = best_time(lambda: tables.write_table(matrix, io.StringIO(), "latex", **kwargs), number=1)
+    time_significant = best_time(
+        lambda: tables.write_table(matrix, io.StringIO(), "latex", column_precisions=3, significant_figures=True),
+        number=1)
+    time_markdown = best_time(lambda: tables.write_table(matrix, io.StringIO(), "markdown", **kwargs), number=1)
+    time_csv = best_time(lambda: tables.write_table(matrix, io.StringIO(), "csv", **kwargs), number=1)
+
+    print("----- Tables (", rows, "rows ) -----")
+    print("Cell by cell (ms):", time_loop*1e3)
+    print("LaTeX (ms):", time_latex*1e3)
+    print("LaTeX, significant figures (ms):", time_significant*1e3)
+    print("Markdown (ms):", time_markdown*1e3)
+    print("CSV (ms):", time_csv*1e3)
+    print("Speedup:", time_loop/time_latex)
+    print()
+
+
+def peak_memory(func):
+    """
+    :param func: function without arguments
+    :return: the peak of the memory allocated by func (bytes)
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_table_stream(rows=10**6):
+    """
+    Compares writing a memory-mapped table chunk by chunk to rendering it at once
+    :param rows: number of rows in the table
+    :return: -
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        array = np.lib.format.open_memmap(os.path.join(directory, "table.npy"), mode="w+", shape=(rows, 3))
+        rng = np.random.default_rng(0)
+        array[:, 0] = np.arange(rows) * 0.1
+        array[:, 1] = rng.normal(size=rows)*100
+        array[:, 2] = rng.lognormal(size=rows)
+        array.flush()
+        output = os.path.join(directory, "table.tex")
+
+        def write_at_once():
+            with open(output, "w") as file:
+                tables.write_table(array, file, column_precisions=[1, 2, 4], longtable=True)
+
+        def write_stream():
+            with open(output, "w") as file:
+                tables.write_table_stream(array, file, column_precisions=[1, 2, 4])
+
+        write_at_once()
+        with open(output) as file:
+            reference = file.read()
+        write_stream()
+        with open(output) as file:
+            if file.read() != reference:
+                raise Exception("The streamed table differs from the one rendered at once")
+
+        time_at_once = best_time(write_at_once, number=1, repeat=3)
+        time_stream = best_time(write_stream, number=1, repeat=3)
+        memory_at_once = peak_memory(write_at_once)
+        memory_stream = peak_memory(write_stream)
+
+    print("----- Streamed table (", rows, "rows ) -----")
+    print("At once (ms):", time_at_once*1e3, ", peak memory (MB):", memory_at_once/1e6)
+    print("Streamed (ms):", time_stream*1e3, ", peak memory (MB):", memory_stream/1e6)
+    print()
+
+
+def qm_loop(voltage, magnetic_field, diameters):
+    """
+    The original double loop of specific_charge.main, for a grid of any size
+    :return: 2D Numpy array of q/m
+    """
+    qm_array = np.zeros(diameters.shape)
+    for voltage_i in range(voltage.size):
+        for current_i in range(magnetic_field.size):
+            qm_array[voltage_i, current_i] = \
+                (2*voltage[voltage_i]) / ((magnetic_field[current_i]**2) * ((diameters[voltage_i, current_i]*0.5)**2))
+    return qm_array
+
+
+def benchmark_qm_grid(setpoints=300, repeats=100):
+    """
+    Compares the broadcast q/m grid to the double loop, and times the statistics of a memory-mapped sweep
+    :param setpoints: number of voltages and currents
+    :param repeats: number of repeated diameter readings in the memory-mapped sweep
+    :return: -
+    """
+    K_r = 0.0007444
+    voltage = np.linspace(200, 300, setpoints)
+    current = np.linspace(1.2, 2.0, setpoints)
+    magnetic_field = K_r*current
+    rng = np.random.default_rng(0)
+    diameters = np.sqrt(8*voltage[:, np.newaxis] / (1.76e11 * magnetic_field**2)) + \
+        rng.normal(scale=1e-3, size=(setpoints, setpoints))
+
+    if not np.allclose(qm_loop(voltage, magnetic_field, diameters),
+                       specific_charge.specific_charge(voltage[:, np.newaxis], magnetic_field, diameters),
+                       rtol=1e-14, atol=0):
+        raise Exception("q/m implementations disagree")
+
+    time_loop = best_time(lambda: qm_loop(voltage, magnetic_field, diameters), number=1, repeat=3)
+    time_broadcast = best_time(
+        lambda: specific_charge.specific_charge(voltage[:, np.newaxis], magnetic_field, diameters))
+
+    with tempfile.TemporaryDirectory() as directory:
+        sweep = np.lib.format.open_memmap(os.path.join(directory, "diameters.npy"), mode="w+",
+                                          shape=(setpoints, setpoints, repeats))
+        for i in range(setpoints):
+            sweep[i] = diameters[i, :, np.newaxis] + rng.normal(scale=1e-3, size=(setpoints, repeats))
+        sweep.flush()
+        del sweep
+        sweep = np.load(os.path.join(directory, "diameters.npy"), mmap_mode="r")
+        time_grid = best_time(lambda: specific_charge.qm_grid(voltage, current, sweep, K_r), number=1, repeat=3)
+        del sweep
+
+    print("----- q/m grid (", setpoints, "x", setpoints, ") -----")
+    print("Double loop (ms):", time_loop*1e3)
+    print("Broadcast (ms):", time_broadcast*1e3)
+    print("Speedup:", time_loop/time_broadcast)
+    print("Statistics of", repeats, "memory-mapped repeats (ms):", time_grid*1e3)
+    print()
+
+
+def benchmark_distribution(samples=10**7, chunks=10):
+    """
+    Times the estimators of the distribution module for a large sample of q/m values
+    :param samples: number of values
+    :param chunks: number of chunks of the merged histogram
+    :return: -
+    """
+    rng = np.random.default_rng(0)
+    values = rng.normal(1.76e11, 0.1e11, samples)
+
+    def merged_histogram():
+        hist = distribution.Histogram(0.5e11, 3e11)
+        for chunk in np.array_split(values, chunks):
+            hist.merge(distribution.Histogram(0.5e11, 3e11).add(chunk))
+        return hist
+
+    if not np.array_equal(merged_histogram().counts,
+                          np.histogram(values, distribution.BINS, (0.5e11, 3e11))[0]):
+        raise Exception("The merged histogram differs from np.histogram")
+
+    print("----- Distribution (", samples, "values ) -----")
+    print("np.histogram (ms):", best_time(lambda: np.histogram(values, distribution.BINS, (0.5e11, 3e11)),
+                                          number=1, repeat=3)*1e3)
+    print("Histogram merged from", chunks, "chunks (ms):", best_time(merged_histogram, number=1, repeat=3)*1e3)
+    print("KDE mode (ms):", best_time(lambda: distribution.kde_mode(values), number=1, repeat=3)*1e3)
+    print("Median (ms):", best_time(lambda: distribution.median(values), number=1, repeat=3)*1e3)
+    print("Trimmed mean (ms):", best_time(lambda: distribution.trimmed_mean(values), number=1, repeat=3)*1e3)
+    print()
+
+
+def benchmark_datasets(calls=1000):
+    """
+    Times opening a dataset and the shared access of the interferometer data
+    :param calls: number of data() calls
+    :return: -
+    """
+    def cold():
+        dataset = datasets.Dataset(os.path.join(interferometer.DATA_DIR, datasets.versions(interferometer.DATA_DIR)[-1]))
+        return [dataset[name] for name in dataset.names]
+
+    def warm():
+        for i in range(calls):
+            interferometer.data().meas_1
+
+    print("----- Datasets -----")
+    print("Opening all the interferometer tables (ms):", best_time(cold)*1e3)
+    print(calls, "calls of interferometer.data() (ms):", best_time(warm)*1e3)
+    print()
+
+
+def crossings_loop(vec, threshold):
+    """
+    Counts the crossings with hysteresis sample by sample, as a reference for fringes.hysteresis_states
+    :return: number of crossings
+    """
+    state = 0
+    crossings = 0
+    for value in vec:
+        if value > threshold and state != 1:
+            crossings += state != 0
+            state = 1
+        elif value < -threshold and state != -1:
+            crossings += state != 0
+            state = -1
+    return crossings
+
+
+def benchmark_fringes(samples=10**7, loop_samples=10**5, fringe_count=2000):
+    """
+    Times counting the fringes of a memory-mapped photodiode trace chunk by chunk
+    :param samples: number of samples in the trace
+    :param loop_samples: number of samples for the sample by sample crossing counter
+    :param fringe_count: number of fringes in the trace
+    :return: -
+    """
+    rng = np.random.default_rng(0)
+    threshold = 0.5 * 0.4/np.sqrt(2)
+
+    short = 0.4*np.cos(2*np.pi*fringe_count*np.linspace(0, 1, loop_samples)) + rng.normal(0, 0.05, loop_samples)
+    states = fringes.hysteresis_states(short, threshold)
+    if np.count_nonzero(states[1:] != states[:-1]) != crossings_loop(short, threshold):
+        raise Exception("The vectorized crossings differ from the loop")
+
+    with tempfile.TemporaryDirectory() as directory:
+        control = np.lib.format.open_memmap(os.path.join(directory, "control.npy"), mode="w+", shape=(samples,))
+        intensity = np.lib.format.open_memmap(os.path.join(directory, "intensity.npy"), mode="w+", shape=(samples,))
+        for start in range(0, samples, fringes.CHUNK_SIZE):
+            stop = min(start + fringes.CHUNK_SIZE, samples)
+            control[start:stop] = np.arange(start, stop) / samples
+            intensity[start:stop] = (1 + 0.4*np.cos(2*np.pi*fringe_count*control[start:stop])
+                                     + rng.normal(0, 0.05, stop - start))
+        control.flush()
+        intensity.flush()
+
+        # The fringes are 5000 samples long, so the noise above 100 samples is filtered
+        def count(chunk_size=fringes.CHUNK_SIZE):
+            return fringes.count_fringes(intensity, control, step=1000, cutoff=0.01, chunk_size=chunk_size)
+
+        result = count()
+        time_at_once = best_time(lambda: count(samples), number=1, repeat=3)
+        time_chunks = best_time(count, number=1, repeat=3)
+        memory_at_once = peak_memory(lambda: count(samples))
+        memory_chunks = peak_memory(count)
+        del control, intensity
+
+    print("----- Fringes (", samples, "samples,", fringe_count, "fringes ) -----")
+    print("Crossings of", loop_samples, "samples, loop (ms):", best_time(lambda: crossings_loop(short, threshold),
+                                                                          number=1, repeat=3)*1e3)
+    print("Crossings of", loop_samples, "samples, vectorized (ms):",
+          best_time(lambda: fringes.hysteresis_states(short, threshold), number=1, repeat=3)*1e3)
+    print("Trace at once (ms):", time_at_once*1e3, ", peak memory (MB):", memory_at_once/1e6)
+    print("Trace in chunks (ms):", time_chunks*1e3, ", peak memory (MB):", memory_chunks/1e6)
+    print("Fringes from the phase:", result[1][-1], ", from the crossings:", result[2][-1])
+    print()
+
+
+def biot_savart_loop(point, midpoints, elements):
+    """
+    The field of the segments at a single point summed one segment at a time, as a reference for helmholtz
+    :return: list of the field components (T)
+    """
+    field = [0.0, 0.0, 0.0]
+    for midpoint, element in zip(midpoints.tolist(), elements.tolist()):
+        r = [point[i] - midpoint[i] for i in range(3)]
+        scale = helmholtz.MU_0/(4*math.pi) / math.sqrt(r[0]**2 + r[1]**2 + r[2]**2)**3
+        field[0] += (element[1]*r[2] - element[2]*r[1]) * scale
+        field[1] += (element[2]*r[0] - element[0]*r[2]) * scale
+        field[2] += (element[0]*r[1] - element[1]*r[0]) * scale
+    return field
+
+
+def benchmark_helmholtz(grid=40, loop_points=100):
+    """
+    Times the field map of the Helmholtz coils on a 3D grid inside the coils
+    :param grid: number of points per axis of the grid
+    :param loop_points: number of points for the segment by segment loop
+    :return: -
+    """
+    coils = helmholtz.HelmholtzCoils(130, 0.15, 0.156)
+    midpoints, elements = coils.elements
+    axis = np.linspace(-0.07, 0.07, grid)
+    points = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1)
+    flat = points.reshape(-1, 3)[:loop_points]
+
+    def field():
+        # A new instance each time, so that the cache is not used
+        return helmholtz.HelmholtzCoils(130, 0.15, 0.156).field(points)
+
+    reference = np.array([biot_savart_loop(point, midpoints, elements) for point in flat.tolist()])
+    # Components that cancel by symmetry are compared to the magnitude of the field
+    if not np.allclose(coils.field(flat), reference, rtol=1e-12, atol=1e-12*np.max(np.abs(reference))):
+        raise Exception("The vectorized field differs from the loop")
+
+    time_loop = best_time(lambda: [biot_savart_loop(point, midpoints, elements) for point in flat.tolist()],
+                          number=1, repeat=3)
+    time_vectorized = best_time(lambda: helmholtz.field_chunk(flat, midpoints, elements), number=1, repeat=3)
+    time_grid = best_time(field, number=1, repeat=3)
+    coils.field(points)
+    time_cached = best_time(lambda: coils.field(points))
+
+    print("----- Helmholtz coils (", midpoints.shape[0], "segments ) -----")
+    print(loop_points, "points, loop (ms):", time_loop*1e3)
+    print(loop_points, "points, vectorized (ms):", time_vectorized*1e3)
+    print("Speedup:", time_loop/time_vectorized)
+    print("Grid of", grid**3, "points in chunks (ms):", time_grid*1e3, ", cached (ms):", time_cached*1e3)
+    print()
+
+
+def main():
+    benchmark_regression()
+    benchmark_deming()
+    benchmark_propagation()
+    benchmark_bootstrap()
+    benchmark_tables()
+    benchmark_table_stream()
+    benchmark_qm_grid()
+    benchmark_distribution()
+    benchmark_datasets()
+    benchmark_fringes()
+    benchmark_helmholtz()
+
+
+if __name__ == "__main__":
+    main()
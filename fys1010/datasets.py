@@ -0,0 +1,108 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Measurement tables stored as .npy files
+#
+# A dataset is a directory of .npy files, one per table or constant, and a measurement directory can contain
+# several versions (e.g. measurement sessions) of it as subdirectories. The files are memory-mapped read-only and
+# each dataset is opened only once per process, so all the users share the same arrays without copying them.
+
+import functools
+import os
+
+import numpy as np
+
+
+def shape_of(path):
+    """
+    :param path: str of the path of a .npy file
+    :return: the shape of the array in the file, read from the header only
+    """
+    with open(path, "rb") as file:
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            return np.lib.format.read_array_header_1_0(file)[0]
+        return np.lib.format.read_array_header_2_0(file)[0]
+
+
+class Dataset:
+    def __init__(self, directory):
+        """
+        This class gives the tables of a dataset directory as attributes, e.g. dataset.meas_1 for meas_1.npy
+        The tables are loaded when they are first used. Tables of zero dimensions are returned as Numpy scalars.
+        :param directory: str of the dataset directory
+        """
+        self.directory = directory
+        self.names = sorted(os.path.splitext(filename)[0] for filename in os.listdir(directory)
+                            if filename.endswith(".npy"))
+        self.tables = {}
+
+    def __getattr__(self, name):
+        # Only called for the attributes that are not found otherwise, i.e. the tables
+        if name not in self.__dict__.get("names", ()):
+            raise AttributeError("The dataset has no table " + name)
+        if name not in self.tables:
+            path = os.path.join(self.directory, name + ".npy")
+            if shape_of(path) == ():
+                # A memmap can't have zero dimensions
+                self.tables[name] = np.load(path)[()]
+            else:
+                self.tables[name] = np.load(path, mmap_mode="r")
+        return self.tables[name]
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def __dir__(self):
+        return list(super().__dir__()) + self.names
+
+
+def versions(root):
+    """
+    :param root: str of a directory of dataset versions
+    :return: sorted list of the names of the versions
+    """
+    return sorted(name for name in os.listdir(root) if os.path.isdir(os.path.join(root, name)))
+
+
+@functools.lru_cache(maxsize=None)
+def load(root, version=None):
+    """
+    Opens a dataset, which is then shared by all the callers
+    :param root: str of a directory of dataset versions
+    :param version: str of the version, None for the latest, i.e. the last in sorted order
+    :return: Dataset
+    """
+    if version is None:
+        available = versions(root)
+        if not available:
+            raise Exception("No datasets in " + root)
+        version = available[-1]
+    return Dataset(os.path.join(root, version))
+
+
+def save(directory, **tables):
+    """
+    Writes a dataset
+    :param directory: str of the dataset directory, created if it doesn't exist
+    :param tables: arrays or numbers to write, the keywords are the names of the tables
+    :return: -
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, table in tables.items():
+        np.save(os.path.join(directory, name + ".npy"), np.array(table, order="C"))
@@ -0,0 +1,223 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Robust statistics of large samples
+#
+# The estimators are O(n) or O(n log n) with Numpy reductions, and the histogram has a fixed size, so it can be
+# filled chunk by chunk and the histograms of separate chunks or processes can be added together.
+#
+# https://en.wikipedia.org/wiki/Kernel_density_estimation
+
+import numpy as np
+
+
+BINS = 2**12
+
+
+class Histogram:
+    def __init__(self, low, high, bins=BINS):
+        """
+        This class counts values to equal bins in a fixed range, and can be filled in chunks
+        Values outside the range are counted in underflow and overflow.
+        :param low: lower edge of the first bin
+        :param high: upper edge of the last bin
+        :param bins: int, number of bins
+        """
+        if not high > low:
+            raise Exception("The upper edge of the histogram should be above the lower edge, got " + str(low) +
+                            " and " + str(high))
+        self.low = float(low)
+        self.high = float(high)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @property
+    def bins(self):
+        return self.counts.size
+
+    @property
+    def width(self):
+        return (self.high - self.low) / self.bins
+
+    @property
+    def edges(self):
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+    @property
+    def centers(self):
+        return self.low + (np.arange(self.bins) + 0.5) * self.width
+
+    @property
+    def total(self):
+        return int(np.sum(self.counts)) + self.underflow + self.overflow
+
+    def add(self, values):
+        """
+        Counts the values, NaNs are ignored
+        :param values: Numpy array
+        :return: self
+        """
+        values = np.ravel(values)
+        # The bins are shifted by one, so that the underflow is counted in the first and the overflow in the last
+        shifted = (values - self.low) * (self.bins / (self.high - self.low)) + 1
+        nan = np.isnan(shifted)
+        if np.any(nan):
+            values = values[~nan]
+            shifted = shifted[~nan]
+        np.clip(shifted, 0, self.bins + 1, out=shifted)
+        counts = np.bincount(shifted.astype(np.intp), minlength=self.bins + 2)
+
+        # The upper edge belongs to the last bin as in np.histogram
+        upper_edge = np.count_nonzero(values == self.high)
+        counts[self.bins] += upper_edge
+        counts[self.bins + 1] -= upper_edge
+
+        self.underflow += int(counts[0])
+        self.overflow += int(counts[-1])
+        self.counts += counts[1:-1]
+        return self
+
+    def merge(self, other):
+        """
+        Adds the counts of a histogram of the same bins, e.g. from another chunk or process
+        :param other: Histogram
+        :return: self
+        """
+        if (other.low, other.high, other.bins) != (self.low, self.high, self.bins):
+            raise Exception("Only histograms with the same bins can be merged")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def quantile(self, q):
+        """
+        Quantiles of all the counted values, interpolated linearly within the bins
+        The quantiles that fall to the underflow or the overflow are limited to the range.
+        :param q: float or Numpy array of quantiles between 0 and 1
+        :return: float or Numpy array
+        """
+        cumulative = np.concatenate(([self.underflow], self.underflow + np.cumsum(self.counts)))
+        return np.interp(np.asarray(q) * self.total, cumulative, self.edges)
+
+    def mode(self):
+        """
+        :return: the center of the bin with the most values
+        """
+        return self.centers[np.argmax(self.counts)]
+
+
+def histogram(values, bins=BINS):
+    """
+    :param values: Numpy array, NaNs are ignored
+    :param bins: int, number of bins
+    :return: Histogram of the values from their minimum to their maximum
+    """
+    low = np.nanmin(values)
+    high = np.nanmax(values)
+    if high == low:
+        # A single value gets a bin of its own
+        low, high = low - 0.5, high + 0.5
+    return Histogram(low, high, bins).add(values)
+
+
+def silverman_bandwidth(std, iqr, count):
+    """
+    Silverman's rule of thumb for the bandwidth of a Gaussian kernel
+    https://en.wikipedia.org/wiki/Kernel_density_estimation#A_rule-of-thumb_bandwidth_estimator
+    :param std: standard deviation of the values
+    :param iqr: interquartile range of the values
+    :param count: number of values
+    :return: bandwidth
+    """
+    spread = min(std, iqr / 1.34) if iqr > 0 else std
+    return 0.9 * spread * count**(-1/5)
+
+
+def kde(hist, bandwidth=None):
+    """
+    Gaussian kernel density estimate of the values of a histogram
+    The counts are convolved with the kernel using FFT, which is padded so that the ends don't wrap around.
+    :param hist: Histogram, e.g. from histogram() or merged from chunks
+    :param bandwidth: standard deviation of the kernel, None for Silverman's rule
+    :return: bin centers, density (Numpy arrays)
+    """
+    centers = hist.centers
+    count = np.sum(hist.counts)
+    if bandwidth is None:
+        mean = np.sum(hist.counts * centers) / count
+        std = np.sqrt(np.sum(hist.counts * (centers - mean)**2) / count)
+        q1, q3 = hist.quantile([0.25, 0.75])
+        bandwidth = silverman_bandwidth(std, q3 - q1, count)
+
+    size = 2 * hist.bins
+    frequencies = np.fft.rfftfreq(size, d=hist.width)
+    # The Fourier transform of the Gaussian kernel
+    kernel = np.exp(-2 * (np.pi * bandwidth * frequencies)**2)
+    density = np.fft.irfft(np.fft.rfft(hist.counts, size) * kernel, size)[:hist.bins]
+    return centers, np.maximum(density, 0) / (count * hist.width)
+
+
+def kde_mode(values, bins=BINS, bandwidth=None):
+    """
+    The mode of the values, i.e. the maximum of their kernel density estimate
+    :param values: Numpy array or Histogram
+    :param bins: int, number of bins of the estimate, if the values are an array
+    :param bandwidth: standard deviation of the kernel, None for Silverman's rule
+    :return: mode
+    """
+    hist = values if isinstance(values, Histogram) else histogram(values, bins)
+    centers, density = kde(hist, bandwidth)
+    peak = int(np.argmax(density))
+
+    # Parabolic interpolation between the neighbouring bins
+    if 0 < peak < hist.bins - 1:
+        left, middle, right = density[peak - 1:peak + 2]
+        curvature = left - 2*middle + right
+        if curvature < 0:
+            return centers[peak] + 0.5 * (left - right) / curvature * hist.width
+    return centers[peak]
+
+
+def median(values):
+    """
+    :param values: Numpy array, NaNs are ignored
+    :return: median
+    """
+    return np.nanmedian(values)
+
+
+def trimmed_mean(values, proportion=0.1):
+    """
+    Mean of the values without the given proportion of the smallest and the largest values
+    Only the two cut points are found by partitioning, so the values are not sorted.
+    https://en.wikipedia.org/wiki/Truncated_mean
+    :param values: Numpy array, NaNs are ignored
+    :param proportion: float between 0 and 0.5, the proportion cut from each end
+    :return: trimmed mean
+    """
+    values = np.ravel(values)
+    values = values[~np.isnan(values)]
+    cut = int(proportion * values.size)
+    if cut == 0:
+        return np.mean(values)
+    if 2*cut >= values.size:
+        raise Exception("Cannot cut " + str(cut) + " values from each end of " + str(values.size) + " values")
+    partitioned = np.partition(values, [cut, values.size - cut - 1])
+    return np.mean(partitioned[cut:values.size - cut])
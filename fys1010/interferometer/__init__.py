@@ -0,0 +1 @@
+# Michelson interferometer
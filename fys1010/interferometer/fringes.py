@@ -0,0 +1,247 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Counting of interference fringes from the intensity of a photodiode
+#
+# The intensity is a cosine of the optical path difference, so the number of fringes is the phase of the signal
+# divided by 2 pi. The phase is that of the analytic signal, which is computed with FFT (the Hilbert transform).
+# The fringes are also counted from the crossings of the mean intensity with hysteresis, which doesn't drift with
+# the noise but resolves only half fringes. Neither can see the direction of the motion, so both count the fringes
+# that have passed, as when counting by eye.
+#
+# The traces are processed in chunks, so they can be memory-mapped and much longer than the memory. The FFT of
+# a chunk includes a margin of samples on both sides, so that its edges don't distort the phase, and the phase is
+# unwrapped continuously over the chunks. The margin and the chunks should be several fringes long.
+#
+# The signal is centred to the mean intensity of the trace, which count_fringes computes in a first pass, and each
+# FFT is padded with zeros, so the counts don't depend on the chunk size. The mean is the centre of the fringes only
+# for traces of many fringes, so for shorter traces the centre and the RMS should be given, e.g. from a calibration.
+# The phase is distorted within about a fringe of both ends of the trace, so the total count has an error of up to
+# about half a fringe regardless of the length of the trace.
+#
+# https://en.wikipedia.org/wiki/Analytic_signal
+
+import numpy as np
+
+from .. import uncertainty
+
+
+CHUNK_SIZE = 2**18
+MARGIN = 2**14
+
+
+def analytic_signal(vec, cutoff=None):
+    """
+    The signal is padded with zeros to twice its length, so that its end doesn't wrap around to its beginning.
+    The ends are then treated in the same way however the trace is split to chunks.
+    :param vec: 1D Numpy array of a real signal, centred to zero
+    :param cutoff: the frequencies above this (cycles per sample) are removed, None to keep all
+    :return: complex Numpy array, whose real part is the filtered vec and imaginary part its Hilbert transform
+    """
+    size = 2*vec.size
+    # Negative frequencies are removed and the positive ones doubled
+    weights = np.zeros(size)
+    weights[0] = 1
+    weights[1:size//2] = 2
+    weights[size//2] = 1
+    if cutoff is not None:
+        weights[int(cutoff*size) + 1:] = 0
+    return np.fft.ifft(np.fft.fft(vec, size) * weights)[:vec.size]
+
+
+def hysteresis_states(vec, threshold, state=0):
+    """
+    The side of the signal with hysteresis: a sample above threshold is 1, below -threshold -1,
+    and in between the state of the previous sample
+    :param vec: 1D Numpy array, centered to zero
+    :param threshold: float, half of the width of the hysteresis band
+    :param state: the state before the first sample, 0 if unknown
+    :return: Numpy array of the states of the samples
+    """
+    states = np.zeros(vec.size, dtype=np.int8)
+    states[vec > threshold] = 1
+    states[vec < -threshold] = -1
+
+    # The samples in the band get the state of the last sample outside it
+    last_decided = np.where(states != 0, np.arange(vec.size), -1)
+    np.maximum.accumulate(last_decided, out=last_decided)
+    return np.where(last_decided >= 0, states[last_decided], state).astype(np.int8)
+
+
+class FringeCounter:
+    def __init__(self, step=1, hysteresis=0.5, margin=MARGIN, cutoff=None, centre=None, rms=None):
+        """
+        This class counts fringes from a trace given in consecutive chunks
+        :param step: int, the counts are stored for every step:th sample and the last one
+        :param hysteresis: half of the width of the hysteresis band relative to the RMS of the signal
+        :param margin: int, number of samples on both sides of a chunk in the FFT
+        :param cutoff: low-pass filter of the signal in cycles per sample, None for no filter.
+                       Without it slow fringes may cross the hysteresis band many times because of the noise.
+        :param centre: the intensity in the middle of the fringes, None for the mean of the first chunk
+        :param rms: the RMS of the intensity around the centre, None for that of the first chunk
+        """
+        self.step = step
+        self.hysteresis = hysteresis
+        self.margin = margin
+        self.cutoff = cutoff
+
+        # The processed samples of the margin before the pending ones and the pending ones
+        self.buffer = np.zeros(0)
+        self.history_size = 0
+        self.pending_control = np.zeros(0)
+        self.index = 0
+
+        # Fixed for the whole trace, so that the counts don't depend on the chunks
+        self.centre = centre
+        self.rms = rms
+
+        self.phase = None
+        self.phase_start = 0.0
+        self.state = 0
+        self.crossings = 0
+        self.last = None
+
+        self.controls = []
+        self.phase_counts = []
+        self.crossing_counts = []
+
+    def add(self, intensity, control):
+        """
+        Processes a chunk of the trace. The last margin samples wait for the next chunk.
+        :param intensity: 1D Numpy array of intensities
+        :param control: 1D Numpy array of the control variable (e.g. mirror position) at the same samples
+        :return: self
+        """
+        if np.size(intensity) != np.size(control):
+            raise Exception("The intensity and the control variable should have the same number of samples")
+        self.buffer = np.concatenate((self.buffer, np.asarray(intensity, dtype=float)))
+        self.pending_control = np.concatenate((self.pending_control, np.asarray(control, dtype=float)))
+        ready = self.pending_control.size - self.margin
+        if ready > 0:
+            self.process(ready)
+        return self
+
+    def finish(self):
+        """
+        Processes the samples that are waiting for the next chunk
+        :return: self
+        """
+        if self.pending_control.size > 0:
+            self.process(self.pending_control.size)
+        return self
+
+    def process(self, ready):
+        """
+        :param ready: int, number of pending samples to process
+        :return: -
+        """
+        start = self.history_size
+        stop = start + ready
+        if self.centre is None:
+            self.centre = np.mean(self.buffer)
+        if self.rms is None:
+            self.rms = np.std(self.buffer)
+        signal = self.buffer - self.centre
+        control = self.pending_control[:ready]
+
+        analytic = analytic_signal(signal, self.cutoff)[start:stop]
+        phase = np.angle(analytic)
+        if self.phase is None:
+            phase = np.unwrap(phase)
+            self.phase_start = phase[0]
+        else:
+            phase = np.unwrap(np.concatenate(([self.phase], phase)))[1:]
+        self.phase = phase[-1]
+
+        states = hysteresis_states(analytic.real, self.hysteresis*self.rms, self.state)
+        previous = np.concatenate(([self.state], states[:-1]))
+        # Leaving the unknown state before the first decided sample is not a crossing
+        crossings = self.crossings + np.cumsum((states != previous) & (previous != 0))
+        self.state = int(states[-1])
+        self.crossings = int(crossings[-1])
+
+        # The indices of the stored samples in this part of the trace
+        stored = np.arange(-self.index % self.step, ready, self.step)
+        self.controls.append(control[stored])
+        self.phase_counts.append((phase[stored] - self.phase_start) / (2*np.pi))
+        self.crossing_counts.append(crossings[stored] / 2)
+        self.last = (control[-1], (phase[-1] - self.phase_start) / (2*np.pi), crossings[-1] / 2)
+        self.index += ready
+
+        history_start = max(stop - self.margin, 0)
+        self.buffer = self.buffer[history_start:]
+        self.history_size = stop - history_start
+        self.pending_control = self.pending_control[ready:]
+
+    def result(self):
+        """
+        :return: control variable, fringe count from the phase, fringe count from the crossings (Numpy arrays)
+        """
+        controls = self.controls
+        phase_counts = self.phase_counts
+        crossing_counts = self.crossing_counts
+        if self.last is not None and (self.index - 1) % self.step != 0:
+            controls = controls + [[self.last[0]]]
+            phase_counts = phase_counts + [[self.last[1]]]
+            crossing_counts = crossing_counts + [[self.last[2]]]
+        return np.concatenate(controls), np.concatenate(phase_counts), np.concatenate(crossing_counts)
+
+
+def trace_moments(intensity, chunk_size=CHUNK_SIZE):
+    """
+    :param intensity: 1D array of intensities, e.g. a Numpy memmap
+    :param chunk_size: int, number of samples read at a time
+    :return: mean, RMS around the mean
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for start in range(0, len(intensity), chunk_size):
+        chunk = np.asarray(intensity[start:start+chunk_size], dtype=float)
+        chunk_mean = np.mean(chunk)
+        deviations = chunk - chunk_mean
+        count, mean, m2 = uncertainty.merge_moments(count, mean, m2, chunk.size, chunk_mean,
+                                                    np.sum(deviations*deviations))
+    return mean, np.sqrt(m2 / count)
+
+
+def count_fringes(intensity, control, step=1, hysteresis=0.5, margin=MARGIN, cutoff=None, centre=None, rms=None,
+                  chunk_size=CHUNK_SIZE):
+    """
+    Counts the fringes of a whole trace chunk by chunk
+    The centre and the RMS are computed from the whole trace in a first pass if they aren't given.
+    :param intensity: 1D array of intensities, e.g. a Numpy memmap
+    :param control: 1D array of the control variable (e.g. mirror position) at the same samples
+    :param step: see FringeCounter
+    :param hysteresis: see FringeCounter
+    :param margin: see FringeCounter
+    :param cutoff: see FringeCounter
+    :param centre: see FringeCounter
+    :param rms: see FringeCounter
+    :param chunk_size: int, number of samples read at a time
+    :return: control variable, fringe count from the phase, fringe count from the crossings (Numpy arrays)
+    """
+    if centre is None or rms is None:
+        trace_centre, trace_rms = trace_moments(intensity, chunk_size)
+        centre = trace_centre if centre is None else centre
+        rms = trace_rms if rms is None else rms
+
+    counter = FringeCounter(step, hysteresis, margin, cutoff, centre, rms)
+    for start in range(0, len(intensity), chunk_size):
+        counter.add(intensity[start:start+chunk_size], control[start:start+chunk_size])
+    return counter.finish().result()
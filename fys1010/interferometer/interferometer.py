@@ -0,0 +1,314 @@
+import os
+
+import numpy as np
+
+from .. import datasets
+from .. import regression
+from .. import resampling
+from .. import tools
+from .. import uncertainty
+from . import fringes
+
+# Bokeh is imported only in the functions that plot, so that the data and the fits can be used without it
+
+a = np.array([[2, 3.0, 4], [1, 2, 3]])
+
+
+# The measurements, relative to this file so that they are found regardless of the working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def data():
+    """
+    The measurements as read-only arrays, shared by all the callers
+    meas_1: m (#), d_m (1e-6m), delta_d_m (1e-6m)
+    meas_2_1, meas_2_2: P_f (bar), m (#)
+    pressure_primitive_units: cmHg
+    pressure: Pa
+    meas_3_1, meas_3_2: m (#), rot (°)
+    width_of_glass_plate: m
+    :return: datasets.Dataset of the latest version in DATA_DIR
+    """
+    return datasets.load(DATA_DIR)
+
+
+LAMBDA_0 = 633e-9  # wavelength in vacuum (m)
+CHAMBER_LENGTH = 0.03  # length of the air chamber (m)
+
+# Reading errors of the air measurement, half of the last recorded digit
+PRESSURE_DROP_ERR = 0.005e5  # the gauge was read to 0.01 bar (Pa)
+M_COUNT_ERR = 0.5  # half fringes were recorded (#)
+
+
+def wave_length_points(m_count, d_m):
+    """
+    :param m_count: fringe counts (#)
+    :param d_m: micrometer readings of the mirror (1e-6m), starting from 50
+    :return: x, y of the fit of the wave length: m_count, the change of the optical path (m)
+    """
+    return m_count, (50-d_m) * 2 * 1e-6
+
+
+def air_points(m_count, pressure_drop):
+    """
+    :param m_count: fringe counts (#)
+    :param pressure_drop: pressure difference to the start (Pa)
+    :return: x, y of the fit of the refractive index of air: pressure_drop, delta_n
+    """
+    return pressure_drop, LAMBDA_0 * m_count /(2*CHAMBER_LENGTH)
+
+
+def glass_points(m_count, angle):
+    """
+    :param m_count: fringe counts (#)
+    :param angle: rotation of the glass plate (°)
+    :return: x, y of the fit of the refractive index of glass: denominator, numerator
+    """
+    angle = angle*2*np.pi/360
+    d = data().width_of_glass_plate
+    numerator =  (2*d - m_count*LAMBDA_0) * (1- np.cos(angle))
+    denominator = 2*d*(1 - np.cos(angle)) - m_count*LAMBDA_0
+    return denominator, numerator
+
+
+# The functions that convert fringe counts and the control variable to the points of a fit
+POINTS = {
+    "wave length": wave_length_points,
+    "air": air_points,
+    "glass": glass_points,
+}
+
+
+def fit_points():
+    """
+    The points of the three fits through origin
+    :return: dict of fit name: (x, y) as Numpy arrays
+    """
+    # delta_d_m is the change of d_m between the readings (50-43.2 = 6.8 etc.), not an uncertainty of them,
+    # so the points aren't weighted
+    pressure_drop = data().meas_2_2[:,0]*1e5 # Assuming we measured pressure difference to current.
+    angle = (data().meas_3_1[:,1] + data().meas_3_2[:, 1])/2
+
+    return {
+        "wave length": wave_length_points(data().meas_1[:, 0], data().meas_1[:, 1]),
+        "air": air_points(data().meas_2_2[:,1], pressure_drop),
+        "glass": glass_points(data().meas_3_2[:,0], angle),
+    }
+
+
+def trace_points(name, intensity, control, counter="phase", **kwargs):
+    """
+    The points of a fit from a photodiode trace instead of fringes counted by eye
+    :param name: str, the fit as in fit_points
+    :param intensity: 1D array of intensities, e.g. a Numpy memmap of a long trace
+    :param control: 1D array of the control variable in the units of POINTS[name] at the same samples
+    :param counter: "phase" for the fractional fringe count from the phase, "crossings" for half fringes
+    :param kwargs: keyword arguments of fringes.count_fringes, e.g. step to reduce the number of points
+    :return: x, y as Numpy arrays
+    """
+    control, phase_count, crossing_count = fringes.count_fringes(intensity, control, **kwargs)
+    if counter == "phase":
+        return POINTS[name](phase_count, control)
+    if counter == "crossings":
+        return POINTS[name](crossing_count, control)
+    raise Exception("Unknown fringe counter " + str(counter))
+
+
+def fit_trace(name, intensity, control, **kwargs):
+    """
+    Fits a line to the points of a photodiode trace
+    The phase at the first samples is distorted by the edge of the trace, which shifts all the counts by a
+    fraction of a fringe, so the line is not forced through origin as with the counts by eye.
+    :param name: str, the fit as in fit_points
+    :param kwargs: keyword arguments of trace_points
+    :return: slope, err
+    """
+    slope, intercept, slope_err, intercept_err = regression.fit_line(*trace_points(name, intensity, control, **kwargs))
+    return slope, slope_err
+
+
+def plot_wave_length():
+    from bokeh.plotting import figure
+
+    fig = figure(x_axis_label='m', y_axis_label="dₗ (μm)") # title="Valon kulkema lisämatka interferenssisiirtymien funktiona",
+
+    m_count, distance = fit_points()["wave length"]
+
+    # fig.circle(m_count, distance, legend="mittausdata", size=10, fill_color="white")
+
+    x = np.linspace(0,100,1000)
+    k ,k_err = tools.linear_regression_origo(m_count, distance)
+    fig.line(x, k*x*1e6, line_width=2, legend="sovite")# legend="sovite ∂dₗ/∂m = λ = "+str(round(k*1e9))+"nm")
+    fig.line(x, (k+k_err) * x*1e6, line_width=1, color=(0,0,128), line_dash="dashed")
+    fig.line(x, (k-k_err) * x*1e6, line_width=1, color=(0,0,128), line_dash="dashed", legend="keskivirherajat")# legend="keskivirherajat λ = "+str(round(k*1e9))+"±"+str(round(k_err*1e9))+"nm")
+
+    fig.circle(m_count, distance*1e6, legend="mittauspisteet", size=10, color="black", fill_color="white", line_width=2)
+
+    fig.legend.location = "top_left"
+
+    print("Wave length")
+    print("    slope i.e. lambda:", k, ", error: ", k_err,
+          ", maxium range in deviation:", np.sqrt((k_err/np.sqrt(5))**2 + k_err**2))
+
+    return fig
+
+
+def plot_refractive_index_air():
+    from bokeh.plotting import figure
+
+    fig = figure(x_axis_label='Δp (Pa)', y_axis_label="Δn")# title="Ilman taitekertoimen muutos paineen funktiona")
+
+    pressure_drop, delta_n = fit_points()["air"]
+    n_0 = 1             # refractive index in vacuum ()
+
+    x = np.linspace(0, 0.7e5, 1000)
+    k, k_err = tools.linear_regression_origo(pressure_drop, delta_n)
+    # no latex in bokeh :(
+    fig.line(x, k*x, line_width=2, legend="sovite")# legend="sovite ∂(Δn)/∂(Δp) = ("+str(round(k*1e9,2))+")*10⁻⁹ (1/Pa)")
+    fig.line(x, (k + k_err) * x, line_width=1, color=(0, 0, 128), line_dash="dashed")
+    fig.line(x, (k - k_err) * x, line_width=1, color=(0, 0, 128),line_dash="dashed", legend="keskivirherajat")# legend="keskivirherajat ∂(Δn)/∂(Δp) = ("+str(round(k*1e9,2))+"±"+str(round(k_err*1e9,2))+")*10⁻⁹ (1/Pa)")
+
+    fig.circle(pressure_drop, delta_n, legend="mittauspisteet", size=10, color="black", fill_color="white", line_width=2)
+
+    fig.legend.location = "top_left"
+
+    air_pressure = data().pressure
+
+    print("Refractive index of air")
+    print("    slope i.e. ∂n/∂p:", k, ", error:", k_err, ", n_room:", n_0 + k*air_pressure,
+          ", maxium range in deviation:", np.sqrt((k_err/np.sqrt(7))**2 + k_err**2))
+    n_room = refractive_index_air_estimate()
+    print("    n_room from Monte Carlo:", n_room.mean, ", error:", n_room.std, ", 95 % interval:", *n_room.interval())
+
+    # Both the pressure gauge and the fringe count have reading errors
+    delta_n_err = LAMBDA_0 * M_COUNT_ERR / (2*CHAMBER_LENGTH)
+    k_deming, k_deming_err = regression.fit_deming_origin(pressure_drop, delta_n, PRESSURE_DROP_ERR, delta_n_err)
+    print("    errors in both variables, slope:", k_deming, ", error:", k_deming_err,
+          ", n_room:", n_0 + k_deming*air_pressure)
+    print("")
+
+    return fig
+
+
+def plot_refractive_index_glass():
+    from bokeh.plotting import figure
+
+    fig = figure(x_axis_label='nimittäjä (m)', y_axis_label="osoittaja (m)")
+    # title="Lasin taitekertoimen muutos paineen funktiona")
+
+    denominator, numerator = fit_points()["glass"]
+    # tools.print_to_latex_tabular(
+    #     np.hstack((np.matrix(numerator).T, np.matrix(denominator).T)), column_precisions=[3,3])
+
+    x = np.linspace(0, 1.30e-04, 1000)
+    k, k_err = tools.linear_regression_origo(denominator, numerator)
+    n_glass = refractive_index_glass_estimate()
+    print("Refractive index of glass")
+    print("    slope", k, ", error:", k_err,
+          ", maxium range in deviation:", np.sqrt((k_err/np.sqrt(6))**2 + k_err**2))
+    print("    error from the inputs with Monte Carlo:", n_glass.std, ", 95 % interval:", *n_glass.interval())
+
+    fig.line(x, k*x, line_width=2, legend="sovite") # legend="sovite ∂y/∂x = "+str(round(k,2)))
+    fig.line(x, (k + k_err) * x, line_width=1, color=(0, 0, 128), line_dash="dashed")
+    fig.line(x, (k - k_err) * x, line_width=1, color=(0, 0, 128), line_dash="dashed", legend="keskivirherajat")
+    # legend="keskivirherajat ∂y/∂x = ("+str(round(k,2))+"±"+str(round(k_err,2))+")")
+
+    fig.circle(denominator, numerator, legend="mittauspisteet", size=10, color="black", fill_color="white", line_width=2)
+
+    fig.legend.location = "top_left"
+
+    return fig
+
+
+def refractive_index_air_estimate(samples=10**6):
+    """
+    The refractive index of the room air with the uncertainties of all the inputs propagated with Monte Carlo
+    :param samples: number of samples
+    :return: uncertainty.Estimate
+    """
+    pressure_drop = data().meas_2_2[:, 0]*1e5
+    m_count = data().meas_2_2[:, 1]
+
+    # The fit is done for the fringe count, since delta_n is only scaled by lambda_0 and chamber_length
+    count_slope, count_slope_err = regression.fit_origin(pressure_drop, m_count)
+
+    def n_room(count_slope, lambda_0, chamber_length, air_pressure):
+        return 1 + lambda_0 * count_slope / (2*chamber_length) * air_pressure
+
+    return uncertainty.propagate(n_room, {
+        "count_slope": uncertainty.Normal(count_slope, count_slope_err),
+        "lambda_0": uncertainty.Uniform(LAMBDA_0, 0.5e-9),  # the He-Ne 632.8 nm rounded
+        "chamber_length": uncertainty.Uniform(CHAMBER_LENGTH, 0.5e-3),
+        "air_pressure": uncertainty.Normal(data().pressure, 50),  # Pa, rough guess
+    }, samples=samples)
+
+
+def refractive_index_glass_estimate(samples=10**6):
+    """
+    The refractive index of the glass plate with the uncertainties of the plate width, lambda_0 and the angle readings
+    propagated with Monte Carlo. Each sample is fitted separately, so the scatter of the points is not included.
+    :param samples: number of samples
+    :return: uncertainty.Estimate
+    """
+    m_count = data().meas_3_2[:, 0]
+
+    def n_glass(angle_1, angle_2, lambda_0, d):
+        angle = ((angle_1 + angle_2)/2)*2*np.pi/360
+        lambda_0 = lambda_0[:, np.newaxis]
+        d = d[:, np.newaxis]
+        numerator = (2*d - m_count*lambda_0) * (1 - np.cos(angle))
+        denominator = 2*d*(1 - np.cos(angle)) - m_count*lambda_0
+        return regression.fit_origin(denominator, numerator)[0]
+
+    return uncertainty.propagate(n_glass, {
+        "angle_1": uncertainty.Uniform(data().meas_3_1[:, 1], 0.05),  # degrees, half of the last digit
+        "angle_2": uncertainty.Uniform(data().meas_3_2[:, 1], 0.05),
+        "lambda_0": uncertainty.Uniform(LAMBDA_0, 0.5e-9),
+        "d": uncertainty.Uniform(data().width_of_glass_plate, 0.005e-3),
+    }, samples=samples)
+
+
+def print_estimates():
+    n_room = refractive_index_air_estimate()
+    print("Refractive index of air with Monte Carlo")
+    print("    mean:", n_room.mean, ", error:", n_room.std, ", 95 % interval:", *n_room.interval())
+    n_glass = refractive_index_glass_estimate()
+    print("Refractive index of glass with Monte Carlo")
+    print("    mean:", n_glass.mean, ", error:", n_glass.std, ", 95 % interval:", *n_glass.interval())
+
+    print("Slopes with bootstrap and jackknife")
+    for name, (x, y) in fit_points().items():
+        k, k_err = regression.fit_origin(x, y)
+        k_bootstrap = resampling.bootstrap(x, y)
+        k_jackknife, k_jackknife_err = resampling.jackknife(x, y)
+        print("    " + name + ":", k, ", bootstrap error:", k_bootstrap.std,
+              ", bootstrap 95 % interval:", *k_bootstrap.interval(), ", jackknife error:", k_jackknife_err)
+
+
+def print_latex_tabulars():
+    tools.print_to_latex_tabular(data().meas_1, column_precisions=[0,1,1], significant_figures=False)
+    tools.print_to_latex_tabular(data().meas_2_2, column_precisions=[2, 1], significant_figures=False)
+
+    angle_1 = data().meas_3_1
+    angle_2 = data().meas_3_2
+    angle_mean = ((angle_1 + angle_2) / 2)
+    tools.print_to_latex_tabular(angle_mean, column_precisions=[0, 1], significant_figures=False)
+
+
+def main():
+    from bokeh.plotting import show, output_file
+    from bokeh.layouts import column
+
+    fig1 = plot_wave_length()
+    fig2 = plot_refractive_index_air()
+    fig3 = plot_refractive_index_glass()
+
+    output_file("plots.html", title="This is the title of most important kind")
+
+    show(column(fig1, fig2, fig3))
+
+    # print_latex_tabulars()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Peltier element as a heat pump and a heat engine
@@ -0,0 +1,366 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Analysis of many measurements at once
+#
+# The data vectors of the measurements are stacked into 2D arrays with one row per measurement.
+# The measurements have different lengths, so the rows are padded by repeating their last value and the length
+# of each row is stored separately. The padding can't change the index of an extreme, since argmax and argmin
+# return the first occurrence, and the integrals only use the real points. All the values of Measurement are
+# then computed for all the rows at once, so that the work is done by Numpy instead of a Python loop over
+# the measurements.
+
+import functools
+
+import numpy as np
+
+from . import peltier
+
+
+def stack(vectors):
+    """
+    Stacks vectors of different lengths into a padded 2D array
+    :param vectors: list of non-empty 1D Numpy arrays
+    :return: data (2D Numpy array padded with the last value of each row), lengths (Numpy array of int)
+    """
+    lengths = np.array([vector.size for vector in vectors], dtype=int)
+    data = np.empty((len(vectors), lengths.max(initial=0)))
+    for row, vector in enumerate(vectors):
+        data[row, :vector.size] = vector
+        data[row, vector.size:] = vector[-1]
+    return data, lengths
+
+
+def take(data, indices):
+    """
+    :param data: 2D Numpy array
+    :param indices: Numpy array of a column index for each row
+    :return: Numpy array of data[i, indices[i]] for each row i
+    """
+    return np.take_along_axis(data, indices[:, np.newaxis], axis=1)[:, 0]
+
+
+def row_trapz(data, lengths, dx):
+    """
+    Same as np.trapz(data[i, :lengths[i]], dx=dx[i]) for each row i of data padded by stack()
+    :return: Numpy array of integrals
+    """
+    last = take(data, lengths-1)
+    total = data.sum(axis=1) - (data.shape[1] - lengths) * last
+    return np.where(lengths >= 2, dx * (total - (data[:, 0] + last) / 2), 0.0)
+
+
+def segment_integral(cumulative, start, stop, dx):
+    """
+    Same as peltier.segment_integral for each row of 2D data
+    :param cumulative: 2D Numpy array from peltier.cumulative_trapz
+    :param start: Numpy array of the first index of each row
+    :param stop: Numpy array of the index after the last one of each row
+    :param dx: Numpy array of the spacing of the points of each row
+    :return: Numpy array of integrals
+    """
+    valid = stop - start >= 2
+    integral = take(cumulative, np.where(valid, stop-1, 0)) - take(cumulative, np.where(valid, start, 0))
+    return np.where(valid, dx * integral, 0.0)
+
+
+class MeasurementBatch:
+    def __init__(self, measurements):
+        """
+        This class holds many measurements as 2D arrays, one row per measurement.
+        The values have the same names as those of Measurement, but they are Numpy arrays with one element
+        per measurement. The values that don't exist for measurements without an insulator are NaN for them.
+        :param measurements: list of Measurement
+        """
+        self.names = [measurement.name for measurement in measurements]
+
+        self.mass = np.array([measurement.mass for measurement in measurements], dtype=float)
+        self.heat_capacity = np.array([measurement.heat_capacity for measurement in measurements], dtype=float)
+        self.aluminium_area = np.array([measurement.aluminium_area for measurement in measurements], dtype=float)
+        self.insulator_thickness = np.array([measurement.insulator_thickness for measurement in measurements],
+                                            dtype=float)
+        self.thermal_conductivity = np.array([measurement.thermal_conductivity for measurement in measurements],
+                                             dtype=float)
+        self.not_air = (self.insulator_thickness != 0)
+
+        # The exports have different lengths even within a measurement, so each one has its own lengths
+        self.time_vec, self.time_lengths = stack([measurement.time_vec for measurement in measurements])
+        self.power_inp, self.power_inp_lengths = stack([measurement.power_inp for measurement in measurements])
+        self.power_gen, self.power_gen_lengths = stack([measurement.power_gen for measurement in measurements])
+        self.temp_cold_orig, self.temp_lengths = stack([measurement.temp_cold_orig for measurement in measurements])
+        self.temp_hot_orig = stack([measurement.temp_hot_orig for measurement in measurements])[0]
+
+    def __len__(self):
+        return len(self.names)
+
+    def heat(self, delta_temp):
+        """
+        Q = cm \\Delta T
+        :param delta_temp: Numpy array of temperature differences (K)
+        :return: Numpy array of heats (J)
+        """
+        return self.heat_capacity * self.mass * delta_temp
+
+    # Events
+    @functools.cached_property
+    def enable_index(self):
+        return np.argmax(self.power_inp, axis=1)
+
+    @functools.cached_property
+    def power_inp_max(self):
+        return take(self.power_inp, self.enable_index)
+
+    @functools.cached_property
+    def disable_index(self):
+        diffs = np.diff(self.power_inp, axis=1)
+        # The differences within the padding are zero, so they are excluded
+        diffs[np.arange(diffs.shape[1]) >= self.power_inp_lengths[:, np.newaxis] - 1] = np.inf
+        return np.argmin(diffs, axis=1) + 1
+
+    @functools.cached_property
+    def temp_peak_index(self):
+        return np.argmax(self.temp_hot_orig, axis=1)
+
+    @functools.cached_property
+    def stop_index(self):
+        return np.argmax(self.temp_cold_orig, axis=1)
+
+    @functools.cached_property
+    def temp_min_index(self):
+        return np.argmin(self.temp_cold_orig, axis=1)
+
+    # Computed values
+    def start_mean(self, data):
+        # Mean of the 10 points before the one preceding enable_index. NaN as in Measurement if the power is
+        # enabled before those points exist, since take_along_axis would wrap the negative indices to the padding.
+        indices = self.enable_index[:, np.newaxis] + np.arange(-11, -1)
+        means = np.take_along_axis(data, np.maximum(indices, 0), axis=1).mean(axis=1)
+        return np.where(self.enable_index >= 11, means, np.nan)
+
+    @functools.cached_property
+    def temp_hot_start(self):
+        return self.start_mean(self.temp_hot_orig)
+
+    @functools.cached_property
+    def temp_cold_start(self):
+        return self.start_mean(self.temp_cold_orig)
+
+    @functools.cached_property
+    def temp_start(self):
+        return (self.temp_hot_start + self.temp_cold_start)/2
+
+    @functools.cached_property
+    def offset_hot(self):
+        return (self.temp_cold_start - self.temp_hot_start)/2
+
+    @functools.cached_property
+    def offset_cold(self):
+        return (self.temp_hot_start - self.temp_cold_start)/2
+
+    @functools.cached_property
+    def temp_hot(self):
+        return self.temp_hot_orig + self.offset_hot[:, np.newaxis]
+
+    @functools.cached_property
+    def temp_cold(self):
+        return self.temp_cold_orig + self.offset_cold[:, np.newaxis]
+
+    @functools.cached_property
+    def temp_max(self):
+        return take(self.temp_hot_orig, self.temp_peak_index) + self.offset_hot
+
+    @functools.cached_property
+    def temp_min(self):
+        return take(self.temp_cold_orig, self.temp_min_index) + self.offset_cold
+
+    @functools.cached_property
+    def temp_cold_max(self):
+        return take(self.temp_cold_orig, self.stop_index) + self.offset_cold
+
+    @functools.cached_property
+    def temp_hot_end(self):
+        return take(self.temp_hot_orig, self.stop_index) + self.offset_hot
+
+    # Times
+    @functools.cached_property
+    def time_total(self):
+        return take(self.time_vec, self.stop_index)
+
+    @functools.cached_property
+    def dtime(self):
+        return self.time_vec[:, 1]
+
+    @functools.cached_property
+    def time_pump(self):
+        return take(self.time_vec, self.temp_peak_index) - take(self.time_vec, self.enable_index)
+
+    @functools.cached_property
+    def time_gen(self):
+        return take(self.time_vec, self.stop_index) - take(self.time_vec, self.temp_peak_index)
+
+    # Temperature differences
+    @functools.cached_property
+    def dtemp_pump_hot(self):
+        return self.temp_max - self.temp_start
+
+    @functools.cached_property
+    def dtemp_pump_cold(self):
+        return self.temp_start - self.temp_min
+
+    @functools.cached_property
+    def dtemp_engine_hot(self):
+        return self.temp_max - self.temp_hot_end
+
+    @functools.cached_property
+    def dtemp_engine_cold(self):
+        return self.temp_cold_max - self.temp_min
+
+    # Transferred heat
+    @functools.cached_property
+    def qhot_pump(self):
+        return self.heat(self.dtemp_pump_hot)
+
+    @functools.cached_property
+    def qcold_pump(self):
+        return self.heat(self.dtemp_pump_cold)
+
+    @functools.cached_property
+    def qhot_engine(self):
+        return self.heat(self.dtemp_engine_hot)
+
+    @functools.cached_property
+    def qcold_engine(self):
+        return self.heat(self.dtemp_engine_cold)
+
+    # Cumulative integrals of each row, after which the integral over any interval takes O(1) time
+    @functools.cached_property
+    def temp_hot_cumulative(self):
+        return peltier.cumulative_trapz(self.temp_hot_orig)
+
+    @functools.cached_property
+    def temp_cold_cumulative(self):
+        return peltier.cumulative_trapz(self.temp_cold_orig)
+
+    # The works are over whole rows, for which a plain sum is enough
+    @functools.cached_property
+    def work_inp(self):
+        return row_trapz(self.power_inp, self.power_inp_lengths, self.dtime)
+
+    @functools.cached_property
+    def work_gen(self):
+        return row_trapz(self.power_gen, self.power_gen_lengths, self.dtime)
+
+    # Heat transfer through the insulator
+    @functools.cached_property
+    def conductance(self):
+        # k*A/x, NaN without an insulator
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.not_air,
+                            self.thermal_conductivity * self.aluminium_area / self.insulator_thickness, np.nan)
+
+    def heat_loss(self, cumulative, offset, start, stop):
+        """
+        Integral of k*A*(T - T_start)/x over [start, stop) of each row
+        The heat transfer speed is linear in the temperature, so it's integrated without computing it as a vector.
+        :param cumulative: 2D Numpy array of cumulative integrals of the temperatures before normalisation
+        :param offset: Numpy array of the normalisation offsets
+        :return: Numpy array of heats (J)
+        """
+        integral = segment_integral(cumulative, start, stop, self.dtime)
+        # The trapezoidal rule integrates a constant c to c * (n-1) * dx
+        constant = (offset - self.temp_start) * np.maximum(stop - start - 1, 0) * self.dtime
+        return self.conductance * (integral + constant)
+
+    @functools.cached_property
+    def heat_loss_pump_hot(self):
+        return self.heat_loss(self.temp_hot_cumulative, self.offset_hot, self.enable_index, self.temp_peak_index)
+
+    @functools.cached_property
+    def heat_loss_pump_cold(self):
+        return -self.heat_loss(self.temp_cold_cumulative, self.offset_cold, self.enable_index, self.temp_peak_index)
+
+    @functools.cached_property
+    def heat_loss_gen_hot(self):
+        return self.heat_loss(self.temp_hot_cumulative, self.offset_hot, self.temp_peak_index, self.stop_index)
+
+    @functools.cached_property
+    def heat_loss_gen_cold(self):
+        return -self.heat_loss(self.temp_cold_cumulative, self.offset_cold, self.temp_peak_index, self.stop_index)
+
+    @functools.cached_property
+    def qhot_resistor(self):
+        # Without an insulator the conductance is NaN and the estimate is the energy input
+        loss = self.conductance * self.time_pump / (2*self.mass * self.heat_capacity)
+        return self.work_inp / (1 + np.nan_to_num(loss))
+
+    # Heat pump
+    @functools.cached_property
+    def cop_hot(self):
+        return self.qhot_pump / self.work_inp
+
+    @functools.cached_property
+    def cop_cold(self):
+        return self.qcold_pump / self.work_inp
+
+    @functools.cached_property
+    def cop_hot_ideal(self):
+        return self.qhot_pump / (self.qhot_pump - self.qcold_pump)
+
+    @functools.cached_property
+    def cop_cold_ideal(self):
+        return self.qcold_pump / (self.qhot_pump - self.qcold_pump)
+
+    @functools.cached_property
+    def cop_hot_carnot(self):
+        return (self.temp_max+273.15)/(self.temp_max-self.temp_min)
+
+    @functools.cached_property
+    def cop_cold_carnot(self):
+        return (self.temp_min+273.15)/(self.temp_max-self.temp_min)
+
+    @functools.cached_property
+    def carnot_fraction_cooler(self):
+        return self.cop_cold / self.cop_cold_carnot
+
+    # Heat engine
+    @functools.cached_property
+    def heat_transfer_efficiency(self):
+        return self.work_gen / (self.qhot_engine - self.qcold_engine)
+
+    @functools.cached_property
+    def efficiency(self):
+        return self.work_gen / self.qhot_engine
+
+    @functools.cached_property
+    def efficiency_ideal(self):
+        return 1 - (self.qcold_engine / self.qhot_engine)
+
+    @functools.cached_property
+    def efficiency_carnot(self):
+        return (self.temp_max-self.temp_min)/(self.temp_max+273.15)
+
+    @functools.cached_property
+    def efficiency_total(self):
+        return self.work_gen / self.work_inp
+
+    def results(self):
+        """
+        Returns the computed values of all the measurements in a machine-readable form
+        :return: dict of the values of peltier.RESULTS, each a list or a Numpy array with one element per measurement
+        """
+        return {name: self.names if name == "name" else getattr(self, name) for name in peltier.RESULTS}
@@ -0,0 +1,440 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Timing of the data loading and analysis of the Peltier measurements
+# Run with fys1010-peltier-benchmark or python -m fys1010.peltier.benchmark
+
+import contextlib
+import functools
+import io
+import os
+import shutil
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+from . import batch
+from . import campaign
+from . import decimation
+from . import peltier
+from . import results
+
+
+FILENAMES = ["Current.txt", "Power.txt", "PowerGenerated.txt", "Qcold.txt", "Qcold_pump.txt", "Qhot.txt",
+             "Qhot_pump.txt", "Tc_initial.txt", "Temperature1.txt", "Temperature2.txt", "Voltage.txt"]
+RUNS = [peltier.data_path("finnfoam"), peltier.data_path("wood"), peltier.data_path("air")]
+
+# np.trapz was renamed to np.trapezoid in NumPy 2.0 and removed later
+trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+def readfile_loop(path, filename):
+    """
+    The original row-by-row parser of Measurement.readfile, kept as a reference for the benchmarks
+    :param path: str of file path, should end with /
+    :param filename: str of file name
+    :return: data (Numpy array), title (str), labels (list of str)
+    """
+    file = open(path + filename, encoding="iso-8859-1")
+    rowlist = file.readlines()
+    file.close()
+
+    title = rowlist[0].strip("\n")
+    labels = rowlist[1].strip("\n").split(sep="\t")
+
+    data = np.zeros((len(rowlist)-2, 2))
+
+    for i in range(2, len(rowlist)):
+        columns = rowlist[i].split(sep="\t")
+        data[i-2, 0] = float(columns[0].replace(",", "."))
+        data[i-2, 1] = float(columns[1].replace(",", "."))
+
+    return data, title, labels
+
+
+def best_time(func, number=5, repeat=5):
+    """
+    :param func: function without arguments
+    :return: the best time of a single call (s)
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def benchmark_readfile():
+    """
+    Compares the vectorized Measurement.readfile to the original row-by-row parser
+    :return: -
+    """
+    # readfile doesn't use the instance, so it can be called without loading a measurement
+    measurement = peltier.Measurement.__new__(peltier.Measurement)
+
+    def read_all(reader):
+        for path in RUNS:
+            for filename in FILENAMES:
+                reader(path, filename)
+
+    # The results have to be identical before the timings mean anything
+    for path in RUNS:
+        for filename in FILENAMES:
+            old = readfile_loop(path, filename)
+            new = measurement.readfile(path, filename)
+            if not (np.array_equal(old[0], new[0]) and old[1:] == new[1:]):
+                raise Exception("Parsers disagree on " + path + filename)
+
+    time_loop = best_time(lambda: read_all(readfile_loop))
+    time_vectorized = best_time(lambda: read_all(measurement.readfile))
+
+    print("----- readfile (", len(RUNS)*len(FILENAMES), "files ) -----")
+    print("Row loop (ms):", time_loop*1e3)
+    print("Vectorized (ms):", time_vectorized*1e3)
+    print("Speedup:", time_loop/time_vectorized)
+    print()
+
+
+def clear_cache():
+    for path in RUNS:
+        shutil.rmtree(peltier.cache_path(path), ignore_errors=True)
+
+
+def load_all(use_cache=True):
+    """
+    Loads all the data vectors of our measurements, since Measurement reads its files only on first use
+    :return: list of Measurement
+    """
+    return [measurement.load() for measurement in peltier.load_measurements(use_cache=use_cache)]
+
+
+def benchmark_cache():
+    """
+    Compares loading the measurements without the cache, with an empty cache (cold) and with a filled cache (warm)
+    :return: -
+    """
+    time_no_cache = best_time(lambda: load_all(use_cache=False), number=1)
+
+    # A cold start parses the files and writes the cache, so it can be measured only once per clearing
+    times_cold = []
+    for i in range(5):
+        clear_cache()
+        start = time.perf_counter()
+        load_all()
+        times_cold.append(time.perf_counter() - start)
+    time_cold = min(times_cold)
+
+    time_warm = best_time(load_all, number=1)
+
+    print("----- Cache (", len(RUNS), "measurements ) -----")
+    print("No cache (ms):", time_no_cache*1e3)
+    print("Cold start (ms):", time_cold*1e3)
+    print("Warm start (ms):", time_warm*1e3)
+    print("Speedup of warm start:", time_no_cache/time_warm)
+    print()
+
+
+def benchmark_activity():
+    """
+    Compares loading a measurement from the activity file to parsing the .txt exports
+    :return: -
+    """
+    args = ("Air", 0.019, 900, 0.033 * 0.032)
+
+    def load_txt():
+        return peltier.Measurement(args[0], peltier.data_path("air"), *args[1:], use_cache=False).load()
+
+    def load_activity():
+        return peltier.Measurement(args[0], peltier.data_path("air") + "Activity.ds", *args[1:]).load()
+
+    txt = load_txt()
+    activity = load_activity()
+
+    time_txt = best_time(load_txt)
+    time_activity = best_time(load_activity)
+
+    print("----- Activity file -----")
+    print(".txt exports (ms):", time_txt*1e3)
+    print("Activity.ds (ms):", time_activity*1e3)
+    print("Speedup:", time_txt/time_activity)
+    # The exports are rounded, so the results can't be identical
+    print("Energy input (J), .txt:", txt.work_inp, ", .ds:", activity.work_inp)
+    print("Energy generated (J), .txt:", txt.work_gen, ", .ds:", activity.work_gen)
+    print()
+
+
+def printed_results(measurements):
+    """
+    :return: the output of Measurement.print for all the measurements (str)
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        for measurement in measurements:
+            measurement.print()
+    return output.getvalue()
+
+
+def benchmark_campaign(copies=8):
+    """
+    Loads a campaign of copies of our measurements with different numbers of worker processes
+    :param copies: number of copies of each measurement in the campaign
+    :return: -
+    """
+    with tempfile.TemporaryDirectory() as root:
+        for path in RUNS:
+            run = os.path.basename(os.path.normpath(path))
+            for i in range(copies):
+                os.symlink(os.path.abspath(path), os.path.join(root, "{}_{}".format(run, i)))
+
+        def load(workers):
+            return campaign.load_campaign(root, workers=workers, use_cache=False)
+
+        reference = printed_results(load(1))
+
+        print("----- Campaign (", len(RUNS)*copies, "measurements ) -----")
+        for workers in sorted({1, 2, 4, os.cpu_count()}):
+            if printed_results(load(workers)) != reference:
+                raise Exception("Parallel loading with " + str(workers) + " workers changed the results")
+            print(workers, "workers (ms):", best_time(lambda: load(workers), number=1, repeat=3)*1e3)
+        print()
+
+
+def events_separate(power_inp, temp_hot_orig, temp_cold_orig):
+    """
+    The original event detection of Measurement, kept as a reference for the benchmarks
+    :return: enable_index, disable_index, temp_peak_index, stop_index, temp_min
+    """
+    power_inp_max = power_inp.max()
+    enable_index = np.where(power_inp == power_inp_max)[0][0]
+    disable_index = np.argmin(np.ediff1d(power_inp))+1
+
+    temp_hot_start = np.mean(temp_hot_orig[enable_index - 11:enable_index - 1])
+    temp_cold_start = np.mean(temp_cold_orig[enable_index - 11:enable_index - 1])
+    temp_hot = temp_hot_orig + (temp_cold_start - temp_hot_start)/2
+    temp_cold = temp_cold_orig + (temp_hot_start - temp_cold_start)/2
+
+    temp_max = temp_hot.max()
+    temp_min = temp_cold.min()
+    temp_peak_index = np.where(temp_hot == temp_max)[0][0]
+    temp_cold_max = temp_cold.max()
+    stop_index = np.where(temp_cold == temp_cold_max)[0][0]
+
+    return enable_index, disable_index, temp_peak_index, stop_index, temp_min
+
+
+def synthetic_measurement(size, seed=0):
+    """
+    Creates data vectors that resemble our measurements, with the same phases at the same relative positions
+    :param size: number of samples
+    :return: power_inp, temp_hot_orig, temp_cold_orig (Numpy arrays)
+    """
+    rng = np.random.default_rng(seed)
+    phase = np.linspace(0, 1, size)
+    power_inp = np.where((phase > 0.05) & (phase < 0.3), 3 - phase, 0) + rng.normal(0, 0.01, size)
+    temp_hot_orig = 22 + 17*np.sin(np.pi*np.clip(phase/0.6, 0, 1)) + rng.normal(0, 0.01, size)
+    temp_cold_orig = 23 - 8*np.sin(np.pi*np.clip(phase/0.6, 0, 1)) + 3*phase + rng.normal(0, 0.01, size)
+    return power_inp, temp_hot_orig, temp_cold_orig
+
+
+def benchmark_events(size=10**7):
+    """
+    Compares detect_events to the original separate scans
+    :param size: number of samples
+    :return: -
+    """
+    channels = synthetic_measurement(size)
+
+    old = events_separate(*channels)
+    new = peltier.detect_events(*channels)
+    new_temp_min = channels[2][new.temp_min_index] + (np.mean(channels[1][new.enable_index - 11:new.enable_index - 1]) -
+                                                      np.mean(channels[2][new.enable_index - 11:new.enable_index - 1]))/2
+    if old[:4] != new[:4] or old[4] != new_temp_min:
+        raise Exception("Event detection methods disagree")
+
+    time_separate = best_time(lambda: events_separate(*channels), number=1, repeat=3)
+    time_fused = best_time(lambda: peltier.detect_events(*channels), number=1, repeat=3)
+
+    print("----- Event detection (", size, "samples ) -----")
+    print("Separate scans (ms):", time_separate*1e3)
+    print("detect_events (ms):", time_fused*1e3)
+    print("Speedup:", time_separate/time_fused)
+    print()
+
+
+def unanalysed_copies(loaded, copies):
+    """
+    :param loaded: list of Measurement with loaded data vectors
+    :param copies: number of copies of each measurement
+    :return: list of new Measurement objects with the same data vectors but without the computed values
+    """
+    measurements = []
+    for i in range(copies):
+        for measurement in loaded:
+            new = peltier.Measurement.__new__(peltier.Measurement)
+            new.__dict__.update((name, value) for name, value in measurement.__dict__.items()
+                                if not isinstance(getattr(peltier.Measurement, name, None), functools.cached_property))
+            measurements.append(new)
+    return measurements
+
+
+def early_start_copies(loaded, enable_index=5):
+    """
+    :param loaded: list of Measurement with loaded data vectors
+    :param enable_index: index at which the power is enabled in the copies
+    :return: list of new Measurement objects whose data vectors begin enable_index samples before the power
+        is enabled, so that there are fewer than 10 points for the start temperatures
+    """
+    measurements = unanalysed_copies(loaded, 1)
+    for measurement, original in zip(measurements, loaded):
+        offset = original.enable_index - enable_index
+        measurement.__dict__.update((name, value[offset:]) for name, value in measurement.__dict__.items()
+                                    if isinstance(value, np.ndarray))
+    return measurements
+
+
+BATCH_VALUES = ["enable_index", "stop_index", "temp_hot_start", "temp_cold_start", "temp_max", "temp_min",
+                "work_inp", "work_gen", "qhot_pump", "qcold_pump", "qhot_engine", "qcold_engine", "qhot_resistor"]
+BATCH_HEAT_LOSSES = ["heat_loss_pump_hot", "heat_loss_pump_cold", "heat_loss_gen_hot", "heat_loss_gen_cold"]
+
+
+def benchmark_batch(copies=100):
+    """
+    Compares the analysis of many measurements with MeasurementBatch to a loop over Measurement objects
+    :param copies: number of copies of each measurement
+    :return: -
+    """
+    loaded = [measurement.load() for measurement in peltier.load_measurements()]
+
+    def analyse_loop(measurements):
+        return [[getattr(measurement, name) for name in BATCH_VALUES] for measurement in measurements]
+
+    def analyse_batch(measurements):
+        measurement_batch = batch.MeasurementBatch(measurements)
+        return [getattr(measurement_batch, name) for name in BATCH_VALUES]
+
+    # The power is enabled within the first 11 samples in the early start copies
+    for measurements in (unanalysed_copies(loaded, copies), early_start_copies(loaded)):
+        measurement_batch = batch.MeasurementBatch(measurements)
+        for name in BATCH_VALUES + BATCH_HEAT_LOSSES:
+            # The heat losses don't exist without an insulator, in which case the batch has NaN
+            expected = np.array([getattr(measurement, name) if measurement.not_air or name not in BATCH_HEAT_LOSSES
+                                 else np.nan for measurement in measurements])
+            if not np.allclose(getattr(measurement_batch, name), expected, rtol=1e-9, atol=1e-12, equal_nan=True):
+                raise Exception("MeasurementBatch disagrees with Measurement on " + name)
+
+    time_loop = best_time(lambda: analyse_loop(unanalysed_copies(loaded, copies)), number=1, repeat=3)
+    time_batch = best_time(lambda: analyse_batch(unanalysed_copies(loaded, copies)), number=1, repeat=3)
+
+    print("----- Batch (", len(loaded)*copies, "measurements ) -----")
+    print("Loop over Measurement (ms):", time_loop*1e3)
+    print("MeasurementBatch (ms):", time_batch*1e3)
+    print("Speedup:", time_loop/time_batch)
+    print()
+
+
+def benchmark_segments(windows=1000):
+    """
+    Compares computing the heat loss of the heat engine phase for many choices of its end with trapezoid
+    to SegmentIntegral
+    :param windows: number of different ends
+    :return: -
+    """
+    measurement = peltier.load_measurements()[0]
+    start = measurement.temp_peak_index
+    stops = np.linspace(start + 2, measurement.heat_transfer_speed_hot.size, windows).astype(int)
+
+    def sweep_trapezoid():
+        return np.array([trapezoid(measurement.heat_transfer_speed_hot[start:stop], dx=measurement.dtime)
+                         for stop in stops])
+
+    def sweep_segments():
+        # A new SegmentIntegral each time so that the timing includes the cumulative integral
+        return peltier.SegmentIntegral(measurement.heat_transfer_speed_hot, measurement.dtime)(start, stops)
+
+    if not np.allclose(sweep_trapezoid(), sweep_segments(), rtol=1e-9, atol=1e-12):
+        raise Exception("SegmentIntegral disagrees with " + trapezoid.__name__)
+
+    time_trapezoid = best_time(sweep_trapezoid)
+    time_segments = best_time(sweep_segments)
+
+    print("----- Heat loss for", windows, "end points -----")
+    print(trapezoid.__name__, "(ms):", time_trapezoid*1e3)
+    print("SegmentIntegral (ms):", time_segments*1e3)
+    print("Speedup:", time_trapezoid/time_segments)
+    print()
+
+
+def benchmark_results(copies=167):
+    """
+    Compares producing the summary of many measurements as the text of Measurement.print to producing it as CSV
+    :param copies: number of copies of each measurement
+    :return: -
+    """
+    loaded = [measurement.load() for measurement in peltier.load_measurements()]
+
+    def summary_print():
+        return printed_results(unanalysed_copies(loaded, copies))
+
+    def summary_csv():
+        return results.format_csv(batch.MeasurementBatch(unanalysed_copies(loaded, copies)).results())
+
+    time_print = best_time(summary_print, number=1, repeat=3)
+    time_csv = best_time(summary_csv, number=1, repeat=3)
+
+    print("----- Results (", len(loaded)*copies, "measurements ) -----")
+    print("Measurement.print (ms):", time_print*1e3)
+    print("MeasurementBatch to CSV (ms):", time_csv*1e3)
+    print("Speedup:", time_print/time_csv)
+    print()
+
+
+def benchmark_decimation(size=10**7, pixels=1000):
+    """
+    Times building the min/max pyramid of a long data vector and getting the points of views of it
+    :param size: number of samples
+    :param pixels: width of the view
+    :return: -
+    """
+    vec = synthetic_measurement(size)[1]
+    pyramid = decimation.MinMaxPyramid(vec)
+    end = size * pyramid.dx
+    views = [(0, end), (end/3, end/3 + end/100), (end/2, end/2 + 100*pyramid.dx)]
+
+    time_build = best_time(lambda: decimation.MinMaxPyramid(vec), number=1, repeat=3)
+
+    print("----- Decimation (", size, "samples ) -----")
+    print("Building the pyramid (ms):", time_build*1e3)
+    for x_min, x_max in views:
+        x, y = pyramid.view(x_min, x_max, pixels)
+        print("View of", x_max - x_min, "s (ms):", best_time(lambda: pyramid.view(x_min, x_max, pixels))*1e3,
+              "with", x.size, "points")
+    print()
+
+
+def main():
+    benchmark_readfile()
+    benchmark_cache()
+    benchmark_activity()
+    benchmark_campaign()
+    benchmark_events()
+    benchmark_batch()
+    benchmark_segments()
+    benchmark_results()
+    benchmark_decimation()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Loading of measurement campaigns, i.e. directories that contain many measurement directories
+
+import concurrent.futures
+import os
+
+from . import batch
+from . import peltier
+
+
+def find_runs(root):
+    """
+    Finds the measurement directories of a campaign
+    :param root: str of the campaign directory, e.g. peltier.DATA_DIR
+    :return: list of measurement directory names, sorted so that the order is always the same
+    """
+    return sorted(name for name in os.listdir(root)
+                  if os.path.isfile(os.path.join(root, name, "Current.txt")))
+
+
+def default_parameters(run):
+    """
+    The parameters of our setup for a measurement directory.
+    The insulator is recognised from the beginning of the directory name, e.g. "wood_2" is measured with wood.
+    :param run: str of measurement directory name
+    :return: dict of keyword arguments for Measurement
+    """
+    for insulator in sorted(peltier.INSULATORS, key=len, reverse=True):
+        if run.lower().startswith(insulator):
+            thickness, conductivity = peltier.INSULATORS[insulator]
+            return {"mass": peltier.MASS, "heat_capacity": peltier.HEAT_CAPACITY,
+                    "aluminium_area": peltier.ALUMINIUM_AREA,
+                    "insulator_thickness": thickness, "thermal_conductivity": conductivity}
+    raise Exception("Unknown insulator of the measurement " + run)
+
+
+def load_run(root, run, parameters, use_cache, file_workers):
+    """
+    Loads the data of a single measurement. This is run in the worker processes.
+    :return: Measurement with all its data vectors loaded
+    """
+    measurement = peltier.Measurement(run.capitalize(), os.path.join(root, run) + "/", use_cache=use_cache,
+                                      **parameters(run))
+    return measurement.load(workers=file_workers)
+
+
+def load_campaign(root, parameters=default_parameters, workers=None, file_workers=1, use_cache=True):
+    """
+    Loads all the measurements of a campaign in parallel processes
+    :param root: str of the campaign directory, e.g. peltier.DATA_DIR
+    :param parameters: function that returns the keyword arguments of Measurement for a directory name,
+                       must be picklable (i.e. defined at module level) when workers != 1
+    :param workers: number of processes (int), None for the number of CPUs, 1 to load in this process
+    :param file_workers: number of threads that read the files of a single measurement (int)
+    :param use_cache: use the binary cache of parsed files (bool)
+    :return: list of Measurement in the order of find_runs
+    """
+    runs = find_runs(root)
+    count = len(runs)
+
+    if workers == 1 or count <= 1:
+        return [load_run(root, run, parameters, use_cache, file_workers) for run in runs]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        # map returns the results in the order of the arguments regardless of which process finishes first
+        return list(executor.map(load_run, [root]*count, runs, [parameters]*count, [use_cache]*count,
+                                 [file_workers]*count))
+
+
+def load_campaign_batch(root, **kwargs):
+    """
+    Loads all the measurements of a campaign for analysis as a single MeasurementBatch
+    :param root: str of the campaign directory, e.g. peltier.DATA_DIR
+    :param kwargs: keyword arguments of load_campaign
+    :return: MeasurementBatch with the measurements in the order of find_runs
+    """
+    return batch.MeasurementBatch(load_campaign(root, **kwargs))
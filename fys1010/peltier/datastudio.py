@@ -0,0 +1,259 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Reader for the binary .ds activity files of the DataStudio measurement software
+#
+# The format is undocumented, so this is based on the files of our own measurements.
+# The file begins with a UTF-16 byte order mark and "SW30", after which it consists of blocks.
+# A block begins with the marker FF FE, a uint32 of its size (counted from the size field) and a single byte
+# of the block kind. The rest of the block is a sequence of items:
+#   uint32 payload length, uint16 type, uint16 tag, payload
+# Items of the type CONTAINER have a block as their payload, so the blocks form a tree.
+# A data source (e.g. "Current") is a container with the tag DATA_SOURCE. Its measured samples are stored in
+# a RUN container as consecutive POINT items, each of which holds a (time, value) pair of float64s.
+# Since these are all 24 bytes long, a whole run can be read at once as a structured Numpy array.
+#
+# Calculated data sources of the DataStudio calculator (Power, Power Generated, Qcold etc.) are not stored
+# in the file. Those that our measurements use are computed by Activity.export from their formulas.
+
+import collections
+import mmap
+import struct
+
+import numpy as np
+
+
+MAGIC = b"\xff\xfe" + "SW30".encode("utf-16-le")
+BLOCK_MARKER = b"\xff\xfe"
+
+# Item types
+TYPE_STRING = 0x0a
+TYPE_POINT = 0x11
+TYPE_CONTAINER = 0x12
+
+# Item tags
+TAG_NAME = 1
+TAG_RUN = 5
+TAG_UNIT = 9
+TAG_SAMPLES = 11
+TAG_DATA_SOURCE = 14
+
+ITEM_HEADER = struct.Struct("<IHH")
+POINT_DTYPE = np.dtype([("length", "<u4"), ("type", "<u2"), ("tag", "<u2"), ("time", "<f8"), ("value", "<f8")])
+
+Channel = collections.namedtuple("Channel", ["name", "unit", "run", "data"])
+
+
+def read_activity(filename):
+    """
+    Reads all the measured data sources of a DataStudio activity file
+    :param filename: str of file path
+    :return: list of Channel(name (str), unit (str), run (str), data (Numpy array of time and value columns))
+    """
+    with open(filename, "rb") as file:
+        # Memory mapping lets the sample runs be read straight from the file without copying the whole file
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if buffer[:len(MAGIC)] != MAGIC:
+                raise Exception(filename + " is not a DataStudio activity file")
+
+            channels = []
+            _parse_blocks(buffer, len(MAGIC), len(buffer), None, channels)
+
+    return channels
+
+
+def _parse_blocks(buffer, start, end, source, channels):
+    """
+    Parses the items of consecutive blocks
+    :param buffer: contents of the file
+    :param start: offset of the first block
+    :param end: offset of the end of the blocks
+    :param source: dict of the properties of the data source being parsed, None outside data sources
+    :param channels: list to which the channels are appended
+    :return: -
+    """
+    offset = start
+    while offset < end:
+        if buffer[offset:offset+2] == BLOCK_MARKER:
+            # The block kind byte after the size isn't needed
+            size = struct.unpack_from("<I", buffer, offset+2)[0]
+            _parse_blocks(buffer, offset+7, offset+2+size, source, channels)
+            offset += 2 + size
+            continue
+
+        length, item_type, tag = ITEM_HEADER.unpack_from(buffer, offset)
+        payload = offset + ITEM_HEADER.size
+
+        if item_type == TYPE_POINT and length == POINT_DTYPE.itemsize - ITEM_HEADER.size:
+            points = _read_points(buffer, offset, end, tag)
+            if tag == TAG_SAMPLES and source is not None:
+                data = np.column_stack((points["time"], points["value"]))
+                channels.append(Channel(source["name"], source["units"][-1], source.get("run", ""), data))
+            offset += points.size * POINT_DTYPE.itemsize
+            continue
+
+        if item_type == TYPE_CONTAINER:
+            if tag == TAG_DATA_SOURCE:
+                _parse_blocks(buffer, payload, payload+length, {"name": None, "units": []}, channels)
+            else:
+                _parse_blocks(buffer, payload, payload+length, source, channels)
+        elif item_type == TYPE_STRING and source is not None:
+            # Strings are null-terminated UTF-16
+            text = bytes(buffer[payload:payload+length]).decode("utf-16-le").rstrip("\x00")
+            if tag == TAG_NAME and source["name"] is None:
+                source["name"] = text
+            elif tag == TAG_UNIT:
+                source["units"].append(text)
+            elif tag == TAG_RUN:
+                source["run"] = text
+
+        offset = payload + length
+
+
+def _read_points(buffer, offset, end, tag):
+    """
+    Reads consecutive point items that have the same tag
+    :return: structured Numpy array of POINT_DTYPE
+    """
+    count = (end - offset) // POINT_DTYPE.itemsize
+    points = np.frombuffer(buffer, dtype=POINT_DTYPE, count=count, offset=offset)
+    is_point = (points["length"] == POINT_DTYPE.itemsize - ITEM_HEADER.size) & \
+               (points["type"] == TYPE_POINT) & (points["tag"] == tag)
+    if not is_point.all():
+        count = np.argmin(is_point)
+
+    # Copy so that the arrays don't refer to the memory map after the file is closed
+    return points[:count].copy()
+
+
+def smooth(n, data):
+    """
+    The smooth(n, x) function of the DataStudio calculator, i.e. a moving average of n points
+    Only complete windows are included, and the time of a point is the mean time of its window.
+    :param n: number of points to average (int)
+    :param data: Numpy array of time and value columns
+    :return: Numpy array of time and value columns, n-1 rows shorter than data
+    """
+    cumulative = np.concatenate((np.zeros((1, 2)), np.cumsum(data, axis=0)))
+    return (cumulative[n:] - cumulative[:-n]) / n
+
+
+def select(lower, upper, data):
+    """
+    The filter(lower, upper, x) function of the DataStudio calculator, which drops the points outside [lower, upper]
+    :param data: Numpy array of time and value columns
+    :return: Numpy array of time and value columns
+    """
+    return data[(data[:, 1] >= lower) & (data[:, 1] <= upper)]
+
+
+def resample(data, time_vec):
+    """
+    Values of data at the given times. The DataStudio calculator interpolates linearly when it combines
+    data sources that have different time bases.
+    :param data: Numpy array of time and value columns
+    :param time_vec: Numpy array of times
+    :return: Numpy array of values
+    """
+    return np.interp(time_vec, data[:, 0], data[:, 1])
+
+
+def with_values(time_vec, values):
+    return np.column_stack((time_vec, values))
+
+
+class Activity:
+    def __init__(self, filename):
+        """
+        This class holds the data sources of a DataStudio activity file
+        :param filename: str of file path
+        """
+        self.filename = filename
+        self.channels = read_activity(filename)
+
+    def channel(self, name):
+        """
+        :param name: name of a measured data source, e.g. "Current"
+        :return: data of the first data source of the given name (Numpy array of time and value columns)
+        """
+        for channel in self.channels:
+            if channel.name == name:
+                return channel.data
+        raise Exception("The data source \"" + name + "\" was not found from " + self.filename)
+
+    def export(self, filename, mass, heat_capacity):
+        """
+        Returns the data that DataStudio writes to the given .txt export of our measurements.
+        The calculated data sources are computed with the formulas of our activity. The values agree with
+        the exports within their rounding, except for the start of Qcold_pump, where the interpolation differs
+        slightly. The times of Power Generated differ where the filter has left gaps in the data.
+        :param filename: str of file name, e.g. "Current.txt"
+        :param mass: mass (kg)
+        :param heat_capacity: (kg * degC)
+        :return: data (Numpy array of time and value columns)
+        """
+        current = self.channel("Current")
+        voltage = self.channel("Voltage")
+        temp_cold = self.channel("Temperature 1 (cold)")
+        temp_hot = self.channel("Temperature 2 (hot)")
+        heat_capacity_total = mass * heat_capacity
+
+        # The min() and max() of the DataStudio calculator are the extremes so far, not over the whole run
+        if filename == "Current.txt":
+            return current
+        if filename == "Voltage.txt":
+            return voltage
+        if filename == "Temperature1.txt":
+            return temp_cold
+        if filename == "Temperature2.txt":
+            return temp_hot
+        if filename == "Power.txt":
+            # filter(0,1,I)*V
+            power = select(0, 1, current)
+            return with_values(power[:, 0], power[:, 1] * resample(voltage, power[:, 0]))
+        if filename == "PowerGenerated.txt":
+            # -smooth(8, filter(-1,0,smooth(8,I))*V)
+            current_gen = select(-1, 0, smooth(8, current))
+            power = with_values(current_gen[:, 0], current_gen[:, 1] * resample(voltage, current_gen[:, 0]))
+            power = smooth(8, power)
+            return with_values(power[:, 0], -power[:, 1])
+        if filename == "Qcold.txt":
+            # -m*c*(min(T)-T)
+            temp = temp_cold[:, 1]
+            return with_values(temp_cold[:, 0], -heat_capacity_total * (np.minimum.accumulate(temp) - temp))
+        if filename == "Qhot.txt":
+            # m*c*(max(T)-T)
+            temp = temp_hot[:, 1]
+            return with_values(temp_hot[:, 0], heat_capacity_total * (np.maximum.accumulate(temp) - temp))
+        if filename == "Qhot_pump.txt":
+            # m*c*(max(T)-min(T))
+            temp = temp_hot[:, 1]
+            return with_values(temp_hot[:, 0],
+                               heat_capacity_total * (np.maximum.accumulate(temp) - np.minimum.accumulate(temp)))
+        if filename == "Tc_initial.txt":
+            # First(smooth(8,Tc))
+            temp_initial = smooth(8, temp_cold)
+            return with_values(temp_initial[:, 0], np.full(temp_initial.shape[0], temp_initial[0, 1]))
+        if filename == "Qcold_pump.txt":
+            # m*c*(Tinit-min(T))
+            temp_initial = self.export("Tc_initial.txt", mass, heat_capacity)
+            temp = resample(temp_cold, temp_initial[:, 0])
+            return with_values(temp_initial[:, 0],
+                               heat_capacity_total * (temp_initial[:, 1] - np.minimum.accumulate(temp)))
+
+        raise Exception("Unknown DataStudio export " + filename)
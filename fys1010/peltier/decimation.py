@@ -0,0 +1,139 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Decimation of long data vectors for plotting
+#
+# A screen can't show more than a couple of points per pixel, so plotting millions of samples only slows down
+# panning and zooming. The minima and maxima of blocks of samples are computed beforehand for block sizes of
+# FACTOR, FACTOR^2, FACTOR^3 etc. When the view changes, the plot gets only the visible part of the finest level
+# that has at most two blocks per pixel. Drawing both the minimum and the maximum of each block keeps
+# the peaks in the plot even though most of the samples are left out.
+
+import numpy as np
+
+
+# Ratio of the block sizes of consecutive levels
+FACTOR = 4
+
+
+def reduce_blocks(func, vec):
+    """
+    Reduces each block of FACTOR consecutive values to one
+    Combining strided views elementwise is faster than reshaping and reducing along an axis.
+    :param func: np.minimum or np.maximum
+    :param vec: Numpy array
+    :return: Numpy array of ceil(vec.size / FACTOR) values, the last block may be shorter than the others
+    """
+    full = vec.size - vec.size % FACTOR
+    result = vec[0:full:FACTOR]
+    for i in range(1, FACTOR):
+        result = func(result, vec[i:full:FACTOR])
+    if full < vec.size:
+        result = np.append(result, func.reduce(vec[full:]))
+    return result
+
+
+class MinMaxPyramid:
+    def __init__(self, vec, dx=0.1, offset=0):
+        """
+        This class holds the minima and maxima of the blocks of a data vector on all the levels.
+        Building it takes O(n) time and 2n/(FACTOR-1) values of memory.
+        :param vec: data vector (Numpy array)
+        :param dx: time between the samples (s)
+        :param offset: index of the first sample, i.e. its time is offset*dx
+        """
+        self.vec = vec
+        self.dx = dx
+        self.offset = offset
+
+        # levels[k] = (minima, maxima) of blocks of FACTOR^(k+1) samples
+        self.levels = []
+        minima = maxima = vec
+        while minima.size > 1:
+            minima = reduce_blocks(np.minimum, minima)
+            maxima = reduce_blocks(np.maximum, maxima)
+            self.levels.append((minima, maxima))
+
+    def view(self, x_min, x_max, pixels):
+        """
+        Returns the points to draw for a view
+        :param x_min: start of the visible time range (s)
+        :param x_max: end of the visible time range (s)
+        :param pixels: width of the view in pixels (int)
+        :return: x, y (Numpy arrays of at most about 4*pixels points)
+        """
+        start = max(int(np.floor(x_min / self.dx)) - self.offset, 0)
+        stop = min(int(np.ceil(x_max / self.dx)) - self.offset + 2, self.vec.size)
+        if stop <= start:
+            return np.empty(0), np.empty(0)
+
+        # The finest level that has at most two blocks per pixel
+        level = 0
+        while level < len(self.levels) and (stop - start) // FACTOR**level > 2*pixels:
+            level += 1
+
+        if level == 0:
+            return (np.arange(start, stop) + self.offset) * self.dx, self.vec[start:stop]
+
+        block = FACTOR**level
+        minima, maxima = self.levels[level-1]
+        first = start // block
+        last = -(-stop // block)
+        # Both extremes of a block are drawn at its start, which gives a vertical line over the range of the block
+        x = np.repeat((np.arange(first, last) * block + self.offset) * self.dx, 2)
+        y = np.empty(x.size)
+        y[0::2] = minima[first:last]
+        y[1::2] = maxima[first:last]
+        return x, y
+
+
+class DecimatedCurve:
+    def __init__(self, plot, vec, dx=0.1, offset=0, **kwargs):
+        """
+        A curve of a PyQtGraph plot that shows the decimated data for the current view
+        The data is updated whenever the plot is panned, zoomed or resized.
+        :param plot: PyQtGraph PlotItem
+        :param vec: data vector (Numpy array)
+        :param dx: time between the samples (s)
+        :param offset: index of the first sample
+        :param kwargs: arguments of plot.plot, e.g. pen and name
+        """
+        self.pyramid = MinMaxPyramid(vec, dx, offset)
+        self.view_box = plot.getViewBox()
+        self.curve = plot.plot(**kwargs)
+
+        self.view_box.sigXRangeChanged.connect(self.update)
+        self.view_box.sigResized.connect(self.update)
+        self.update()
+
+    def set_data(self, vec, dx=0.1, offset=0):
+        """
+        Replaces the data of the curve, so that the plot can be reused for another measurement
+        :param vec: data vector (Numpy array)
+        :param dx: time between the samples (s)
+        :param offset: index of the first sample
+        :return: -
+        """
+        self.pyramid = MinMaxPyramid(vec, dx, offset)
+        self.update()
+
+    def update(self, *args):
+        x_range = self.view_box.viewRange()[0]
+        # The view box has no size before it's shown for the first time
+        pixels = max(int(self.view_box.width()), 100)
+        self.curve.setData(*self.pyramid.view(x_range[0], x_range[1], pixels))
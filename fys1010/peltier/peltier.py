@@ -0,0 +1,809 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import collections
+import concurrent.futures
+import functools
+import glob
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from .. import tables
+from . import datastudio
+
+
+# Our measurements, relative to this file so that they are found regardless of the working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Parsed measurement files are cached in a per-user directory, since the data directory may be read-only after
+# installation. It can be changed with the environment variable FYS1010_CACHE_DIR.
+CACHE_DIR = os.environ.get("FYS1010_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "fys1010", "peltier")
+
+
+def cache_path(path):
+    """
+    :param path: str of the path of a measurement directory
+    :return: str of the cache directory of the measurement, ending with a "/"
+    """
+    path = os.path.abspath(path)
+    # The hash keeps the directories of measurements with the same name apart
+    digest = hashlib.sha1(path.encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, os.path.basename(path) + "-" + digest, "")
+
+
+def parse_rows(text, columns):
+    """
+    Parses data rows of a DataStudio .txt export
+    :param text: str of complete rows
+    :param columns: number of columns (int)
+    :return: data (Numpy array)
+    """
+    # DataStudio uses decimal commas. Since the columns are separated by tabs, all the commas can be
+    # replaced at once and the whole table can then be parsed in a single pass without Python-level loops.
+    data = np.fromstring(text.replace(",", "."), sep=" ")
+    # An empty cell or a stray token would shift the following values to the wrong columns without any error,
+    # so the number of separators and values are checked for the whole table
+    rows = text.count("\n") + (text != "" and not text.endswith("\n"))
+    if text.count("\t") != rows*(columns - 1) or data.size != rows*columns:
+        raise Exception("Expected {} rows of {} tab-separated values, got {} values".format(rows, columns, data.size))
+    return data.reshape(rows, columns)
+
+
+class Segmentation(collections.namedtuple("Segmentation", ["enable_index", "disable_index", "temp_peak_index",
+                                                            "stop_index", "temp_min_index"])):
+    """
+    The phases of a measurement
+    enable_index: the power is applied, i.e. the peak of the input power
+    disable_index: the power is disabled, i.e. the steepest drop of the input power
+    temp_peak_index: the peak temperature of the hot side, which ends the heat pump phase
+                     (not exactly the same as disable_index)
+    stop_index: the peak temperature of the cold side, which ends the heat engine phase
+    temp_min_index: the minimum temperature of the cold side
+
+    The heat pump phase is [enable_index, temp_peak_index) and the heat engine phase [temp_peak_index, stop_index).
+    """
+    __slots__ = ()
+
+    @property
+    def pump(self):
+        return slice(self.enable_index, self.temp_peak_index)
+
+    @property
+    def gen(self):
+        return slice(self.temp_peak_index, self.stop_index)
+
+
+def detect_events(power_inp, temp_hot, temp_cold):
+    """
+    Finds the phases of a measurement.
+    Each extreme is found with a single argmax or argmin pass, since the index of the first maximum also gives its
+    value. The temperatures don't have to be normalised first, as the normalisation is a constant shift.
+    :param power_inp: input power (Numpy array)
+    :param temp_hot: temperature of the hot side (Numpy array)
+    :param temp_cold: temperature of the cold side (Numpy array)
+    :return: Segmentation
+    """
+    return Segmentation(
+        enable_index=int(np.argmax(power_inp)),
+        # Gets minimum of consecutive elements of power vector
+        disable_index=int(np.argmin(np.diff(power_inp)))+1,
+        temp_peak_index=int(np.argmax(temp_hot)),
+        stop_index=int(np.argmax(temp_cold)),
+        temp_min_index=int(np.argmin(temp_cold))
+    )
+
+
+def cumulative_trapz(vec, initial=0.0):
+    """
+    Cumulative trapezoidal integral of points with unit spacing along the last axis
+    :param vec: Numpy array
+    :param initial: value of the integral at the first point
+    :return: Numpy array of the same shape, where [..., i] = initial + np.trapz(vec[..., :i+1])
+    """
+    steps = (vec[..., 1:] + vec[..., :-1]) / 2
+    cumulative = np.empty(vec.shape)
+    cumulative[..., :1] = initial
+    np.cumsum(steps, axis=-1, out=cumulative[..., 1:])
+    if initial:
+        cumulative[..., 1:] += initial
+    return cumulative
+
+
+def segment_integral(cumulative, start, stop, dx):
+    """
+    Same as np.trapz(vec[start:stop], dx=dx) in O(1) time, given the cumulative_trapz of vec
+    The indices can also be Numpy arrays, in which case the integrals over all the intervals are computed at once.
+    :param cumulative: 1D Numpy array from cumulative_trapz
+    :param start: index of the first point (int or Numpy array)
+    :param stop: index after the last point (int or Numpy array), limited to the length of the data
+    :param dx: spacing of the points
+    :return: integral (float or Numpy array)
+    """
+    start = np.asarray(start)
+    stop = np.minimum(stop, cumulative.shape[-1])
+    # An interval of less than two points has no area
+    valid = stop - start >= 2
+    integral = cumulative[np.where(valid, stop-1, 0)] - cumulative[np.where(valid, start, 0)]
+    return np.where(valid, dx * integral, 0.0)[()]
+
+
+class SegmentIntegral:
+    def __init__(self, vec, dx):
+        """
+        This class integrates a data vector over any interval in O(1) time.
+        The cumulative integral is computed once, after e.g. the heat loss over many different intervals can be
+        computed without going through the data again.
+        :param vec: data vector (Numpy array)
+        :param dx: spacing of the points
+        """
+        self.dx = dx
+        self.cumulative = cumulative_trapz(vec)
+
+    def __len__(self):
+        return self.cumulative.size
+
+    def __call__(self, start=0, stop=None):
+        """
+        :param start: index of the first point (int or Numpy array)
+        :param stop: index after the last point (int or Numpy array), None for the end of the data
+        :return: same as np.trapz(vec[start:stop], dx=dx) (float or Numpy array)
+        """
+        if stop is None:
+            stop = len(self)
+        return segment_integral(self.cumulative, start, stop, self.dx)
+
+
+class FileColumn:
+    """
+    A data vector of a measurement that is loaded from its file only when it's used for the first time.
+    The loaded vector replaces the descriptor in the instance dictionary, so later accesses are plain attribute lookups.
+    """
+    def __init__(self, filename, column=1):
+        """
+        :param filename: str of file name, e.g. "Current.txt"
+        :param column: index of the column (0 = time, 1 = value)
+        """
+        self.filename = filename
+        self.column = column
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        vector = instance.loadfile(instance.path, self.filename)[:, self.column]
+        instance.__dict__[self.name] = vector
+        return vector
+
+
+class Measurement:
+    def __init__(self, name, path, mass, heat_capacity, aluminium_area, insulator_thickness=0.0, thermal_conductivity=0.0,
+                 use_cache=True):
+        """
+        This class holds the data of a single measurement
+        The data vectors and the computed values are evaluated only when they are used for the first time,
+        so only the files that are needed for the requested results are read.
+        :param name: Name of the measurement (str)
+        :param path: Path of measurement files (str), should end with a "/"
+                     or path of a DataStudio activity file (str), ending with ".ds"
+        :param mass: mass (kg)
+        :param heat_capacity (kg * degC)
+        :param aluminium_area (m^2)
+        :param insulator_thickness (m)
+        :param thermal_conductivity of the insulator (W/(m*K)
+        :param use_cache: use the binary cache of parsed files (bool)
+        """
+
+        self.name = name
+        self.path = path
+        self.use_cache = use_cache
+        self.mass = mass
+        self.heat_capacity = heat_capacity
+
+        self.aluminium_area = aluminium_area
+        self.insulator_thickness = insulator_thickness
+        self.thermal_conductivity = thermal_conductivity
+        self.not_air = (self.insulator_thickness != 0)
+
+    # Numpy arrays for data vectors
+    time_vec = FileColumn("Current.txt", column=0)
+    current = FileColumn("Current.txt")
+    power_inp = FileColumn("Power.txt")
+    power_gen = FileColumn("PowerGenerated.txt")
+    qcold_vec = FileColumn("Qcold.txt")
+    qcold_pump_vec = FileColumn("Qcold_pump.txt")
+    qhot_vec = FileColumn("Qhot.txt")
+    qhot_pump_vec = FileColumn("Qhot_pump.txt")
+    tc_initial = FileColumn("Tc_initial.txt")
+    temp_cold_orig = FileColumn("Temperature1.txt")
+    temp_hot_orig = FileColumn("Temperature2.txt")
+    voltage = FileColumn("Voltage.txt")
+
+    @functools.cached_property
+    def activity(self):
+        # The data can be read directly from the activity file instead of the .txt exports
+        if self.path.endswith(".ds"):
+            return datastudio.Activity(self.path)
+        return None
+
+    @functools.cached_property
+    def segmentation(self):
+        return detect_events(self.power_inp, self.temp_hot_orig, self.temp_cold_orig)
+
+    # Check when the power is applied
+    # The peak voltage appears to be a good point for it
+    @functools.cached_property
+    def enable_index(self):
+        return self.segmentation.enable_index
+
+    @functools.cached_property
+    def power_inp_max(self):
+        return self.power_inp[self.enable_index]
+
+    @functools.cached_property
+    def disable_index(self):
+        return self.segmentation.disable_index
+
+    # Computed values
+    @functools.cached_property
+    def temp_hot_start(self):
+        # Without the 10 points before the one preceding enable_index the slice would be empty, or wrap around
+        if self.enable_index < 11:
+            return np.nan
+        return np.mean(self.temp_hot_orig[self.enable_index - 11:self.enable_index - 1])
+
+    @functools.cached_property
+    def temp_cold_start(self):
+        if self.enable_index < 11:
+            return np.nan
+        return np.mean(self.temp_cold_orig[self.enable_index - 11:self.enable_index - 1])
+
+    @functools.cached_property
+    def temp_start(self):
+        return (self.temp_hot_start + self.temp_cold_start)/2
+
+    # Normalise temperatures to same level
+    @functools.cached_property
+    def offset_hot(self):
+        return (self.temp_cold_start - self.temp_hot_start)/2
+
+    @functools.cached_property
+    def offset_cold(self):
+        return (self.temp_hot_start - self.temp_cold_start)/2
+
+    @functools.cached_property
+    def temp_hot(self):
+        return self.temp_hot_orig + self.offset_hot
+
+    @functools.cached_property
+    def temp_cold(self):
+        return self.temp_cold_orig + self.offset_cold
+
+    @functools.cached_property
+    def temp_peak_index(self):
+        # Is not exactly the same as self.disable_index
+        return self.segmentation.temp_peak_index
+
+    @functools.cached_property
+    def temp_max(self):
+        return self.temp_hot_orig[self.temp_peak_index] + self.offset_hot
+
+    @functools.cached_property
+    def temp_min(self):
+        return self.temp_cold_orig[self.segmentation.temp_min_index] + self.offset_cold
+
+    # Check when to end the measurement
+    # The peak temperature of the cold side appears to be a good point for it
+    @functools.cached_property
+    def stop_index(self):
+        return self.segmentation.stop_index
+
+    @functools.cached_property
+    def temp_cold_max(self):
+        return self.temp_cold_orig[self.stop_index] + self.offset_cold
+
+    @functools.cached_property
+    def temp_hot_end(self):
+        return self.temp_hot_orig[self.stop_index] + self.offset_hot
+
+    # Computed vectors
+    @functools.cached_property
+    def temp_diff(self):
+        return self.temp_hot - self.temp_cold
+
+    @functools.cached_property
+    def power(self):
+        return self.current * self.voltage
+
+    # Times
+    @functools.cached_property
+    def time_total(self):
+        return self.time_vec[self.stop_index]
+
+    @functools.cached_property
+    def dtime(self):
+        return self.time_vec[1]
+
+    @functools.cached_property
+    def time_pump(self):
+        return self.time_vec[self.temp_peak_index] - self.time_vec[self.enable_index]
+
+    @functools.cached_property
+    def time_gen(self):
+        return self.time_vec[self.stop_index] - self.time_vec[self.temp_peak_index]
+
+    # Temperature differences
+    @functools.cached_property
+    def dtemp_pump_hot(self):
+        return self.temp_max - self.temp_start
+
+    @functools.cached_property
+    def dtemp_pump_cold(self):
+        return self.temp_start - self.temp_min
+
+    @functools.cached_property
+    def dtemp_engine_hot(self):
+        return self.temp_max - (self.temp_hot_orig[self.stop_index] + self.offset_hot)
+
+    @functools.cached_property
+    def dtemp_engine_cold(self):
+        return (self.temp_cold_orig[self.stop_index] + self.offset_cold) - self.temp_min
+
+    # Transferred heat
+    @functools.cached_property
+    def qhot_pump(self):
+        return self.heat(self.dtemp_pump_hot)
+
+    @functools.cached_property
+    def qcold_pump(self):
+        return self.heat(self.dtemp_pump_cold)
+
+    @functools.cached_property
+    def qhot_engine(self):
+        return self.heat(self.dtemp_engine_hot)
+
+    @functools.cached_property
+    def qcold_engine(self):
+        return self.heat(self.dtemp_engine_cold)
+
+    # Gives somewhat different results than the measurement software
+    # power_inp_total = np.sum(self.power_inp) * self.dtime
+    # power_gen_total = np.sum(self.power_gen) * self.dtime
+
+    # Gives results close to those of the measurement software
+    @functools.cached_property
+    def power_inp_integral(self):
+        return SegmentIntegral(self.power_inp, self.dtime)
+
+    @functools.cached_property
+    def power_gen_integral(self):
+        return SegmentIntegral(self.power_gen, self.dtime)
+
+    @functools.cached_property
+    def work_inp(self):
+        return self.power_inp_integral()
+
+    @functools.cached_property
+    def work_gen(self):
+        return self.power_gen_integral()
+
+    # We are not considering case:air in which there is no insulation,
+    # so the values of the heat transfer through the insulator don't exist for it
+    def require_insulator(self):
+        if not self.not_air:
+            raise AttributeError("The measurement " + self.name + " has no insulator")
+
+    # Heat transfer speed through insulator, assuming that outside surface is at room temperature
+    @functools.cached_property
+    def heat_transfer_speed_hot(self):
+        self.require_insulator()
+        return self.thermal_conductivity * self.aluminium_area * \
+            (self.temp_hot - self.temp_start)/self.insulator_thickness
+
+    @functools.cached_property
+    def heat_transfer_speed_cold(self):
+        self.require_insulator()
+        return self.thermal_conductivity * self.aluminium_area * \
+            (self.temp_start - self.temp_cold)/self.insulator_thickness
+
+    # Leaked heat over any interval, e.g. heat_loss_hot(temp_peak_index, np.arange(...)) for the sensitivity
+    # of the heat loss to the end of the measurement
+    @functools.cached_property
+    def heat_loss_hot(self):
+        return SegmentIntegral(self.heat_transfer_speed_hot, self.dtime)
+
+    @functools.cached_property
+    def heat_loss_cold(self):
+        return SegmentIntegral(self.heat_transfer_speed_cold, self.dtime)
+
+    # Total leaked heat due to heat transfer
+    @functools.cached_property
+    def heat_loss_pump_hot(self):
+        return self.heat_loss_hot(self.enable_index, self.temp_peak_index)
+
+    @functools.cached_property
+    def heat_loss_pump_cold(self):
+        return self.heat_loss_cold(self.enable_index, self.temp_peak_index)
+
+    @functools.cached_property
+    def heat_loss_gen_hot(self):
+        return self.heat_loss_hot(self.temp_peak_index, self.stop_index)
+
+    @functools.cached_property
+    def heat_loss_gen_cold(self):
+        # it's negative because more heat flows out
+        return self.heat_loss_cold(self.temp_peak_index, self.stop_index)
+
+    @functools.cached_property
+    def qhot_resistor(self):
+        if self.not_air:
+            # Estimated Q_hot with regular resistance heater. Assumed linear heat heat rise.
+            return self.work_inp / (1 + self.thermal_conductivity * self.aluminium_area * self.time_pump / (2*self.mass * self.heat_capacity * self.insulator_thickness))
+        # Case: air and no insulation
+        return self.work_inp
+
+    # Heat pump
+    @functools.cached_property
+    def cop_hot(self):
+        return self.qhot_pump / self.work_inp
+
+    @functools.cached_property
+    def cop_cold(self):
+        return self.qcold_pump / self.work_inp
+
+    @functools.cached_property
+    def cop_hot_ideal(self):
+        return self.qhot_pump / (self.qhot_pump - self.qcold_pump)
+
+    @functools.cached_property
+    def cop_cold_ideal(self):
+        return self.qcold_pump / (self.qhot_pump - self.qcold_pump)
+
+    @functools.cached_property
+    def cop_hot_carnot(self):
+        return (self.temp_max+273.15)/(self.temp_max-self.temp_min)
+
+    @functools.cached_property
+    def cop_cold_carnot(self):
+        return (self.temp_min+273.15)/(self.temp_max-self.temp_min)
+
+    @functools.cached_property
+    def carnot_fraction_cooler(self):
+        return self.cop_cold / self.cop_cold_carnot
+
+    # Heat engine
+    @functools.cached_property
+    def heat_transfer_efficiency(self):
+        return self.work_gen / (self.qhot_engine - self.qcold_engine)
+
+    @functools.cached_property
+    def efficiency(self):
+        return self.work_gen / self.qhot_engine
+
+    @functools.cached_property
+    def efficiency_ideal(self):
+        return 1 - (self.qcold_engine / self.qhot_engine)
+
+    @functools.cached_property
+    def efficiency_carnot(self):
+        return (self.temp_max-self.temp_min)/(self.temp_max+273.15)
+
+    @functools.cached_property
+    def efficiency_total(self):
+        return self.work_gen / self.work_inp
+
+    def load(self, workers=1):
+        """
+        Loads all the data vectors at once instead of on first use
+        :param workers: number of threads that read the files in parallel (int)
+        :return: self
+        """
+        columns = [(name, column) for cls in type(self).__mro__ for name, column in vars(cls).items()
+                   if isinstance(column, FileColumn) and name not in self.__dict__]
+        filenames = sorted(set(column.filename for name, column in columns))
+
+        if workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                files = dict(zip(filenames, executor.map(lambda filename: self.loadfile(self.path, filename), filenames)))
+        else:
+            files = {filename: self.loadfile(self.path, filename) for filename in filenames}
+
+        for name, column in columns:
+            self.__dict__[name] = files[column.filename][:, column.column]
+
+        return self
+
+    def loadfile(self, path, filename):
+        """
+        Loads the data of a DataStudio .txt export through a binary cache, or from the activity file if there is one.
+        The parsed data is stored as a .npy file in the cache_path of the measurement directory. The name of the
+        cache file contains the size and the modification time of the original file, so editing or replacing
+        the original file invalidates the cache automatically.
+        :param path: str of file path, should end with /
+        :param filename: str of file name
+        :return: data (Numpy array, read-only if it comes from the cache)
+        """
+        if self.activity is not None:
+            return self.activity.export(filename, self.mass, self.heat_capacity)
+
+        if not self.use_cache:
+            return self.readfile(path, filename)[0]
+
+        stat = os.stat(path + filename)
+        cache_dir = cache_path(path)
+        cache_file = cache_dir + "{}.{}.{}.npy".format(filename, stat.st_size, stat.st_mtime_ns)
+
+        try:
+            # Memory mapping doesn't copy the data, and the pages are read only when they are used
+            # np.asarray converts the memmap to a regular array view so that computed arrays are not memmaps
+            return np.asarray(np.load(cache_file, mmap_mode="r"))
+        except (OSError, ValueError):
+            # The cache file doesn't exist or it's broken
+            pass
+
+        data = self.readfile(path, filename)[0]
+
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary file of this process first, so that an interrupted write can't leave a broken
+            # cache file and processes loading the same file at the same time don't overwrite each other's writes
+            with tempfile.NamedTemporaryFile(dir=cache_dir, prefix=filename + ".", suffix=".tmp",
+                                             delete=False) as file:
+                np.save(file, data)
+            try:
+                os.replace(file.name, cache_file)
+            except OSError:
+                os.remove(file.name)
+                raise
+            for stale_file in glob.glob(cache_dir + glob.escape(filename) + ".*.npy"):
+                if stale_file != cache_file:
+                    try:
+                        os.remove(stale_file)
+                    except FileNotFoundError:
+                        # Another process removed it already
+                        pass
+        except OSError:
+            # The cache directory may be read-only, in which case we simply work without the cache
+            pass
+
+        return data
+
+    def readfile(self, path, filename):
+        """ Parses a file created by the DataStudio measurement software
+        :param path: str of file path, should end with /
+        :param filename: str of file name
+        :return: data (Numpy array), title (str), labels (list of str)
+        """
+        # The DataStudio software uses ISO-8859-1 encoding (especially for the degree sign in temperature files)
+        with open(path + filename, encoding="iso-8859-1") as file:
+            title = file.readline().strip("\n")
+            labels = file.readline().strip("\n").split(sep="\t")
+            body = file.read()
+
+        data = parse_rows(body, len(labels))
+
+        return data, title, labels
+
+    def heat(self, delta_temp):
+        """
+        Q = cm \Delta T
+        :param delta_temp: Temperature difference (K)
+        :return:
+        """
+        return self.heat_capacity * self.mass * delta_temp
+
+    def results(self):
+        """
+        Returns the computed values in a machine-readable form
+        :return: dict of the values of RESULTS, the ones of INSULATOR_RESULTS are NaN without an insulator
+        """
+        return {name: np.nan if name in INSULATOR_RESULTS and not self.not_air else getattr(self, name)
+                for name in RESULTS}
+
+    def write_channels(self, file, channels=None, style="latex", chunk_size=tables.CHUNK_SIZE, **kwargs):
+        """
+        Writes the raw data channels as a table chunk by chunk, so that also long measurements can be exported
+        The files have a few samples more or less, so the channels are cut to the length of the shortest one.
+        :param file: text stream
+        :param channels: list of the names of the channels, None for CHANNELS
+        :param style: "latex", "markdown" or "csv"
+        :param chunk_size: int, number of rows formatted at a time
+        :param kwargs: keyword arguments of tables.write_table_stream, e.g. column_precisions
+        :return: -
+        """
+        if channels is None:
+            channels = CHANNELS
+        vectors = [getattr(self, channel) for channel in channels]
+        length = min(vec.size for vec in vectors)
+
+        def chunks():
+            for start in range(0, length, chunk_size):
+                stop = min(start + chunk_size, length)
+                yield np.column_stack([vec[start:stop] for vec in vectors])
+
+        header = [channel.replace("_", "\\_") for channel in channels] if style == "latex" else channels
+        tables.write_table_stream(chunks, file, style, header=header, **kwargs)
+
+    def print(self):
+        """
+        Prints computation results to the console
+        :return: -
+        """
+        print("-----", self.name, "-----")
+        print("Enable index", self.enable_index)
+        print("End index:", self.stop_index)
+        print("Measurement length (from the very beginning to the end index):", self.time_total)
+        print()
+        print("Start temperature (hot):", self.temp_hot_start)
+        print("Start temperature (cold):", self.temp_cold_start)
+        print("Start temperature (mean):", self.temp_start)
+        print("End temperature (hot):", self.temp_hot_end)
+        print("End temperature (cold)", self.temp_cold_max)
+        print()
+        print("Max temperature", self.temp_max)
+        print("Min temperature", self.temp_min)
+        print()
+        print("Heat pump")
+        print("Energy input:", self.work_inp)
+        print("Q_hot", self.qhot_pump)
+        print("Q_cold", self.qcold_pump)
+        print("Q_cold + W", self.qcold_pump + self.work_inp)
+        print("E_lost", self.qcold_pump + self.work_inp - self.qhot_pump)
+        print("Coefficient of performance COP_hot", self.cop_hot)
+        print("Coefficient of performance COP_cold", self.cop_cold)
+        print("Ideal COP_hot with the setup", self.cop_hot_ideal)
+        print("Ideal COP_cold with the setup", self.cop_cold_ideal)
+        print("Ideal Carnot COP_hot", self.cop_hot_carnot)
+        print("Ideal Carnot COP_cold", self.cop_cold_carnot)
+        print("Efficiency fraction out of ideal Carnot cooler", self.carnot_fraction_cooler)
+
+        if self.not_air:
+            print("Heat transfer through insulator, hot side", self.heat_loss_pump_hot)
+            print("Heat transfer through insulator, cold side", self.heat_loss_pump_cold)
+            print("Estimated Q_hot with resistor", self.qhot_resistor)
+        else:
+            print("Estimated Q_hot with resistor (=energy input)", self.qhot_resistor)
+        #
+        # I think it should be defined for Q_hot too. Yep, TODO that
+        # Also calculate heatloss due to conduction TODO remove these comments when ready
+        # Todo implement resistive heater calculations
+        print()
+        print("Heat engine")
+        print("Energy generated:", self.work_gen)
+        print("Q_hot", self.qhot_engine)
+        print("Q_cold", self.qcold_engine)
+        print("Q_hot - Q_cold", self.qhot_engine - self.qcold_engine)
+        print("E_lost", -self.qcold_engine - self.work_gen + self.qhot_engine)
+        print("\"Heat transfer efficiency\" (%)", self.heat_transfer_efficiency * 100)
+        print("Efficiency e", self.efficiency)
+        print("Ideal efficiency with the setup", self.efficiency_ideal)
+        print("Ideal Carnot efficiency", self.efficiency_carnot)
+        if self.not_air:
+            print("Heat transfer through insulator, hot side", self.heat_loss_gen_hot)
+            print("Heat transfer through insulator, cold side", self.heat_loss_gen_cold)
+        print()
+        print("Total efficiency of cycle", self.efficiency_total)
+        # About the efficiency of peltier elements (#telok@IRCnet, 2016-07-27)
+        # 19:10 < AgenttiX> Oletteko kokeilleet TECin ohjaamista Arduinolla? Toimisiko tämä kytkentä? http://garagelab.com/profiles/blogs/how-to-use-a-peltier-with-arduino
+        # --
+        # 20:21 <@hrst> Ei toimi. Peltieriä ei voi ohjata PWM:llä.
+        # 20:22 <@hrst> Hyötysuhde on PWM:llä paska, mikä on ongelma koska se on muutenkin liian paska, ja sen lisäksi se hajoaa mekaaniseen värähtelyyn ennemmin tai myöhemmin.
+        print("-----\n")
+
+
+# The values of Measurement.results, in the order of the columns of the results files
+RESULTS = [
+    "name",
+    # Events
+    "enable_index", "disable_index", "temp_peak_index", "stop_index",
+    "time_total", "time_pump", "time_gen",
+    # Temperatures
+    "temp_hot_start", "temp_cold_start", "temp_start", "temp_hot_end", "temp_cold_max", "temp_max", "temp_min",
+    # Heat pump
+    "work_inp", "qhot_pump", "qcold_pump",
+    "cop_hot", "cop_cold", "cop_hot_ideal", "cop_cold_ideal", "cop_hot_carnot", "cop_cold_carnot",
+    "carnot_fraction_cooler", "heat_loss_pump_hot", "heat_loss_pump_cold", "qhot_resistor",
+    # Heat engine
+    "work_gen", "qhot_engine", "qcold_engine",
+    "heat_transfer_efficiency", "efficiency", "efficiency_ideal", "efficiency_carnot",
+    "heat_loss_gen_hot", "heat_loss_gen_cold",
+    "efficiency_total"
+]
+
+# The results that exist only with an insulator, NaN for air
+INSULATOR_RESULTS = ["heat_loss_pump_hot", "heat_loss_pump_cold", "heat_loss_gen_hot", "heat_loss_gen_cold"]
+
+# The raw data channels of Measurement.write_channels, which share the same sampling
+CHANNELS = ["time_vec", "current", "voltage", "temp_hot_orig", "temp_cold_orig"]
+
+
+# Constants
+MASS = 0.019                            # m (kg)
+HEAT_CAPACITY = 900                     # c (kg * degC)
+ALUMINIUM_AREA = 0.033 * 0.032          # x*y (m^2)
+
+# Insulators: thickness x (m), thermal conductivity k (W/(m*K))
+INSULATORS = {
+    "finnfoam": (0.00942, 0.04),
+    "wood": (0.0088, 0.16),             # (oak) (http://www.engineeringtoolbox.com/)
+    "air": (0.0, 0.0)                   # no insulator
+}
+
+
+def data_path(run):
+    """
+    :param run: str of the name of the measurement directory, e.g. "air"
+    :return: str of the path of the measurement directory in DATA_DIR, ending with a "/"
+    """
+    return os.path.join(DATA_DIR, run, "")
+
+
+def load_measurements(use_cache=True):
+    """
+    Loads the measurements of our experiment
+    :param use_cache: use the binary cache of parsed files (bool)
+    :return: finnfoam, wood, air (Measurement)
+    """
+    finnfoam = Measurement("Finnfoam", data_path("finnfoam"), MASS, HEAT_CAPACITY, ALUMINIUM_AREA, *INSULATORS["finnfoam"], use_cache=use_cache)
+    wood = Measurement("Wood", data_path("wood"), MASS, HEAT_CAPACITY, ALUMINIUM_AREA, *INSULATORS["wood"], use_cache=use_cache)
+    air = Measurement("Air", data_path("air"), MASS, HEAT_CAPACITY, ALUMINIUM_AREA, use_cache=use_cache)
+
+    return finnfoam, wood, air
+
+
+class Main:
+    def __init__(self):
+        # The plotting libraries are imported only here, so that the analysis can be used without Qt
+        # PyQtGraph can be found from Ubuntu repositories as python3-pyqtgraph
+        # http://www.pyqtgraph.org/
+        import pyqtgraph as pg
+        from . import plots
+
+        finnfoam, wood, air = load_measurements()
+
+        finnfoam.print()
+        wood.print()
+        air.print()
+
+        # PyQtGraph initialisation
+        app = pg.mkQApp()
+        pg.setConfigOptions(antialias=True, background="w", foreground="k")
+
+        self.win = pg.GraphicsWindow(title="Peltier (Lämpövoimakoneet)")
+
+        self.plots = plots.Plots(self.win)
+        self.plots.set_data(finnfoam, wood, air)
+
+        self.win.resize(1000, 1000)
+
+        # Main loop
+        app.exec_()
+
+
+def main():
+    Main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# The plots of the Peltier measurements, both for the window of peltier.Main and for rendering them to files
+#
+# Usage without a display: fys1010-peltier-render <output directory> [png|svg ...]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from . import decimation
+
+# PyQtGraph can be found from Ubuntu repositories as python3-pyqtgraph
+# http://www.pyqtgraph.org/
+import pyqtgraph as pg
+import pyqtgraph.exporters
+
+
+# The names of the plots, which are also the names of the rendered files
+FIGURES = ["power_inp", "power_gen", "temp_hot", "temp_cold", "finnfoam_both", "temp_diff"]
+
+
+class Plots:
+    def __init__(self, layout):
+        """
+        This class creates the plots of our measurements to a PyQtGraph layout.
+        The plots are created without data, which is set with set_data(). The same plots can therefore be reused
+        for many measurements.
+        :param layout: PyQtGraph GraphicsWindow or GraphicsLayoutWidget
+        """
+        self.layout = layout
+
+        self.red = pg.mkPen((255, 0, 0), width=1.5)
+        self.green = pg.mkPen((0, 255, 0), width=1.5)
+        self.blue = pg.mkPen((0, 0, 255), width=1.5)
+
+        # Plot name -> PlotItem and the list of its DecimatedCurves
+        self.plots = {}
+        self.curves = {}
+
+        self.plot_bgr("power_inp", "", "P", "W")  # Power input
+        self.plot_bgr("power_gen", "", "P", "W")  # Power generated
+
+        self.layout.nextRow()
+
+        self.plot_bgr("temp_hot", "", "T", "°C")  # Temperature of hot side
+        self.plot_bgr("temp_cold", "", "T", "°C")  # Temperature of cold side
+
+        self.layout.nextRow()
+
+        self.plot_two("finnfoam_both", "", "T", "°C", "Lämmin puoli", "Kylmä puoli")  # Temperature of both sides
+        self.plot_bgr("temp_diff", "", "ΔT", "°C")  # Temperature difference
+
+    def set_data(self, finnfoam, wood, air):
+        """
+        Shows the data of the given measurements in the plots
+        :param finnfoam: Measurement
+        :param wood: Measurement
+        :param air: Measurement
+        :return: -
+        """
+        vectors = {
+            "power_inp": [finnfoam.power_inp, wood.power_inp, air.power_inp],
+            "power_gen": [finnfoam.power_gen, wood.power_gen, air.power_gen],
+            "temp_hot": [finnfoam.temp_hot, wood.temp_hot, air.temp_hot],
+            "temp_cold": [finnfoam.temp_cold, wood.temp_cold, air.temp_cold],
+            "finnfoam_both": [finnfoam.temp_hot, finnfoam.temp_cold],
+            "temp_diff": [finnfoam.temp_diff, wood.temp_diff, air.temp_diff]
+        }
+        for name in FIGURES:
+            for curve, vec in zip(self.curves[name], vectors[name]):
+                curve.set_data(vec)
+
+    def add_plot(self, name, title, ylabel, yunit, curves):
+        """
+        :param curves: list of (pen, curve name)
+        :return: PlotItem
+        """
+        plot = self.layout.addPlot(title=title)
+        plot.addLegend(offset=(-1, 1))
+        # The curves get only the points that are visible, which keeps panning and zooming fast for long measurements
+        self.curves[name] = [decimation.DecimatedCurve(plot, np.empty(0), pen=pen, name=curve_name)
+                             for pen, curve_name in curves]
+        plot.setLabel("left", ylabel, yunit)
+        plot.setLabel("bottom", "t (s)")
+        plot.setRange(xRange=[0, 400])
+        plot.showGrid(x=True, y=True)
+
+        self.plots[name] = plot
+        return plot
+
+    def plot_bgr(self, name, title, ylabel="", yunit="", name_first="Finnfoam", name_second="Puu", name_third="Ilma"):
+        # for reference octave uses order [blue, green, red] for coloring, we use that order to get finnfoam to be blue
+        return self.add_plot(name, title, ylabel, yunit,
+                             [(self.blue, name_first), (self.green, name_second), (self.red, name_third)])
+
+    def plot_two(self, name, title, ylabel="", yunit="", name_first="", name_second=""):
+        light_blue = pg.mkPen((80, 80, 255), width=1.5)
+        dark_blue = pg.mkPen((0, 0, 160), width=1.5)
+
+        return self.add_plot(name, title, ylabel, yunit, [(light_blue, name_first), (dark_blue, name_second)])
+
+
+def init_headless():
+    """
+    Initialises PyQtGraph without a display and without starting the event loop
+    :return: QApplication
+    """
+    # The offscreen platform of Qt renders without a window system, so windows are never displayed.
+    # It has effect only if the QApplication hasn't been created yet, and a platform chosen by the user is kept.
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = pg.mkQApp()
+    pg.setConfigOptions(antialias=True, background="w", foreground="k")
+    return app
+
+
+class Renderer:
+    def __init__(self, width=1000, height=1000):
+        """
+        This class renders the plots of many measurements to files without showing them.
+        The plots and the exporters are created only once and reused for all the measurements.
+        :param width: width of the layout of all the six plots (pixels)
+        :param height: height of the layout (pixels)
+        """
+        self.app = init_headless()
+        self.layout = pg.GraphicsLayoutWidget()
+        self.layout.resize(width, height)
+        self.plots = Plots(self.layout)
+        # The plots get their sizes only when the layout is shown, which the offscreen platform doesn't display
+        self.layout.show()
+        self.app.processEvents()
+
+        self.exporters = {}
+
+    def exporter(self, name, file_format):
+        key = (name, file_format)
+        if key not in self.exporters:
+            if file_format == "png":
+                self.exporters[key] = pg.exporters.ImageExporter(self.plots.plots[name])
+            elif file_format == "svg":
+                self.exporters[key] = pg.exporters.SVGExporter(self.plots.plots[name])
+            else:
+                raise Exception("Unknown figure format " + file_format)
+        return self.exporters[key]
+
+    def render(self, finnfoam, wood, air, directory, formats=("png",)):
+        """
+        Renders the plots of the given measurements to the files <directory>/<plot name>.<format>
+        :param finnfoam: Measurement
+        :param wood: Measurement
+        :param air: Measurement
+        :param directory: str of the output directory, created if it doesn't exist
+        :param formats: file formats, "png" and/or "svg"
+        :return: dict of plot name -> time used for rendering it to all the formats (s)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.plots.set_data(finnfoam, wood, air)
+        # Apply the new ranges of the plots
+        self.app.processEvents()
+
+        times = {}
+        for name in FIGURES:
+            start = time.perf_counter()
+            for file_format in formats:
+                self.exporter(name, file_format).export(os.path.join(directory, name + "." + file_format))
+            times[name] = time.perf_counter() - start
+
+        return times
+
+
+def render_runs(runs, directory, formats=("png",), width=1000, height=1000):
+    """
+    Renders the plots of many sets of measurements in a single process
+    :param runs: list of (name (str), (finnfoam, wood, air) (Measurement))
+    :param directory: str of the output directory, each run gets a subdirectory of its name
+    :param formats: file formats, "png" and/or "svg"
+    :return: dict of run name -> dict of plot name -> render time (s)
+    """
+    renderer = Renderer(width, height)
+    return {name: renderer.render(*measurements, os.path.join(directory, name), formats)
+            for name, measurements in runs}
+
+
+def main():
+    from . import peltier
+
+    if len(sys.argv) < 2:
+        print("Usage: fys1010-peltier-render <output directory> [png|svg ...]")
+        sys.exit(1)
+
+    run_times = render_runs([("peltier", peltier.load_measurements())], sys.argv[1], sys.argv[2:] or ["png"])
+    for run_name, plot_times in run_times.items():
+        for plot_name, render_time in plot_times.items():
+            print(run_name, plot_name, "(ms):", render_time*1e3)
+
+
+if __name__ == "__main__":
+    main()
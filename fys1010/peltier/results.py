@@ -0,0 +1,134 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Writing of the computed values of many measurements to CSV and JSON lines files
+#
+# The results are handled as tables of columns, i.e. dicts of value name -> one value per measurement,
+# in the same form as MeasurementBatch.results returns them. A table is converted to text as a whole
+# and written to the file with a single write.
+
+import csv
+import io
+import json
+import math
+import os
+
+import numpy as np
+
+from . import peltier
+
+
+def table(measurements):
+    """
+    Collects the results of measurements into a table
+    :param measurements: list of Measurement (or StreamingMeasurement)
+    :return: dict of the values of peltier.RESULTS, each a list with one element per measurement
+    """
+    rows = [measurement.results() for measurement in measurements]
+    return {name: [row[name] for row in rows] for name in peltier.RESULTS}
+
+
+def python_value(value):
+    """
+    :return: value as a Python int, float or str, None for NaN
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else float(value)
+    return value
+
+
+def python_values(column):
+    """
+    :param column: list or Numpy array of values
+    :return: list of Python values, None for NaN
+    """
+    if isinstance(column, np.ndarray):
+        # tolist converts the whole array to Python values at once
+        return [None if value != value else value for value in column.tolist()]
+    return [python_value(value) for value in column]
+
+
+def rows(columns):
+    """
+    :param columns: table of results
+    :return: list of rows, each a list of Python values in the order of the columns
+    """
+    return [list(row) for row in zip(*[python_values(column) for column in columns.values()])]
+
+
+def format_csv(columns, header=True):
+    """
+    :param columns: table of results
+    :param header: include the row of the column names (bool)
+    :return: str of CSV, where missing values are empty
+    """
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator="\n")
+    if header:
+        writer.writerow(columns.keys())
+    # The shortest representation of a float reads back to the same value
+    writer.writerows([["" if value is None else value for value in row] for row in rows(columns)])
+    return text.getvalue()
+
+
+def format_jsonl(columns):
+    """
+    :param columns: table of results
+    :return: str of JSON lines, one object per measurement, where missing values are null
+    """
+    names = list(columns.keys())
+    return "".join(json.dumps(dict(zip(names, row)), allow_nan=False) + "\n" for row in rows(columns))
+
+
+def write_results(filename, columns, append=True):
+    """
+    Writes a table of results to a CSV (.csv) or JSON lines (.jsonl) file
+    :param filename: str of file path
+    :param columns: table of results, e.g. from table() or MeasurementBatch.results()
+    :param append: add to the end of an existing file instead of replacing it (bool).
+                   The header of a CSV file is written only when the file is new or empty.
+    :return: -
+    """
+    if filename.endswith(".csv"):
+        new = not append or not os.path.isfile(filename) or os.path.getsize(filename) == 0
+        text = format_csv(columns, header=new)
+    elif filename.endswith(".jsonl"):
+        text = format_jsonl(columns)
+    else:
+        raise Exception("Unknown results file type " + filename)
+
+    with open(filename, "a" if append else "w", encoding="utf-8", newline="") as file:
+        file.write(text)
+
+
+def read_csv(filename):
+    """
+    Reads a results file written by write_results
+    :param filename: str of file path
+    :return: dict of column name -> Numpy array (str for the names, float for the rest, NaN for missing values)
+    """
+    with open(filename, encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        names = next(reader)
+        values = list(zip(*reader)) or [()] * len(names)
+
+    return {name: np.array(column) if name == "name" else
+            np.array([float(value) if value else np.nan for value in column])
+            for name, column in zip(names, values)}
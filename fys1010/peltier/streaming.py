@@ -0,0 +1,456 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Incremental analysis of a measurement whose data arrives in chunks during the measurement
+
+import os
+import time
+
+import numpy as np
+
+from . import peltier
+
+
+# The exports that the analysis needs
+STREAM_FILES = ["Current.txt", "Power.txt", "PowerGenerated.txt", "Temperature1.txt", "Temperature2.txt",
+                "Voltage.txt"]
+
+
+class GrowingArray:
+    """
+    A 1D array to which values can be appended in amortised O(1) time per value
+    """
+    def __init__(self, capacity=1024):
+        self.data = np.empty(capacity)
+        self.size = 0
+
+    def extend(self, values):
+        if self.size + values.size > self.data.size:
+            data = np.empty(max(2*self.data.size, self.size + values.size))
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+        self.data[self.size:self.size + values.size] = values
+        self.size += values.size
+
+    @property
+    def values(self):
+        return self.data[:self.size]
+
+
+class StreamChannel:
+    """
+    A data vector that grows in chunks. The extremes and the cumulative integral are updated with each chunk,
+    so that they don't have to be recomputed over the whole history.
+    """
+    def __init__(self):
+        self.time_vec = GrowingArray()
+        self.vec = GrowingArray()
+        # cumulative[i] = np.trapz(vec[:i+1]), see peltier.cumulative_trapz
+        self.cumulative = GrowingArray()
+
+        self.max = -np.inf
+        self.argmax = None
+        self.min = np.inf
+        self.argmin = None
+        # Minimum of consecutive differences and the index of the latter element of it
+        self.diff_min = np.inf
+        self.diff_min_index = None
+
+    def __len__(self):
+        return self.vec.size
+
+    def extend(self, data):
+        """
+        :param data: Numpy array of time and value columns
+        :return: -
+        """
+        values = data[:, 1]
+        if values.size == 0:
+            return
+        offset = self.vec.size
+
+        # Ties keep the first occurrence like np.argmax and np.argmin do
+        i = np.argmax(values)
+        if values[i] > self.max:
+            self.max = values[i]
+            self.argmax = offset + i
+        i = np.argmin(values)
+        if values[i] < self.min:
+            self.min = values[i]
+            self.argmin = offset + i
+
+        if offset > 0:
+            diffs = np.diff(values, prepend=self.vec.values[-1])
+            first = offset
+        else:
+            diffs = np.diff(values)
+            first = 1
+        if diffs.size:
+            i = np.argmin(diffs)
+            if diffs[i] < self.diff_min:
+                self.diff_min = diffs[i]
+                self.diff_min_index = first + i
+
+        if offset > 0:
+            # The integral continues from the last point of the previous chunk
+            cumulative = peltier.cumulative_trapz(np.concatenate(([self.vec.values[-1]], values)),
+                                                  initial=self.cumulative.values[-1])[1:]
+        else:
+            cumulative = peltier.cumulative_trapz(values)
+        self.cumulative.extend(cumulative)
+        self.time_vec.extend(data[:, 0])
+        self.vec.extend(values)
+
+    def trapz(self, start, stop, dx):
+        """
+        Same as np.trapz(vec[start:stop], dx=dx) but in O(1) time
+        :param start: index of the first point (int or Numpy array)
+        :param stop: index after the last point (int or Numpy array)
+        :param dx: spacing of the points
+        :return: integral
+        """
+        return peltier.segment_integral(self.cumulative.values, start, stop, dx)
+
+
+class StreamingMeasurement:
+    def __init__(self, name, mass, heat_capacity, aluminium_area, insulator_thickness=0.0, thermal_conductivity=0.0):
+        """
+        This class holds a measurement that is still in progress.
+        The data is added with append(), after which all the values of Measurement are available for the data
+        received so far. Appending a chunk takes O(chunk) time, and the values are computed from the running
+        extremes and cumulative integrals in O(1) time instead of going through the whole history.
+        The parameters are the same as those of Measurement.
+        """
+        self.name = name
+        self.mass = mass
+        self.heat_capacity = heat_capacity
+
+        self.aluminium_area = aluminium_area
+        self.insulator_thickness = insulator_thickness
+        self.thermal_conductivity = thermal_conductivity
+        self.not_air = (self.insulator_thickness != 0)
+
+        self.channels = {filename: StreamChannel() for filename in STREAM_FILES}
+
+    def append(self, chunk):
+        """
+        Adds new data to the measurement
+        :param chunk: dict of export filename (e.g. "Current.txt") -> Numpy array of time and value columns.
+                      The channels may arrive in chunks of different lengths.
+        :return: -
+        """
+        for filename, data in chunk.items():
+            if filename in self.channels:
+                self.channels[filename].extend(data)
+
+    heat = peltier.Measurement.heat
+    print = peltier.Measurement.print
+    results = peltier.Measurement.results
+    require_insulator = peltier.Measurement.require_insulator
+
+    # Data vectors received so far
+    @property
+    def time_vec(self):
+        return self.channels["Current.txt"].time_vec.values
+
+    @property
+    def current(self):
+        return self.channels["Current.txt"].vec.values
+
+    @property
+    def voltage(self):
+        return self.channels["Voltage.txt"].vec.values
+
+    @property
+    def power_inp(self):
+        return self.channels["Power.txt"].vec.values
+
+    @property
+    def power_gen(self):
+        return self.channels["PowerGenerated.txt"].vec.values
+
+    @property
+    def temp_cold_orig(self):
+        return self.channels["Temperature1.txt"].vec.values
+
+    @property
+    def temp_hot_orig(self):
+        return self.channels["Temperature2.txt"].vec.values
+
+    # Normalised temperatures, these take O(n) time
+    @property
+    def temp_hot(self):
+        return self.temp_hot_orig + self.offset_hot
+
+    @property
+    def temp_cold(self):
+        return self.temp_cold_orig + self.offset_cold
+
+    # Events
+    @property
+    def segmentation(self):
+        return peltier.Segmentation(self.enable_index, self.disable_index, self.temp_peak_index, self.stop_index,
+                                    self.channels["Temperature1.txt"].argmin)
+
+    @property
+    def power_inp_max(self):
+        return self.channels["Power.txt"].max
+
+    @property
+    def enable_index(self):
+        return self.channels["Power.txt"].argmax
+
+    @property
+    def disable_index(self):
+        return self.channels["Power.txt"].diff_min_index
+
+    @property
+    def temp_peak_index(self):
+        # The normalisation is a constant shift, so it doesn't move the peak
+        return self.channels["Temperature2.txt"].argmax
+
+    @property
+    def stop_index(self):
+        return self.channels["Temperature1.txt"].argmax
+
+    # Normalisation
+    @property
+    def temp_hot_start(self):
+        if self.enable_index < 11:
+            return np.nan
+        return np.mean(self.temp_hot_orig[self.enable_index - 11:self.enable_index - 1])
+
+    @property
+    def temp_cold_start(self):
+        if self.enable_index < 11:
+            return np.nan
+        return np.mean(self.temp_cold_orig[self.enable_index - 11:self.enable_index - 1])
+
+    @property
+    def temp_start(self):
+        return (self.temp_hot_start + self.temp_cold_start)/2
+
+    @property
+    def offset_hot(self):
+        return (self.temp_cold_start - self.temp_hot_start)/2
+
+    @property
+    def offset_cold(self):
+        return (self.temp_hot_start - self.temp_cold_start)/2
+
+    @property
+    def temp_max(self):
+        return self.channels["Temperature2.txt"].max + self.offset_hot
+
+    @property
+    def temp_min(self):
+        return self.channels["Temperature1.txt"].min + self.offset_cold
+
+    @property
+    def temp_cold_max(self):
+        return self.channels["Temperature1.txt"].max + self.offset_cold
+
+    @property
+    def temp_hot_end(self):
+        return self.temp_hot_orig[self.stop_index] + self.offset_hot
+
+    # Times
+    @property
+    def dtime(self):
+        return self.time_vec[1]
+
+    @property
+    def time_total(self):
+        return self.time_vec[self.stop_index]
+
+    @property
+    def time_pump(self):
+        return self.time_vec[self.temp_peak_index] - self.time_vec[self.enable_index]
+
+    @property
+    def time_gen(self):
+        return self.time_vec[self.stop_index] - self.time_vec[self.temp_peak_index]
+
+    # Temperature differences
+    @property
+    def dtemp_pump_hot(self):
+        return self.temp_max - self.temp_start
+
+    @property
+    def dtemp_pump_cold(self):
+        return self.temp_start - self.temp_min
+
+    @property
+    def dtemp_engine_hot(self):
+        return self.temp_max - (self.temp_hot_orig[self.stop_index] + self.offset_hot)
+
+    @property
+    def dtemp_engine_cold(self):
+        return (self.temp_cold_orig[self.stop_index] + self.offset_cold) - self.temp_min
+
+    # Transferred heat
+    @property
+    def qhot_pump(self):
+        return self.heat(self.dtemp_pump_hot)
+
+    @property
+    def qcold_pump(self):
+        return self.heat(self.dtemp_pump_cold)
+
+    @property
+    def qhot_engine(self):
+        return self.heat(self.dtemp_engine_hot)
+
+    @property
+    def qcold_engine(self):
+        return self.heat(self.dtemp_engine_cold)
+
+    # Work
+    @property
+    def work_inp(self):
+        channel = self.channels["Power.txt"]
+        return channel.trapz(0, len(channel), self.dtime)
+
+    @property
+    def work_gen(self):
+        channel = self.channels["PowerGenerated.txt"]
+        return channel.trapz(0, len(channel), self.dtime)
+
+    # Total leaked heat due to heat transfer through the insulator
+    def heat_loss(self, filename, offset, sign, start, stop):
+        """
+        Integral of the heat transfer speed k*A*sign*(T - T_start)/x over [start, stop) in O(1) time
+        :param filename: temperature export
+        :param offset: normalisation offset of the temperature
+        :param sign: 1 for the hot side, -1 for the cold side
+        :return: heat (J)
+        """
+        self.require_insulator()
+        channel = self.channels[filename]
+        stop = min(stop, len(channel))
+        if stop - start < 2:
+            return 0.0
+        # The integral of the constant part is simply its value times the length of the interval
+        integral = channel.trapz(start, stop, self.dtime) + (offset - self.temp_start) * (stop - start - 1) * self.dtime
+        return sign * self.thermal_conductivity * self.aluminium_area * integral / self.insulator_thickness
+
+    @property
+    def heat_loss_pump_hot(self):
+        return self.heat_loss("Temperature2.txt", self.offset_hot, 1, self.enable_index, self.temp_peak_index)
+
+    @property
+    def heat_loss_pump_cold(self):
+        return self.heat_loss("Temperature1.txt", self.offset_cold, -1, self.enable_index, self.temp_peak_index)
+
+    @property
+    def heat_loss_gen_hot(self):
+        return self.heat_loss("Temperature2.txt", self.offset_hot, 1, self.temp_peak_index, self.stop_index)
+
+    @property
+    def heat_loss_gen_cold(self):
+        return self.heat_loss("Temperature1.txt", self.offset_cold, -1, self.temp_peak_index, self.stop_index)
+
+    @property
+    def qhot_resistor(self):
+        if self.not_air:
+            return self.work_inp / (1 + self.thermal_conductivity * self.aluminium_area * self.time_pump / (2*self.mass * self.heat_capacity * self.insulator_thickness))
+        return self.work_inp
+
+    # The ratios are computed in the same way as in Measurement, but without caching since the data keeps growing
+    cop_hot = property(peltier.Measurement.cop_hot.func)
+    cop_cold = property(peltier.Measurement.cop_cold.func)
+    cop_hot_ideal = property(peltier.Measurement.cop_hot_ideal.func)
+    cop_cold_ideal = property(peltier.Measurement.cop_cold_ideal.func)
+    cop_hot_carnot = property(peltier.Measurement.cop_hot_carnot.func)
+    cop_cold_carnot = property(peltier.Measurement.cop_cold_carnot.func)
+    carnot_fraction_cooler = property(peltier.Measurement.carnot_fraction_cooler.func)
+    heat_transfer_efficiency = property(peltier.Measurement.heat_transfer_efficiency.func)
+    efficiency = property(peltier.Measurement.efficiency.func)
+    efficiency_ideal = property(peltier.Measurement.efficiency_ideal.func)
+    efficiency_carnot = property(peltier.Measurement.efficiency_carnot.func)
+    efficiency_total = property(peltier.Measurement.efficiency_total.func)
+
+
+def replay(measurement, chunk_time=10.0):
+    """
+    Replays a finished measurement in chunks as if it was being measured.
+    This can stand in for the measurement software when testing the live analysis.
+    :param measurement: Measurement
+    :param chunk_time: length of a chunk (s)
+    :return: generator of chunks for StreamingMeasurement.append
+    """
+    files = {filename: measurement.loadfile(measurement.path, filename) for filename in STREAM_FILES}
+    end_time = max(data[-1, 0] for data in files.values() if data.size)
+
+    start = 0.0
+    while start <= end_time:
+        stop = start + chunk_time
+        chunk = {}
+        for filename, data in files.items():
+            first, last = np.searchsorted(data[:, 0], [start, stop])
+            chunk[filename] = data[first:last]
+        yield chunk
+        start = stop
+
+
+def follow(path, poll_interval=1.0, timeout=None):
+    """
+    Reads the .txt exports of a measurement while they are being written.
+    Only complete rows are read, and each poll reads only the data that has been added since the previous one.
+    :param path: str of file path, should end with /
+    :param poll_interval: time between checks for new data (s)
+    :param timeout: stop when there has been no new data for this time (s), None to continue forever
+    :return: generator of chunks for StreamingMeasurement.append
+    """
+    # Byte offsets of the read data and the number of the columns for each file
+    offsets = {filename: 0 for filename in STREAM_FILES}
+    columns = {}
+    last_data = time.monotonic()
+
+    while True:
+        chunk = {}
+        for filename in STREAM_FILES:
+            if not os.path.isfile(path + filename):
+                continue
+            # The file is read as bytes so that the offsets are exact, ISO-8859-1 maps each byte to a character
+            with open(path + filename, "rb") as file:
+                file.seek(offsets[filename])
+                text = file.read().decode("iso-8859-1")
+
+            if filename not in columns:
+                lines = text.split("\n", 2)
+                if len(lines) < 3:
+                    # The header isn't complete yet
+                    continue
+                columns[filename] = len(lines[1].split(sep="\t"))
+                header = len(lines[0]) + len(lines[1]) + 2
+                offsets[filename] += header
+                text = lines[2]
+
+            end = text.rfind("\n") + 1
+            if end > 0:
+                chunk[filename] = peltier.parse_rows(text[:end], columns[filename])
+                offsets[filename] += end
+
+        if chunk:
+            last_data = time.monotonic()
+            yield chunk
+        elif timeout is not None and time.monotonic() - last_data > timeout:
+            return
+        else:
+            time.sleep(poll_interval)
@@ -0,0 +1,229 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Linear regression with closed-form formulas
+#
+# The fits are computed with sums along the last axis, so an array of many data series, e.g. of shape
+# (series, points), is fitted with a single call. x and y only have to be broadcastable, so a single x
+# can be used for all the series. For 1D data the results are scalars.
+#
+# https://en.wikipedia.org/wiki/Simple_linear_regression
+
+import numpy as np
+
+
+def fit_origin(x, y):
+    """
+    Fits a line y = k*x that goes through the origin
+    The error of the slope is computed in the same way as in the original tools.linear_regression_origo:
+    err^2 = sum of squared residuals / (n - 1) / sum((x - mean(x))^2)
+    :param x: Numpy array of x values, the points are on the last axis
+    :param y: Numpy array of y values, broadcastable with x
+    :return: slope, err (floats or Numpy arrays with the last axis removed)
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    n = x.shape[-1]
+
+    slope = np.sum(x*y, axis=-1) / np.sum(x*x, axis=-1)
+    residuals = y - slope[..., np.newaxis]*x
+    x_centered = x - np.mean(x, axis=-1, keepdims=True)
+    # One degree of freedom is used by the slope
+    err = np.sqrt(np.sum(residuals*residuals, axis=-1) / (n - 1) / np.sum(x_centered*x_centered, axis=-1))
+
+    return slope[()], err[()]
+
+
+def fit_line(x, y):
+    """
+    Fits a line y = k*x + b
+    :param x: Numpy array of x values, the points are on the last axis
+    :param y: Numpy array of y values, broadcastable with x
+    :return: slope, intercept, slope err, intercept err (floats or Numpy arrays with the last axis removed)
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    n = x.shape[-1]
+
+    x_mean = np.mean(x, axis=-1, keepdims=True)
+    y_mean = np.mean(y, axis=-1, keepdims=True)
+    x_centered = x - x_mean
+    sxx = np.sum(x_centered*x_centered, axis=-1)
+
+    slope = np.sum(x_centered*(y - y_mean), axis=-1) / sxx
+    intercept = y_mean[..., 0] - slope*x_mean[..., 0]
+
+    residuals = y - (slope[..., np.newaxis]*x + intercept[..., np.newaxis])
+    # Two degrees of freedom are used by the slope and the intercept
+    variance = np.sum(residuals*residuals, axis=-1) / (n - 2)
+    slope_err = np.sqrt(variance / sxx)
+    intercept_err = slope_err * np.sqrt(np.mean(x*x, axis=-1))
+
+    return slope[()], intercept[()], slope_err[()], intercept_err[()]
+
+
+def fit_origin_weighted(x, y, sigma_y):
+    """
+    Fits a line y = k*x that goes through the origin, weighting each point by 1/sigma_y^2
+    The uncertainties are taken as absolute, so the error of the slope doesn't depend on the scatter of the points
+    :param x: Numpy array of x values, the points are on the last axis
+    :param y: Numpy array of y values, broadcastable with x
+    :param sigma_y: uncertainties of the y values, broadcastable with x
+    :return: slope, err (floats or Numpy arrays with the last axis removed)
+    """
+    x, y, sigma_y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float),
+                                        np.asarray(sigma_y, dtype=float))
+    weights = 1 / (sigma_y*sigma_y)
+
+    swxx = np.sum(weights*x*x, axis=-1)
+    slope = np.sum(weights*x*y, axis=-1) / swxx
+    err = np.sqrt(1 / swxx)
+
+    return slope[()], err[()]
+
+
+def fit_line_weighted(x, y, sigma_y):
+    """
+    Fits a line y = k*x + b, weighting each point by 1/sigma_y^2
+    The uncertainties are taken as absolute, so the errors don't depend on the scatter of the points
+    :param x: Numpy array of x values, the points are on the last axis
+    :param y: Numpy array of y values, broadcastable with x
+    :param sigma_y: uncertainties of the y values, broadcastable with x
+    :return: slope, intercept, slope err, intercept err (floats or Numpy arrays with the last axis removed)
+    """
+    x, y, sigma_y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float),
+                                        np.asarray(sigma_y, dtype=float))
+    weights = 1 / (sigma_y*sigma_y)
+
+    sw = np.sum(weights, axis=-1)
+    x_mean = np.sum(weights*x, axis=-1, keepdims=True) / sw[..., np.newaxis]
+    y_mean = np.sum(weights*y, axis=-1, keepdims=True) / sw[..., np.newaxis]
+    x_centered = x - x_mean
+    swxx = np.sum(weights*x_centered*x_centered, axis=-1)
+
+    slope = np.sum(weights*x_centered*(y - y_mean), axis=-1) / swxx
+    intercept = y_mean[..., 0] - slope*x_mean[..., 0]
+    slope_err = np.sqrt(1 / swxx)
+    intercept_err = np.sqrt(1/sw + x_mean[..., 0]**2 / swxx)
+
+    return slope[()], intercept[()], slope_err[()], intercept_err[()]
+
+
+def deming_slope(sxx, syy, sxy, ratio):
+    """
+    The slope of Deming regression from the second moments of the data
+    :param sxx: sum of x^2 (through origin) or of centered x^2
+    :param syy: sum of y^2 or of centered y^2
+    :param sxy: sum of x*y or of centered x*y
+    :param ratio: ratio of the error variances sigma_y^2 / sigma_x^2, 1 for orthogonal regression
+    :return: slope
+    """
+    diff = syy - ratio*sxx
+    root = np.sqrt(diff*diff + 4*ratio*sxy*sxy)
+    # The two forms are equal, but the sum cancels when diff is large and negative, i.e. for small x errors
+    return np.where(diff >= 0, (diff + root) / (2*sxy), 2*ratio*sxy / (root - diff))
+
+
+def jackknife_err(estimates):
+    """
+    :param estimates: leave-one-out estimates, the left out point on the last axis
+    :return: jackknife estimate of the standard error
+    """
+    n = estimates.shape[-1]
+    deviations = estimates - np.mean(estimates, axis=-1, keepdims=True)
+    return np.sqrt((n - 1) / n * np.sum(deviations*deviations, axis=-1))
+
+
+def variance_ratio(sigma_x, sigma_y):
+    """
+    :return: sigma_y^2 / sigma_x^2 averaged over the points on the last axis
+    """
+    sigma_x = np.atleast_1d(np.asarray(sigma_x, dtype=float))
+    sigma_y = np.atleast_1d(np.asarray(sigma_y, dtype=float))
+    return np.mean(sigma_y*sigma_y, axis=-1) / np.mean(sigma_x*sigma_x, axis=-1)
+
+
+def fit_deming_origin(x, y, sigma_x=1.0, sigma_y=1.0):
+    """
+    Fits a line y = k*x that goes through the origin, when both x and y have errors
+    With the default equal uncertainties this is orthogonal regression.
+    Only the ratio of the uncertainties matters for the fit. Deming regression assumes a single ratio for all the
+    points, so per-point uncertainties are approximated by the ratio of their mean variances (see variance_ratio).
+    The error of the slope is the jackknife estimate, which is computed from the sums without the point that is
+    left out, so it doesn't need a loop either.
+    https://en.wikipedia.org/wiki/Deming_regression
+    :param x: Numpy array of x values, the points are on the last axis
+    :param y: Numpy array of y values, broadcastable with x
+    :param sigma_x: uncertainties of the x values, a scalar or per point (broadcastable with x)
+    :param sigma_y: uncertainties of the y values, a scalar or per point (broadcastable with x)
+    :return: slope, err (floats or Numpy arrays with the last axis removed)
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    ratio = variance_ratio(sigma_x, sigma_y)
+
+    xx = x*x
+    yy = y*y
+    xy = x*y
+    sxx = np.sum(xx, axis=-1, keepdims=True)
+    syy = np.sum(yy, axis=-1, keepdims=True)
+    sxy = np.sum(xy, axis=-1, keepdims=True)
+
+    slope = deming_slope(sxx[..., 0], syy[..., 0], sxy[..., 0], ratio)
+    slopes_left_out = deming_slope(sxx - xx, syy - yy, sxy - xy, np.expand_dims(ratio, -1))
+
+    return slope[()], jackknife_err(slopes_left_out)[()]
+
+
+def fit_deming(x, y, sigma_x=1.0, sigma_y=1.0):
+    """
+    Fits a line y = k*x + b, when both x and y have errors
+    With the default equal uncertainties this is orthogonal regression.
+    Per-point uncertainties are approximated by a single ratio of their mean variances as in fit_deming_origin.
+    The errors are jackknife estimates as in fit_deming_origin.
+    https://en.wikipedia.org/wiki/Deming_regression
+    :param x: Numpy array of x values, the points are on the last axis
+    :param y: Numpy array of y values, broadcastable with x
+    :param sigma_x: uncertainties of the x values, a scalar or per point (broadcastable with x)
+    :param sigma_y: uncertainties of the y values, a scalar or per point (broadcastable with x)
+    :return: slope, intercept, slope err, intercept err (floats or Numpy arrays with the last axis removed)
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    ratio = np.expand_dims(variance_ratio(sigma_x, sigma_y), -1)
+    n = x.shape[-1]
+
+    # Centering doesn't change the fit but keeps the leave-one-out moments accurate
+    x_shift = np.mean(x, axis=-1, keepdims=True)
+    y_shift = np.mean(y, axis=-1, keepdims=True)
+    x = x - x_shift
+    y = y - y_shift
+
+    # Leave-one-out sums and means, the left out point on the last axis
+    sx = np.sum(x, axis=-1, keepdims=True)
+    sy = np.sum(y, axis=-1, keepdims=True)
+    x_means = (sx - x) / (n - 1)
+    y_means = (sy - y) / (n - 1)
+    sxx = np.sum(x*x, axis=-1, keepdims=True) - x*x - (n - 1)*x_means*x_means
+    syy = np.sum(y*y, axis=-1, keepdims=True) - y*y - (n - 1)*y_means*y_means
+    sxy = np.sum(x*y, axis=-1, keepdims=True) - x*y - (n - 1)*x_means*y_means
+
+    slopes_left_out = deming_slope(sxx, syy, sxy, ratio)
+    intercepts_left_out = (y_means + y_shift) - slopes_left_out*(x_means + x_shift)
+
+    # The data is centered, so the full fit goes through the origin of the shifted coordinates
+    slope = deming_slope(np.sum(x*x, axis=-1), np.sum(y*y, axis=-1), np.sum(x*y, axis=-1), ratio[..., 0])
+    intercept = y_shift[..., 0] - slope*x_shift[..., 0]
+
+    return slope[()], intercept[()], jackknife_err(slopes_left_out)[()], jackknife_err(intercepts_left_out)[()]
@@ -0,0 +1,64 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# The numerical results of all the experiments in a single process, without any plots
+#
+# Usage: fys1010-report [output directory for the Peltier figures]
+
+import sys
+
+from .interferometer import interferometer
+from .peltier import peltier
+from .specific_charge_of_electron import specific_charge
+
+
+def report_peltier(figure_directory=None):
+    measurements = peltier.load_measurements()
+    for measurement in measurements:
+        measurement.print()
+
+    if figure_directory is not None:
+        # Only the rendering needs PyQtGraph
+        from .peltier import plots
+        plots.render_runs([("peltier", measurements)], figure_directory)
+
+
+def report_interferometer():
+    interferometer.print_latex_tabulars()
+    interferometer.print_estimates()
+
+
+def report_specific_charge():
+    specific_charge.print_data_tabulars()
+    specific_charge.magnet_field()
+    specific_charge.magnet_field_calc()
+    specific_charge.magnet_field_map()
+    specific_charge.qm_statistics()
+
+
+def main():
+    print("# Peltier\n")
+    report_peltier(sys.argv[1] if len(sys.argv) > 1 else None)
+    print("# Interferometer\n")
+    report_interferometer()
+    print("\n# Specific charge of the electron\n")
+    report_specific_charge()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Bootstrap and jackknife of the fits
+#
+# All the resamples of a chunk are built as a single array of indices of shape (resamples, points), so a chunk is
+# refitted with one call of a fit function of the regression module.
+#
+# https://en.wikipedia.org/wiki/Bootstrapping_(statistics)
+# https://en.wikipedia.org/wiki/Jackknife_resampling
+
+import concurrent.futures
+
+import numpy as np
+
+from . import regression
+from . import uncertainty
+
+
+CHUNK_SIZE = 10**5
+
+
+def bootstrap_chunk(x, y, resamples, seed, fit, parameter):
+    """
+    Fits a chunk of bootstrap resamples
+    :param x: 1D Numpy array of x values
+    :param y: 1D Numpy array of y values
+    :param resamples: int, number of resamples in the chunk
+    :param seed: seed of the random number generator, e.g. a SeedSequence
+    :param fit: fit function of the regression module
+    :param parameter: index of the fitted parameter in the return value of fit
+    :return: 1D Numpy array of the parameter for the resamples
+    """
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, x.size, size=(resamples, x.size))
+    # The errors of the fit are not defined for resamples, in which all the x values are the same point
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return fit(x[indices], y[indices])[parameter]
+
+
+def bootstrap(x, y, resamples=10**5, fit=regression.fit_origin, parameter=0, seed=None, workers=1,
+              chunk_size=CHUNK_SIZE, percentiles=uncertainty.PERCENTILES):
+    """
+    Bootstrap distribution of a fitted parameter
+    Each chunk has its own random number generator spawned from the seed, so the result of a seed doesn't depend on
+    the number of workers.
+    :param x: 1D Numpy array of x values
+    :param y: 1D Numpy array of y values
+    :param resamples: int, number of resamples
+    :param fit: fit function of the regression module, must be defined at module level when workers != 1
+    :param parameter: index of the fitted parameter in the return value of fit, e.g. 0 for the slope
+    :param seed: seed of the random number generator
+    :param workers: number of processes (int), None for the number of CPUs, 1 to fit in this process
+    :param chunk_size: int, the maximum number of resamples fitted at once
+    :param percentiles: percentile ranks (%) to compute, the interval is from the first to the last
+    :return: uncertainty.Estimate
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    sizes = [min(chunk_size, resamples - start) for start in range(0, resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    count = len(sizes)
+
+    if workers == 1 or count <= 1:
+        chunks = [bootstrap_chunk(x, y, size, chunk_seed, fit, parameter) for size, chunk_seed in zip(sizes, seeds)]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(bootstrap_chunk, [x]*count, [y]*count, sizes, seeds, [fit]*count,
+                                       [parameter]*count))
+    values = np.concatenate(chunks)
+
+    return uncertainty.Estimate(mean=np.mean(values), std=np.std(values, ddof=1),
+                                ranks=np.asarray(percentiles, dtype=float),
+                                percentiles=np.percentile(values, percentiles))
+
+
+def jackknife(x, y, fit=regression.fit_origin, parameter=0):
+    """
+    Jackknife estimate of a fitted parameter and its error
+    :param x: Numpy array of x values, the points are on the last axis
+    :param y: Numpy array of y values, broadcastable with x
+    :param fit: fit function of the regression module
+    :param parameter: index of the fitted parameter in the return value of fit
+    :return: bias-corrected estimate, err (floats or Numpy arrays with the last axis removed)
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    n = x.shape[-1]
+
+    # Row i of the indices leaves out the point i
+    indices = (np.arange(n - 1) + (np.arange(n - 1) >= np.arange(n)[:, np.newaxis])).astype(int)
+    estimates = fit(x[..., indices], y[..., indices])[parameter]
+    full = fit(x, y)[parameter]
+
+    estimates_mean = np.mean(estimates, axis=-1)
+    err = regression.jackknife_err(estimates)
+
+    return (n*full - (n - 1)*estimates_mean)[()], err[()]
@@ -0,0 +1 @@
+# Specific charge of the electron
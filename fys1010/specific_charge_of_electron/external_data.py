@@ -0,0 +1,29 @@
+import os
+
+from .. import datasets
+
+
+# The stated error of the magnetization constant K_r
+K_r_err = 0.0000038
+# The currents were read to 0.01 A
+current_err = 0.005  # (A)
+
+
+# The measurements, relative to this file so that they are found regardless of the working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def read_data():
+    """
+    The measurements as read-only arrays, shared by all the callers
+    :return:
+        dat         diameters (not radii) of the beam (m), columns: current, rows: voltage
+        voltage     (V)
+        current     (A)
+        N           number of loops in coil
+        R           diameter of coil (m)
+        b           distance between the two helmholtz coils (m)
+        K_r         magnetization constant for helmholtz coils ± K_r_err (T/A)
+    """
+    data = datasets.load(DATA_DIR)
+    return data.diameters, data.voltage, data.current, data.N, data.R, data.b, data.K_r
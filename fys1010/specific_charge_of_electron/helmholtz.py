@@ -0,0 +1,191 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Magnetic field of the Helmholtz coils with the Biot-Savart law
+#
+# Each coil is a circle of current elements in a plane perpendicular to the z axis, and the turns of a coil are on
+# top of each other, so a coil is a single circle with N times the current. The field of the segments at the
+# points is summed as arrays of shape (points, segments, 3), a chunk of points at a time to bound the memory.
+# The fields are per unit current (T/A), so they are directly comparable to the magnetization constant K_r.
+#
+# https://en.wikipedia.org/wiki/Biot%E2%80%93Savart_law
+# https://en.wikipedia.org/wiki/Helmholtz_coil
+
+import collections
+import concurrent.futures
+import functools
+import hashlib
+
+import numpy as np
+
+
+MU_0 = 1.2566370614*1e-6  # vacuum permeability (N/A^2)
+# Number of segments per coil
+SEGMENTS = 360
+# Number of segment and point pairs computed at a time
+CHUNK_SIZE = 2**20
+# Number of the latest fields kept by each HelmholtzCoils
+CACHE_SIZE = 4
+
+
+def field_chunk(points, midpoints, elements):
+    """
+    The Biot-Savart sum dB = mu_0/(4 pi) I dl x r / |r|^3 with the midpoint rule
+    :param points: Numpy array of shape (points, 3) (m)
+    :param midpoints: Numpy array of the midpoints of the segments, shape (segments, 3) (m)
+    :param elements: Numpy array of the current elements I dl of the segments, shape (segments, 3) (A m)
+    :return: Numpy array of the field at the points, shape (points, 3) (T)
+    """
+    # The components are arrays of shape (points, segments), and the sums over the segments are matrix products
+    rx = points[:, 0, np.newaxis] - midpoints[:, 0]
+    ry = points[:, 1, np.newaxis] - midpoints[:, 1]
+    rz = points[:, 2, np.newaxis] - midpoints[:, 2]
+    squared = rx*rx + ry*ry + rz*rz
+    inverse_cube = 1 / (squared*np.sqrt(squared))
+    rx *= inverse_cube
+    ry *= inverse_cube
+    rz *= inverse_cube
+
+    field = np.empty((points.shape[0], 3))
+    field[:, 0] = rz @ elements[:, 1] - ry @ elements[:, 2]
+    field[:, 1] = rx @ elements[:, 2] - rz @ elements[:, 0]
+    field[:, 2] = ry @ elements[:, 0] - rx @ elements[:, 1]
+    return MU_0/(4*np.pi) * field
+
+
+class HelmholtzCoils:
+    def __init__(self, turns, radius, spacing, segments=SEGMENTS):
+        """
+        Two coaxial coils on the z axis at z = -spacing/2 and z = spacing/2 with the same current
+        Use coils() to share the instances and their cached fields.
+        :param turns: number of turns of each coil
+        :param radius: radius of the coils (m)
+        :param spacing: distance between the coils (m)
+        :param segments: number of line segments per coil
+        """
+        self.turns = turns
+        self.radius = radius
+        self.spacing = spacing
+        self.segments = segments
+        # Hash of the points -> field, the least recently used first
+        self.fields = collections.OrderedDict()
+
+    @functools.cached_property
+    def elements(self):
+        """
+        :return: midpoints (m) and current elements per unit current (m) of the segments of both coils,
+                 Numpy arrays of shape (2*segments, 3)
+        """
+        # The midpoints are on the circle and the elements along its tangent, so the sum is the trapezoidal rule
+        # of a periodic function, which converges much faster than a polygon of straight segments
+        angles = np.linspace(0, 2*np.pi, self.segments, endpoint=False)
+        midpoints = np.zeros((self.segments, 3))
+        midpoints[:, 0] = self.radius*np.cos(angles)
+        midpoints[:, 1] = self.radius*np.sin(angles)
+        elements = np.zeros((self.segments, 3))
+        elements[:, 0] = -self.turns * self.radius*np.sin(angles) * 2*np.pi/self.segments
+        elements[:, 1] = self.turns * self.radius*np.cos(angles) * 2*np.pi/self.segments
+
+        midpoints = np.concatenate((midpoints, midpoints))
+        midpoints[:self.segments, 2] = -self.spacing/2
+        midpoints[self.segments:, 2] = self.spacing/2
+        elements = np.concatenate((elements, elements))
+        return midpoints, elements
+
+    def field(self, points, chunk_size=CHUNK_SIZE, workers=1):
+        """
+        The field per unit current at arbitrary points
+        The fields of the CACHE_SIZE latest arrays of points are cached by a hash of the points.
+        :param points: array of the points (m), the coordinates x, y, z on the last axis
+        :param chunk_size: int, the approximate maximum number of segment and point pairs computed at a time
+        :param workers: number of processes (int), None for the number of CPUs, 1 to compute in this process
+        :return: read-only Numpy array of the field (T/A) of the same shape as points
+        """
+        points = np.asarray(points, dtype=float)
+        if points.shape[-1] != 3:
+            raise Exception("The points should have the coordinates on the last axis, got the shape " +
+                            str(points.shape))
+        key = (points.shape, hashlib.sha1(np.ascontiguousarray(points)).hexdigest())
+        if key in self.fields:
+            self.fields.move_to_end(key)
+            return self.fields[key]
+
+        midpoints, elements = self.elements
+        flat = points.reshape(-1, 3)
+        rows = max(1, chunk_size // midpoints.shape[0])
+        chunks = [flat[start:start+rows] for start in range(0, flat.shape[0], rows)]
+        count = len(chunks)
+
+        if workers == 1 or count <= 1:
+            results = [field_chunk(chunk, midpoints, elements) for chunk in chunks]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(field_chunk, chunks, [midpoints]*count, [elements]*count))
+
+        field = np.concatenate(results).reshape(points.shape) if count else np.zeros(points.shape)
+        field.flags.writeable = False
+        self.fields[key] = field
+        if len(self.fields) > CACHE_SIZE:
+            self.fields.popitem(last=False)
+        return field
+
+    def centre_field(self):
+        """
+        The on-axis formula of the field at the centre, K = mu_0 N R^2 / ((b/2)^2 + R^2)^(3/2)
+        :return: field per unit current (T/A)
+        """
+        return MU_0 * self.turns * self.radius**2 / ((self.spacing/2)**2 + self.radius**2)**(3/2)
+
+
+@functools.lru_cache(maxsize=None)
+def coils(turns, radius, spacing, segments=SEGMENTS):
+    """
+    :return: HelmholtzCoils shared by all the callers with the same geometry, so that the fields are computed once
+    """
+    return HelmholtzCoils(turns, radius, spacing, segments)
+
+
+def orbit_points(diameters, samples=64, centre=(0.0, 0.0, 0.0)):
+    """
+    Points on circular orbits in the plane perpendicular to the axis of the coils
+    :param diameters: array of orbit diameters (m)
+    :param samples: number of points per orbit
+    :param centre: the centre of the orbits (m), by default the centre of the coils
+    :return: Numpy array of shape diameters.shape + (samples, 3) (m)
+    """
+    radii = np.asarray(diameters, dtype=float)[..., np.newaxis] / 2
+    angles = np.linspace(0, 2*np.pi, samples, endpoint=False)
+    points = np.empty(radii.shape[:-1] + (samples, 3))
+    points[..., 0] = centre[0] + radii*np.cos(angles)
+    points[..., 1] = centre[1] + radii*np.sin(angles)
+    points[..., 2] = centre[2]
+    return points
+
+
+def orbit_field(helmholtz, diameters, samples=64, centre=(0.0, 0.0, 0.0), **kwargs):
+    """
+    The axial field averaged over circular orbits, which is the field that bends the electrons
+    :param helmholtz: HelmholtzCoils
+    :param diameters: array of orbit diameters (m)
+    :param samples: number of points per orbit
+    :param centre: the centre of the orbits (m)
+    :param kwargs: keyword arguments of HelmholtzCoils.field
+    :return: mean and standard deviation of B_z over each orbit (T/A), Numpy arrays of the shape of diameters
+    """
+    field = helmholtz.field(orbit_points(diameters, samples, centre), **kwargs)[..., 2]
+    return np.mean(field, axis=-1), np.std(field, axis=-1)
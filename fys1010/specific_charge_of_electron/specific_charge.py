@@ -0,0 +1,228 @@
+# insert copyleft license here
+
+import collections
+
+import numpy as np
+
+from .. import distribution
+from .. import tools
+from .. import uncertainty
+from . import external_data
+from . import helmholtz
+
+# Matplotlib is imported only when plotting, so that the data and the computations can be used without it
+
+
+# Number of q/m values computed at a time by qm_grid
+CHUNK_SIZE = 10**6
+
+
+class GridStatistics(collections.namedtuple("GridStatistics", ["mean", "std", "min", "max", "count"])):
+    """
+    Statistics of the repeated q/m values of each voltage and current, arrays of shape (voltages, currents)
+    std is NaN for cells with only a single value, and all of them are NaN for cells without valid values
+    """
+    __slots__ = ()
+
+
+def specific_charge(voltage, magnetic_field, diameter):
+    """
+    q/m = 2U / (B^2 r^2), for any broadcastable arrays
+    :param voltage: accelerating voltage U (V)
+    :param magnetic_field: magnetic field B (T)
+    :param diameter: diameter of the electron beam circle (m)
+    :return: q/m (C/kg)
+    """
+    return (2*voltage) / ((magnetic_field**2) * ((diameter*0.5)**2))
+
+
+def qm_grid(voltage, current, diameters, K_r, chunk_size=CHUNK_SIZE):
+    """
+    q/m for every voltage and current of a sweep, with statistics over repeated diameter readings
+    The diameters are read a block of voltages at a time, so they can be e.g. a Numpy memmap larger than the memory.
+    :param voltage: 1D array of voltages (V)
+    :param current: 1D array of currents (A)
+    :param diameters: array of diameters (m) of shape (voltages, currents) or (voltages, currents, repeats)
+    :param K_r: magnetization constant of the Helmholtz coils (T/A)
+    :param chunk_size: int, the approximate maximum number of values computed at a time
+    :return: GridStatistics
+    """
+    voltage = np.asarray(voltage, dtype=float)
+    magnetic_field = K_r*np.asarray(current, dtype=float)
+    shape = (voltage.size, magnetic_field.size)
+    if tuple(diameters.shape[:2]) != shape:
+        raise Exception("diameters should have the shape (voltages, currents, ...) = " + str(shape) + ", got " +
+                        str(diameters.shape))
+    repeats = diameters.shape[2] if diameters.ndim > 2 else 1
+
+    mean = np.empty(shape)
+    std = np.empty(shape)
+    minimum = np.empty(shape)
+    maximum = np.empty(shape)
+    count = np.empty(shape, dtype=int)
+
+    rows = max(1, chunk_size // (shape[1]*repeats))
+    for start in range(0, shape[0], rows):
+        stop = min(start + rows, shape[0])
+        block = np.asarray(diameters[start:stop], dtype=float).reshape(stop - start, shape[1], repeats)
+        qm = specific_charge(voltage[start:stop, np.newaxis, np.newaxis], magnetic_field[:, np.newaxis], block)
+
+        # Missing readings can be marked with NaN
+        valid = ~np.isnan(qm)
+        count[start:stop] = np.sum(valid, axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean[start:stop] = np.nansum(qm, axis=-1) / count[start:stop]
+            deviations = np.where(valid, qm - mean[start:stop, :, np.newaxis], 0)
+            std[start:stop] = np.sqrt(np.sum(deviations*deviations, axis=-1) / (count[start:stop] - 1))
+        # Cells without any valid values get NaN as the mean
+        empty = count[start:stop] == 0
+        minimum[start:stop] = np.where(empty, np.nan, np.min(np.where(valid, qm, np.inf), axis=-1))
+        maximum[start:stop] = np.where(empty, np.nan, np.max(np.where(valid, qm, -np.inf), axis=-1))
+
+    return GridStatistics(mean=mean, std=std, min=minimum, max=maximum, count=count)
+
+
+def print_data_tabulars():
+    [dat, voltage, current, N, R, b, K_r] = external_data.read_data()
+
+    print("Voltage and current")
+    volt_curr = np.concatenate((np.matrix(voltage).T, np.matrix(current).T), axis=1)  # second dimension
+    tools.print_to_latex_tabular(volt_curr, column_precisions=[0, 2])
+
+    print("The measurement")
+    # the full measurement, expect top row (beacause of rounding).
+    table_mat = np.concatenate((np.matrix(voltage).T, dat*1000), axis=1)
+    tools.print_to_latex_tabular(table_mat, column_precisions=[0, 1, 1, 1, 1, 1, 1])
+
+    # top_row_of_table_mat
+    # tools.print_to_latex_tabular(current, column_precisions=2)
+
+    print("Helmholtz coil information")
+    # other single values, the leading zeros reserve blank space for later editing
+    tools.print_to_latex_tabular([[0, N], [0, R], [0, b], [0, K_r]], column_precisions=3, significant_figures=True)
+
+
+def magnet_field():
+    """
+    Task 7 instruction-sheet.
+    The error limits come from the stated error of K_r and the reading error of the current with Monte Carlo.
+    :return:
+    """
+    [dat, U, I, N, R, b, K_r] = external_data.read_data()
+    # equation 10
+    B = K_r*I
+    B_estimate = uncertainty.propagate(lambda K_r, I: K_r[:, np.newaxis]*I, {
+        "K_r": uncertainty.Normal(K_r, external_data.K_r_err),
+        "I": uncertainty.Uniform(I, external_data.current_err),
+    })
+    # milliamperes
+    tools.print_to_latex_tabular(np.matrix([B, B_estimate.std]).T*1e3, column_precisions=[5, 5])
+
+
+def magnet_field_calc():
+    [dat, U, I, N, R, b, K_r] = external_data.read_data()
+    mikro = 1.2566370614*1e-6
+    K = mikro * N * R**2 / ((b/2)**2 + R**2)**(3/2)
+    print("Verrannollisuuskertoimet")
+    print("K:", K, "  K_r:", K_r, " eta:", K_r/K)
+
+
+def magnet_field_map(centre=(0.0, 0.0, 0.0)):
+    """
+    The non-uniformity of the field of the Helmholtz coils on the electron orbits with the Biot-Savart law
+    K_r is taken to be the field at the centre, and q/m is recomputed with the field averaged over each orbit.
+    :param centre: the centre of the orbits (m), by default the centre of the coils
+    :return: -
+    """
+    [dat, U, I, N, R, b, K_r] = external_data.read_data()
+    coils = helmholtz.coils(int(N), float(R), float(b))
+    K = coils.field((0.0, 0.0, 0.0))[2]
+    B_orbit, B_orbit_std = helmholtz.orbit_field(coils, dat, centre=centre)
+    relative = B_orbit / K
+
+    print("Field of the Helmholtz coils")
+    print("K with Biot-Savart:", K, "  K from the centre formula:", coils.centre_field(), "  K_r:", K_r)
+    print("Field on the orbits relative to the centre, min:", np.min(relative), ", max:", np.max(relative))
+    print("Largest variation along an orbit relative to the centre:", np.max(B_orbit_std) / K)
+    qm = specific_charge(U[:, np.newaxis], K_r*I, dat)
+    qm_orbit = specific_charge(U[:, np.newaxis], relative*K_r*I, dat)
+    print("Median of q/m, uniform field:", distribution.median(qm), ", field on the orbits:",
+          distribution.median(qm_orbit))
+
+
+def print_qm_statistics(qm_values):
+    """
+    Prints the distribution of q/m values, e.g. of the whole grid of a sweep
+    The most likely value is the mode of a kernel density estimate, which doesn't depend on the binning of a histogram.
+    :param qm_values: Numpy array of q/m values of any shape
+    :return: -
+    """
+    qm_min = np.nanmin(qm_values)
+    qm_max = np.nanmax(qm_values)
+
+    print("Min:", qm_min)
+    print("Max:", qm_max)
+    print("Range:", qm_max - qm_min)
+    print("Median:", distribution.median(qm_values))
+    print("Trimmed mean (10 %):", distribution.trimmed_mean(qm_values, 0.1))
+    print("Most likely:", distribution.kde_mode(qm_values))
+
+
+def qm_statistics():
+    """
+    Prints the q/m values of our measurement and their distribution, without any plots
+    :return: -
+    """
+    dat, voltage, current, N, R, b, K_r = external_data.read_data()
+    print("q/m statistics")
+    print_qm_statistics(specific_charge(voltage[:, np.newaxis], K_r*current, dat))
+
+
+def main(show=True):
+    """
+    :param show: show the histogram of q/m with Matplotlib, which waits until the window is closed
+    :return: -
+    """
+    print("## Data tabulars ##\n")
+    print_data_tabulars()
+    print("\n\n## Magnet field (7), in mT ##")
+    magnet_field()
+
+    dat, voltage, current, N, R, b, K_r = external_data.read_data()
+
+    magnetic_field = K_r*current
+    # print(K_r)
+    # print(current)
+    print(magnetic_field)
+
+    qm_array = specific_charge(voltage[:, np.newaxis], magnetic_field, dat)
+
+    # print(qm_array)
+
+    print("q/m e11")
+    tools.print_to_latex_tabular(qm_array*1e-11, column_precisions=4)
+
+    # plot_data = [
+    #     go.Histogram(x=qm_array.flatten())
+    # ]
+    # py.plot(plot_data, filename="histogram.html")
+
+    print_qm_statistics(qm_array)
+
+    print("Theoretical:", 1.6021766208e-19 / 9.10938356e-31)
+
+    magnet_field_calc()
+
+    if show:
+        # import plotly.offline as py
+        # import plotly.graph_objs as go
+        import matplotlib.pyplot as plt
+
+        plt.hist(qm_array.flatten(), bins=6)
+        plt.xlabel("Ominaisvaraus (C/kg)")
+        plt.ylabel("Frekvenssi (kpl)")
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
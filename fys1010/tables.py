@@ -0,0 +1,291 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Tables of numbers in LaTeX, Markdown and CSV
+#
+# The cells are formatted a column at a time and the whole table is written with a single write, so also large
+# tables are fast to render.
+
+import csv
+import io
+import itertools
+import sys
+
+import numpy as np
+
+
+STYLES = ("latex", "markdown", "csv")
+CHUNK_SIZE = 10**5
+
+
+def format_strings(fmt, values):
+    """
+    Formats all the values with a single % operation
+    :param fmt: %-format of a single value, e.g. "%.3f"
+    :param values: 1D Numpy array
+    :return: list of str
+    """
+    if values.size == 0:
+        return []
+    return (((fmt + "\n") * values.size) % tuple(values.tolist())).split("\n")[:-1]
+
+
+def format_fixed(values, precision):
+    """
+    Formats the values with a fixed number of decimals
+    The results are the same as with ("{:.<precision>f}").format(round(value, precision)) for positive precisions
+    and str(int(round(value, precision))) for the others.
+    :param values: 1D Numpy array of floats
+    :param precision: int, number of decimals, zero or negative to round to tens, hundreds etc.
+    :return: list of str
+    """
+    if precision > 0:
+        return format_strings("%." + str(precision) + "f", values)
+    if precision == 0:
+        # rint rounds half to even as round does, and adding zero turns -0.0 to 0.0 as int does
+        return format_strings("%.0f", np.rint(values) + 0.0)
+    # Rounding to tens etc. is rare, so Python's exact round is fast enough
+    return [str(int(round(value, precision))) for value in values.tolist()]
+
+
+def format_column(values, precision=None, significant_figures=False):
+    """
+    :param values: 1D Numpy array
+    :param precision: int, number of decimals or significant figures, None for str()
+    :param significant_figures: if true, precision is the number of significant figures
+    :return: list of str
+    """
+    if precision is None:
+        return values.astype(str).tolist()
+
+    values = values.astype(float)
+    if not significant_figures:
+        return format_fixed(values, precision)
+
+    # The number of decimals of each cell, an exact zero is printed with precision decimals
+    nonzero = values != 0
+    with np.errstate(divide="ignore"):
+        exponents = np.floor(np.log10(np.abs(values)))
+    decimals = np.where(nonzero, precision - 1 - exponents, precision).astype(int)
+
+    cells = np.empty(values.size, dtype=object)
+    for decimal in np.unique(decimals):
+        mask = decimals == decimal
+        cells[mask] = format_fixed(values[mask], int(decimal))
+    return cells.tolist()
+
+
+def format_cells(matrix, column_precisions=None, significant_figures=False):
+    """
+    Formats a 2D array (or a list) of numbers to strings
+
+    :param matrix: matrix to format, a 1D array is a single row (list<float> or numpy_array<float>)
+    :param column_precisions: single value OR array of precisions for each column, None for str()
+                              (int, list<int> or numpy_array<int>, len=columns)
+    :param significant_figures: if false then the column_precisions corresponds normal decimal precision
+                                if true then column_precisions corresponds the number of numbers to be printed
+                                (bool)
+    :return: list of columns as lists of str
+    """
+    array = np.atleast_2d(np.asarray(matrix))
+    rows, columns = array.shape
+
+    if column_precisions is None:
+        precisions = [None] * columns
+    elif not np.shape(column_precisions):
+        precisions = [int(column_precisions)] * columns
+    else:
+        precisions = [int(precision) for precision in column_precisions]
+
+    if len(precisions) != columns:
+        raise Exception("column_precisions should be vector of length of columns, got " + str(len(precisions)) +
+                        " precisions for " + str(columns) + " columns")
+
+    return [format_column(array[:, n], precisions[n], significant_figures) for n in range(columns)]
+
+
+def column_widths(cells):
+    """
+    :param cells: list of columns as lists of str
+    :return: list of the lengths of the longest cells of the columns
+    """
+    return [max(map(len, column), default=0) for column in cells]
+
+
+def check_style(style):
+    if style not in STYLES:
+        raise Exception("Unknown table style " + str(style) + ", should be one of " + str(STYLES))
+
+
+def titles_of(header, columns):
+    if header is None:
+        return [""] * columns
+    if len(header) != columns:
+        raise Exception("header should have a title for each of the " + str(columns) + " columns")
+    return [str(title) for title in header]
+
+
+def render_head(style, widths, header=None, longtable=False):
+    """
+    :param style: "latex", "markdown" or "csv"
+    :param widths: list of the column widths, not used in CSV
+    :param header: list of column titles, None for an empty header row (LaTeX and Markdown) or no header (CSV)
+    :param longtable: use the LaTeX longtable environment, which can continue over pages
+    :return: str of the beginning of the table until the first row
+    """
+    check_style(style)
+    if style == "csv":
+        if header is None:
+            return ""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(header)
+        return buffer.getvalue()
+
+    columns = len(widths)
+    titles = titles_of(header, columns)
+
+    if style == "latex":
+        environment = "longtable" if longtable else "tabular"
+        head = "\n\\begin{" + environment + "}{" + columns*"|l" + "|}\n" + \
+            "\\hline\n" + " & ".join(titles) + " \\\\\n" + "\\hline\n"
+        # The header is repeated on every page of a longtable
+        return head + "\\endhead\n" if longtable else head
+
+    row_format = "| " + " | ".join("%-" + str(width) + "s" for width in widths) + " |\n"
+    return row_format % tuple(titles) + "|" + "|".join("-" * (width + 2) for width in widths) + "|\n"
+
+
+def render_rows(cells, style, widths):
+    """
+    :param cells: list of columns as lists of str, e.g. from format_cells
+    :param style: "latex", "markdown" or "csv"
+    :param widths: list of the column widths, at least the lengths of the cells
+    :return: str of the rows
+    """
+    check_style(style)
+    rows = len(cells[0]) if cells else 0
+
+    if style == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(zip(*cells))
+        return buffer.getvalue()
+
+    # All the rows are formatted with a single % operation, which pads the cells to the column widths
+    cell_formats = ["%-" + str(width) + "s" for width in widths]
+    if style == "latex":
+        row_format = " & ".join(cell_formats) + " \\\\\n"
+    else:
+        row_format = "| " + " | ".join(cell_formats) + " |\n"
+    return (row_format * rows) % tuple(itertools.chain.from_iterable(zip(*cells)))
+
+
+def render_tail(style, longtable=False):
+    """
+    :return: str of the end of the table after the last row
+    """
+    check_style(style)
+    if style == "latex":
+        return "\\hline\n" + "\\end{" + ("longtable" if longtable else "tabular") + "}\n\n"
+    return ""
+
+
+def table_widths(widths, style, header):
+    """
+    :return: the column widths, which in Markdown also fit the titles and the separator row
+    """
+    if style == "markdown":
+        # Markdown needs the separator row to be at least three dashes
+        return [max(width, 3, len(title)) for width, title in zip(widths, titles_of(header, len(widths)))]
+    return widths
+
+
+def render(cells, style="latex", header=None, longtable=False):
+    """
+    :param cells: list of columns as lists of str, e.g. from format_cells
+    :param style: "latex", "markdown" or "csv"
+    :param header: list of column titles, None for an empty header row (LaTeX and Markdown) or no header (CSV)
+    :param longtable: use the LaTeX longtable environment, which can continue over pages
+    :return: str of the table
+    """
+    widths = table_widths(column_widths(cells), style, header)
+    return render_head(style, widths, header, longtable) + render_rows(cells, style, widths) + \
+        render_tail(style, longtable)
+
+
+def write_table(matrix, file=None, style="latex", column_precisions=None, significant_figures=False, header=None,
+                longtable=False):
+    """
+    Writes a 2D array (or a list) of numbers as a table
+    :param matrix: matrix to write, see format_cells
+    :param file: text stream, None for sys.stdout
+    :param style: "latex", "markdown" or "csv"
+    :param column_precisions: see format_cells
+    :param significant_figures: see format_cells
+    :param header: see render
+    :param longtable: see render
+    :return: -
+    """
+    text = render(format_cells(matrix, column_precisions, significant_figures), style, header, longtable)
+    (sys.stdout if file is None else file).write(text)
+
+
+def array_chunks(array, chunk_size=CHUNK_SIZE):
+    """
+    :param array: 2D array of rows, e.g. a Numpy memmap
+    :param chunk_size: int, number of rows in a chunk
+    :return: function that returns a new iterator over the chunks of rows of the array
+    """
+    def chunks():
+        for start in range(0, len(array), chunk_size):
+            yield np.asarray(array[start:start+chunk_size])
+    return chunks
+
+
+def write_table_stream(chunks, file, style="latex", column_precisions=None, significant_figures=False, header=None,
+                       longtable=True):
+    """
+    Writes a table chunk by chunk, so that only a chunk of the rows is formatted at a time
+    The chunks are read twice: first to find the column widths and then to write the rows. CSV has no padding, so
+    it is written in a single pass.
+    :param chunks: 2D array of rows (e.g. a Numpy memmap),
+                   or a function that returns a new iterator over 2D arrays of rows every time it is called
+    :param file: text stream
+    :param style: "latex", "markdown" or "csv"
+    :param column_precisions: see format_cells
+    :param significant_figures: see format_cells
+    :param header: see render
+    :param longtable: see render, by default true since long tables don't fit on a page
+    :return: -
+    """
+    check_style(style)
+    if not callable(chunks):
+        chunks = array_chunks(chunks)
+
+    widths = None
+    if style != "csv":
+        for chunk in chunks():
+            chunk_widths = column_widths(format_cells(chunk, column_precisions, significant_figures))
+            widths = chunk_widths if widths is None else [max(a, b) for a, b in zip(widths, chunk_widths)]
+        if widths is None:
+            raise Exception("The table should have at least one chunk of rows")
+        widths = table_widths(widths, style, header)
+
+    file.write(render_head(style, widths, header, longtable))
+    for chunk in chunks():
+        file.write(render_rows(format_cells(chunk, column_precisions, significant_figures), style, widths))
+    file.write(render_tail(style, longtable))
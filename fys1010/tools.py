@@ -0,0 +1,111 @@
+# insert copyleft licence here
+
+# Analysis tools shared by the experiments
+
+import sys
+
+
+from . import regression
+from . import tables
+
+
+class iterating_colors:
+    """
+    This class is made to mimic matlab-like color plotting behavior. Calling get_next() method
+    returns new color in list, without hazzle. By default colorset is same as in matlab
+    """
+    def __init__(self, palette="matlab"):
+        if palette == "matlab":
+            self.colors = [  # matlab_line_plot_colors
+                [0.0000,    0.4470,    0.7410],
+                [0.8500,    0.3250,    0.0980],
+                [0.9290,    0.6940,    0.1250],
+                [0.4940,    0.1840,    0.5560],
+                [0.4660,    0.6740,    0.1880],
+                [0.3010,    0.7450,    0.9330],
+                [0.6350,    0.0780,    0.1840]]
+
+        if palette == "octave":
+            self.colors = [  # octave and old matlab (version <= R2014a) line plotting colors
+                [0.00000,   0.00000,   1.00000],
+                [0.00000,   0.50000,   0.00000],
+                [1.00000,   0.00000,   0.00000],
+                [0.00000,   0.75000,   0.75000],
+                [0.75000,   0.00000,   0.75000],
+                [0.75000,   0.75000,   0.00000],
+                [0.25000,   0.25000,   0.25000]]
+
+        if palette == "long":
+            # from
+            # http://blogs.mathworks.com/pick/2008/08/15/colors-for-your-multi-line-plots/
+            self.colors = [
+                [0.00,  0.00,  1.00],
+                [0.00,  0.50,  0.00],
+                [1.00,  0.00,  0.00],
+                [0.00,  0.75,  0.75],
+                [0.75,  0.00,  0.75],
+                [0.75,  0.75,  0.00],
+                [0.25,  0.25,  0.25],
+                [0.75,  0.25,  0.25],
+                [0.95,  0.95,  0.00],
+                [0.25,  0.25,  0.75],
+                [0.75,  0.75,  0.75],
+                [0.00,  1.00,  0.00],
+                [0.76,  0.57,  0.17],
+                [0.54,  0.63,  0.22],
+                [0.34,  0.57,  0.92],
+                [1.00,  0.10,  0.60],
+                [0.88,  0.75,  0.73],
+                [0.10,  0.49,  0.47],
+                [0.66,  0.34,  0.65],
+                [0.99,  0.41,  0.23]]
+
+        self.current_index = 0
+
+    def get_next(self):
+        """
+        Returns next color in colormap, color jumps to first one after the last color is used.
+        :return: tuple length of 3, type: int varitying from 0 to 255.
+        """
+        m = len(self.colors)  # the number of rows
+        color = self.colors[self.current_index % m]
+        RGB_color = [round(x*255.45) for x in color]
+        self.current_index += 1
+        return tuple(RGB_color)
+
+    def reset(self):
+        self.current_index = 0
+
+
+def linear_regression_origo(x_axis, data_points):
+    """
+    This fuction calulates linear regresion (slope and error) for line which goes through origo.
+    See regression.fit_origin, which can also fit many data series at once.
+    :param data_points: numpy array
+    :return:
+            micro   slope of fitted line
+            err     mean error in that slope
+    """
+    return regression.fit_origin(x_axis, data_points)
+
+
+def print_to_latex_tabular(matrix, column_precisions=None, significant_figures=False):
+    """
+    Prints 2d-numpy arrays (or regular lists) to latex tabular format. Then just copy-paste it.
+
+    :param matrix:               matrix to print
+                                    (list<float> or numpy_array<float>)
+    :param column_precisions:   single value OR array of precisions for each column
+                                    (int, list<int> or numpy_array<int>, len=columns)
+    :param significant_figures: if false then the column_precisions corresponds normal decimal precision
+                                if true then column_precisions corresponds the number of numbers to be printed
+                                    (bool)
+    :return:
+
+    Examples:
+        column_precisions=[...,4,...], significant_figures=True:
+            0.0012345678 -> 0.001234
+        column_precisions=[...,4,...], significant_figures=False:
+            0.0012345678 -> 0.0012
+    """
+    tables.write_table(matrix, sys.stdout, "latex", column_precisions, significant_figures)
@@ -0,0 +1,146 @@
+# Copyright Mika "AgenttiX" Mäki & Alpi Tolvanen, 2017
+# Created for Tampere University of Technology course FYS-1010 Physics Laboratory 1
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+# Monte Carlo propagation of uncertainties
+#
+# The uncertain inputs are given as distributions, and the formula is evaluated once per chunk with arrays of samples,
+# where the samples are on the first axis. Scalar inputs give samples of shape (chunk,) and array inputs of shape
+# (chunk,) + shape, so a formula that combines them has to add an axis to the scalar ones. Inputs that aren't
+# distributions are passed to the formula as they are.
+#
+# https://en.wikipedia.org/wiki/Propagation_of_uncertainty
+
+import collections
+
+import numpy as np
+
+from . import distribution
+
+
+PERCENTILES = (2.5, 50, 97.5)
+CHUNK_SIZE = 10**5
+# Number of bins of the histograms of the percentiles
+BINS = 2**14
+
+
+class Normal(collections.namedtuple("Normal", ["mean", "std"])):
+    """
+    Normally distributed input, e.g. a value with a mean error
+    """
+    __slots__ = ()
+
+    def sample(self, rng, size):
+        return rng.normal(self.mean, self.std, size=(size,) + np.shape(self.mean))
+
+
+class Uniform(collections.namedtuple("Uniform", ["mean", "half_width"])):
+    """
+    Uniformly distributed input, e.g. a reading of a scale, where half_width is half of the last digit
+    """
+    __slots__ = ()
+
+    def sample(self, rng, size):
+        return rng.uniform(np.subtract(self.mean, self.half_width), np.add(self.mean, self.half_width),
+                           size=(size,) + np.shape(self.mean))
+
+
+class Estimate(collections.namedtuple("Estimate", ["mean", "std", "ranks", "percentiles"])):
+    """
+    The distribution of a propagated value
+    mean, std: the mean and the standard deviation of the samples
+    ranks: the percentile ranks (%)
+    percentiles: the corresponding percentiles, the ranks on the first axis
+    """
+    __slots__ = ()
+
+    def interval(self):
+        """
+        :return: the lowest and the highest of the percentiles, by default the 95 % interval
+        """
+        return self.percentiles[0], self.percentiles[-1]
+
+
+def merge_moments(count_a, mean_a, m2_a, count_b, mean_b, m2_b):
+    """
+    Combines the means and the sums of squared deviations of two sets of samples
+    https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance#Parallel_algorithm
+    :return: count, mean, m2
+    """
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    m2 = m2_a + m2_b + delta*delta * count_a * count_b / count
+    return count, mean, m2
+
+
+def propagate(func, inputs, samples=10**6, chunk_size=CHUNK_SIZE, seed=None, percentiles=PERCENTILES, bins=BINS):
+    """
+    Samples the inputs and evaluates func for them chunk by chunk
+    Only a chunk of the inputs and the intermediate values of func is in memory at a time. The mean and the
+    deviation are merged over the chunks, and the percentiles are interpolated from a histogram of each output
+    value. The histogram covers the range of the first chunk widened by its width on both sides, which
+    limits the accuracy of the percentiles to about a thousandth of the spread of the values.
+    :param func: function that takes the inputs as keyword arguments and returns a Numpy array or a float
+    :param inputs: dict of input name: Normal, Uniform or a constant
+    :param samples: int, the number of samples
+    :param chunk_size: int, the maximum number of samples evaluated at once
+    :param seed: seed of the random number generator
+    :param percentiles: percentile ranks (%) to compute, () to skip the histograms
+    :param bins: int, number of bins of the histograms
+    :return: Estimate
+    """
+    rng = np.random.default_rng(seed)
+
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    histograms = None
+
+    for start in range(0, samples, chunk_size):
+        size = min(chunk_size, samples - start)
+        arguments = {name: value.sample(rng, size) if isinstance(value, (Normal, Uniform)) else value
+                     for name, value in inputs.items()}
+        chunk = np.asarray(func(**arguments), dtype=float)
+        if chunk.shape[:1] != (size,):
+            raise Exception("The function should return one value per sample, got shape " + str(chunk.shape))
+
+        chunk_mean = np.mean(chunk, axis=0)
+        deviations = chunk - chunk_mean
+        count, mean, m2 = merge_moments(count, mean, m2, size, chunk_mean, np.sum(deviations*deviations, axis=0))
+
+        if len(percentiles) > 0:
+            flat = chunk.reshape(size, -1)
+            if histograms is None:
+                low = np.nanmin(flat, axis=0)
+                high = np.nanmax(flat, axis=0)
+                # A constant value gets a narrow range around it
+                width = np.where(high > low, high - low, np.maximum(np.abs(high), 1.0)*1e-12)
+                histograms = [distribution.Histogram(low[i] - width[i], high[i] + width[i], bins)
+                              for i in range(flat.shape[1])]
+            for i, histogram in enumerate(histograms):
+                histogram.add(flat[:, i])
+
+    std = np.sqrt(m2 / (count - 1))
+    if histograms is None:
+        percentile_values = np.empty((0,) + np.shape(mean))
+    else:
+        ranks = np.asarray(percentiles, dtype=float)
+        percentile_values = np.array([histogram.quantile(ranks / 100) for histogram in histograms]).T.reshape(
+            ranks.shape + np.shape(mean))
+
+    return Estimate(mean=mean, std=std, ranks=np.asarray(percentiles, dtype=float), percentiles=percentile_values)